@@ -0,0 +1,223 @@
+"""Benchmark hook latency against a synthetic project.
+
+Generates a project with N modules and M test files, replaces uv and the
+checkers with stubs that sleep for a configurable time, then measures the
+edited hook, the edit store, quality check state reads and the Stop
+pipeline. Results are written as JSON for comparison across releases:
+
+    uv run python benchmarks/bench_hooks.py --modules 500 --edits 200 -o bench.json
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import python_claude
+from python_claude.hooks.base import HookInput
+from python_claude.hooks.edited_hook import EditedHook
+from python_claude.hooks.state import QualityCheckState
+from python_claude.hooks.stop_hook import StopHook
+
+SESSION_ID = "bench"
+
+# Stands in for uv and for ruff, mypy and pytest in the project venv
+STUB_TOOL = """#!{python}
+import os
+import sys
+import time
+
+delay = float(os.environ.get("BENCH_TOOL_MS", "0"))
+if os.path.basename(sys.argv[0]) == "uv":
+    delay += float(os.environ.get("BENCH_UV_MS", "0"))
+time.sleep(delay / 1000)
+"""
+
+COLD_EDITED = (
+    "import sys; from python_claude.cli import main; "
+    "sys.argv = ['python-claude', 'edited']; main()"
+)
+
+
+def _write_stub(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(STUB_TOOL.format(python=sys.executable))
+    path.chmod(0o755)
+
+
+def generate_project(root: Path, modules: int, tests: int) -> list[Path]:
+    """Create a synthetic package whose modules import each other as a tree.
+
+    Returns the module files, in the order edits cycle through them.
+    """
+    (root / "pyproject.toml").write_text("[project]\nname = 'bench'\n")
+    (root / "uv.lock").write_text("version = 1\n")
+    package = root / "pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    files: list[Path] = []
+    for i in range(modules):
+        parent = f"from pkg.mod_{(i - 1) // 2} import value_{(i - 1) // 2}\n"
+        source = f"{parent if i else ''}\n\ndef value_{i}() -> int:\n    return {i}\n"
+        path = package / f"mod_{i}.py"
+        path.write_text(source)
+        files.append(path)
+    (root / "tests").mkdir()
+    for j in range(tests):
+        i = j % modules
+        (root / "tests" / f"test_mod_{j}.py").write_text(
+            f"from pkg.mod_{i} import value_{i}\n\n\n"
+            f"def test_value() -> None:\n"
+            f"    assert value_{i}() == {i}\n"
+        )
+    for tool in ("ruff", "mypy", "pytest"):
+        _write_stub(root / ".venv" / "bin" / tool)
+    _write_stub(root / "stubs" / "uv")
+    return files
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Summarize durations in seconds as milliseconds."""
+    ms = sorted(s * 1000 for s in samples)
+    p95 = ms[min(len(ms) - 1, int(len(ms) * 0.95))]
+    return {
+        "n": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "p50_ms": round(statistics.median(ms), 3),
+        "p95_ms": round(p95, 3),
+        "max_ms": round(ms[-1], 3),
+    }
+
+
+def _timed(func: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _edit_input(path: Path) -> HookInput:
+    return HookInput(session_id=SESSION_ID, tool_input={"file_path": str(path)}, raw={})
+
+
+def bench_edited(files: list[Path], edits: int) -> dict[str, Any]:
+    """Time in-process edited hook calls and the resulting edit store size."""
+    samples = [
+        _timed(EditedHook(_edit_input(files[i % len(files)])).run) for i in range(edits)
+    ]
+    log_dir = EditedHook(_edit_input(files[0])).log_dir
+    store_bytes = sum(f.stat().st_size for f in log_dir.glob("tracking.db*"))
+    return {
+        "edited": summarize(samples),
+        "edit_store": {
+            "edits": edits,
+            "bytes": store_bytes,
+            "bytes_per_edit": round(store_bytes / max(edits, 1), 1),
+        },
+    }
+
+
+def bench_edited_cold(files: list[Path], runs: int) -> dict[str, float]:
+    """Time edited hook calls in a fresh interpreter, as Claude Code runs them."""
+    samples: list[float] = []
+    for i in range(runs):
+        payload = json.dumps(
+            {
+                "session_id": SESSION_ID,
+                "tool_input": {"file_path": str(files[i % len(files)])},
+            }
+        )
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", COLD_EDITED], input=payload, text=True, check=True
+        )
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def bench_state_reads(root: Path, reads: int) -> dict[str, float]:
+    """Time quality check state lookups with a state file present."""
+    state = QualityCheckState(root)
+    state.toggle("ruff")
+    state.toggle("ruff")
+    return summarize([_timed(lambda: state.is_enabled("mypy")) for _ in range(reads)])
+
+
+def bench_stop(files: list[Path], runs: int, uv_run: bool) -> dict[str, float]:
+    """Time the Stop pipeline after one edit, through uv run or directly."""
+    os.environ["PYTHON_CLAUDE_TOOLS_UV_RUN"] = "1" if uv_run else ""
+    samples: list[float] = []
+    # The first run resolves and syncs the venv; it isn't timed
+    for i in range(runs + 1):
+        EditedHook(_edit_input(files[i % len(files)])).run()
+        hook = StopHook(HookInput(session_id=SESSION_ID, tool_input={}, raw={}))
+        hook.output = io.StringIO()
+        duration = _timed(hook.run)
+        if i:
+            samples.append(duration)
+    return summarize(samples)
+
+
+def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run every benchmark in a temporary synthetic project."""
+    with tempfile.TemporaryDirectory(prefix="python-claude-bench-") as tmp:
+        root = Path(tmp)
+        files = generate_project(root, args.modules, args.tests)
+        os.environ["CLAUDE_PROJECT_DIR"] = str(root)
+        os.environ["PATH"] = f"{root / 'stubs'}{os.pathsep}{os.environ['PATH']}"
+        os.environ["BENCH_UV_MS"] = str(args.uv_ms)
+        os.environ["BENCH_TOOL_MS"] = str(args.tool_ms)
+
+        results = bench_edited(files, args.edits)
+        results["edited_cold"] = bench_edited_cold(files, min(args.repeat, 20))
+        results["state_read"] = bench_state_reads(root, args.edits)
+        results["stop_uv_run"] = bench_stop(files, args.repeat, uv_run=True)
+        results["stop_direct"] = bench_stop(files, args.repeat, uv_run=False)
+
+    return {
+        "python_claude": python_claude.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "modules": args.modules,
+            "tests": args.tests,
+            "edits": args.edits,
+            "repeat": args.repeat,
+            "uv_ms": args.uv_ms,
+            "tool_ms": args.tool_ms,
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    """Parse options, run the benchmarks and write the JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--modules", type=int, default=100, help="modules (N)")
+    parser.add_argument("--tests", type=int, default=20, help="test files (M)")
+    parser.add_argument("--edits", type=int, default=100, help="tracked edits (K)")
+    parser.add_argument("--repeat", type=int, default=10, help="timed Stop runs")
+    parser.add_argument(
+        "--uv-ms", type=float, default=50, help="simulated uv run overhead"
+    )
+    parser.add_argument("--tool-ms", type=float, default=10, help="stub tool time")
+    parser.add_argument("-o", "--output", type=Path, help="JSON file (default stdout)")
+    args = parser.parse_args()
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        args.output.write_text(f"{report}\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,60 +1,118 @@
 """Command-line interface for python-claude hooks."""
 
+import importlib
+import os
 import sys
+import time
+from typing import TYPE_CHECKING
 
-from python_claude.hooks import (
-    EditedHook,
-    GitStatusHook,
-    MypyHook,
-    PytestHook,
-    RuffCheckHook,
-    RuffFormatHook,
-    SessionStartHook,
-    ToggleHook,
-)
-from python_claude.hooks.base import Hook
-
-HOOKS: dict[str, type[Hook]] = {
-    "edited": EditedHook,
-    "git status": GitStatusHook,
-    "mypy": MypyHook,
-    "pytest": PytestHook,
-    "ruff check": RuffCheckHook,
-    "ruff format": RuffFormatHook,
-    "session start": SessionStartHook,
-    "toggle": ToggleHook,
+from python_claude.hooks.server import forward
+
+if TYPE_CHECKING:
+    from python_claude.hooks.base import Hook
+
+# Hooks are imported only when selected: "edited" runs on every tool call, so
+# its startup must not pay for importing the other hooks
+HOOKS: dict[str, str] = {
+    "edited": "python_claude.hooks.edited_hook:EditedHook",
+    "gc": "python_claude.hooks.gc_hook:GcHook",
+    "git status": "python_claude.hooks.git_status_hook:GitStatusHook",
+    "mypy": "python_claude.hooks.mypy_hook:MypyHook",
+    "pytest": "python_claude.hooks.pytest_hook:PytestHook",
+    "ruff check": "python_claude.hooks.ruff_check_hook:RuffCheckHook",
+    "ruff format": "python_claude.hooks.ruff_format_hook:RuffFormatHook",
+    "serve": "python_claude.hooks.serve_hook:ServeHook",
+    "session end": "python_claude.hooks.session_end_hook:SessionEndHook",
+    "session start": "python_claude.hooks.session_start_hook:SessionStartHook",
+    "stats": "python_claude.hooks.stats_hook:StatsHook",
+    "stop": "python_claude.hooks.stop_hook:StopHook",
+    "toggle": "python_claude.hooks.toggle_hook:ToggleHook",
+    "warm": "python_claude.hooks.warm_hook:WarmHook",
+    "watch": "python_claude.hooks.watch_hook:WatchHook",
 }
 
+# Third-party packages can register hooks under this entry point group
+ENTRY_POINT_GROUP = "python_claude.hooks"
+
+
+def _plugin_hooks() -> dict[str, str]:
+    """Get hooks registered by other packages, keyed by command name."""
+    from importlib.metadata import entry_points
+
+    return {ep.name: ep.value for ep in entry_points(group=ENTRY_POINT_GROUP)}
+
+
+def _import_hook(target: str) -> "type[Hook]":
+    module_name, _, class_name = target.partition(":")
+    hook_class: type[Hook] = getattr(importlib.import_module(module_name), class_name)
+    return hook_class
+
+
+def resolve_command(argv: list[str]) -> "tuple[str, type[Hook]] | None":
+    """Find the hook for the command in argv.
+
+    Two-word commands take precedence over single words. Built-in hooks are
+    matched first; entry points are only loaded if no built-in hook matches.
+    """
+    candidates = []
+    if len(argv) >= 3:
+        candidates.append(f"{argv[1]} {argv[2]}")
+    if len(argv) >= 2:
+        candidates.append(argv[1])
+
+    for name in candidates:
+        if name in HOOKS:
+            return name, _import_hook(HOOKS[name])
+
+    plugins = _plugin_hooks()
+    for name in candidates:
+        if name in plugins:
+            return name, _import_hook(plugins[name])
+    return None
+
 
 def _print_available_hooks() -> None:
     """Print available hooks to stderr."""
-    hooks = ", ".join(sorted(HOOKS.keys()))
+    hooks = ", ".join(sorted({*HOOKS, *_plugin_hooks()}))
     print(f"Available hooks: {hooks}", file=sys.stderr)
 
 
-def main() -> None:
-    """Main entry point for the CLI."""
-    if len(sys.argv) < 2:
+def run(argv: list[str]) -> int:
+    """Run the hook for the command in argv in this process and get its exit code."""
+    if len(argv) < 2:
         print("Usage: python-claude <command>", file=sys.stderr)
         _print_available_hooks()
-        sys.exit(1)
-
-    # Try two-word command first, then single word
-    if len(sys.argv) >= 3:
-        hook_name = f"{sys.argv[1]} {sys.argv[2]}"
-        if hook_name not in HOOKS:
-            hook_name = sys.argv[1]
-    else:
-        hook_name = sys.argv[1]
-
-    if hook_name not in HOOKS:
-        print(f"Unknown command: {hook_name}", file=sys.stderr)
+        return 1
+
+    resolved = resolve_command(argv)
+    if resolved is None:
+        print(f"Unknown command: {argv[1]}", file=sys.stderr)
         _print_available_hooks()
-        sys.exit(1)
+        return 1
 
-    hook_class = HOOKS[hook_name]
+    _, hook_class = resolved
     hook = hook_class()
-    exit_code = hook.run()
+    start = time.perf_counter()
+    cpu_start = os.times()
+    try:
+        exit_code = hook.run()
+    finally:
+        hook.flush_log()
+    cpu_end = os.times()
+    # Tools run as child processes, whose CPU time is counted once waited for
+    tool_cpu = (cpu_end.children_user - cpu_start.children_user) + (
+        cpu_end.children_system - cpu_start.children_system
+    )
+    hook.record_timing(exit_code, time.perf_counter() - start, tool_cpu)
+    return exit_code
+
+
+def main() -> None:
+    """Main entry point for the CLI."""
+    # Hand the hook to the project's server if one is running
+    exit_code = forward(sys.argv)
+    if exit_code is None:
+        exit_code = run(sys.argv)
     sys.exit(exit_code)
 
 
@@ -1,23 +1,62 @@
-"""Claude Code hook implementations."""
+"""Claude Code hook implementations.
 
-from python_claude.hooks.edited_hook import EditedHook
-from python_claude.hooks.git_status_hook import GitStatusHook
-from python_claude.hooks.mypy_hook import MypyHook
-from python_claude.hooks.pytest_hook import PytestHook
-from python_claude.hooks.ruff_check_hook import RuffCheckHook
-from python_claude.hooks.ruff_format_hook import RuffFormatHook
-from python_claude.hooks.session_start_hook import SessionStartHook
-from python_claude.hooks.state import QualityCheckState
-from python_claude.hooks.toggle_hook import ToggleHook
+Hook classes are imported on first access, so importing one hook module
+doesn't import all the others.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from python_claude.hooks.edited_hook import EditedHook
+    from python_claude.hooks.gc_hook import GcHook
+    from python_claude.hooks.git_status_hook import GitStatusHook
+    from python_claude.hooks.mypy_hook import MypyHook
+    from python_claude.hooks.pytest_hook import PytestHook
+    from python_claude.hooks.ruff_check_hook import RuffCheckHook
+    from python_claude.hooks.ruff_format_hook import RuffFormatHook
+    from python_claude.hooks.session_end_hook import SessionEndHook
+    from python_claude.hooks.session_start_hook import SessionStartHook
+    from python_claude.hooks.state import QualityCheckState
+    from python_claude.hooks.stats_hook import StatsHook
+    from python_claude.hooks.stop_hook import StopHook
+    from python_claude.hooks.toggle_hook import ToggleHook
+
+_MODULES = {
+    "EditedHook": "edited_hook",
+    "GcHook": "gc_hook",
+    "GitStatusHook": "git_status_hook",
+    "MypyHook": "mypy_hook",
+    "PytestHook": "pytest_hook",
+    "QualityCheckState": "state",
+    "RuffCheckHook": "ruff_check_hook",
+    "RuffFormatHook": "ruff_format_hook",
+    "SessionEndHook": "session_end_hook",
+    "SessionStartHook": "session_start_hook",
+    "StatsHook": "stats_hook",
+    "StopHook": "stop_hook",
+    "ToggleHook": "toggle_hook",
+}
 
 __all__ = [
     "EditedHook",
+    "GcHook",
     "GitStatusHook",
     "MypyHook",
     "PytestHook",
     "QualityCheckState",
     "RuffCheckHook",
     "RuffFormatHook",
+    "SessionEndHook",
     "SessionStartHook",
+    "StatsHook",
+    "StopHook",
     "ToggleHook",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f"{__name__}.{_MODULES[name]}")
+    return getattr(module, name)
@@ -0,0 +1,78 @@
+"""Detached background jobs started by the session start hook.
+
+A job holds an exclusive flock on its lock file for as long as it runs and
+writes its process ID into it, so only one copy of a job runs at a time and
+others can find it. The kernel releases the lock when the job exits, however
+it exits. Not supported on Windows.
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+
+def try_lock(lock_file: Path) -> int | None:
+    """Lock a job's lock file, returning its descriptor, or None if it is held."""
+    import fcntl
+
+    fd = os.open(lock_file, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def hold_lock(lock_file: Path) -> int | None:
+    """Lock a job's lock file and record this process as holding it."""
+    lock = try_lock(lock_file)
+    if lock is not None:
+        os.ftruncate(lock, 0)
+        os.write(lock, str(os.getpid()).encode())
+    return lock
+
+
+def is_locked(lock_file: Path) -> bool:
+    """Check whether a job holding a lock file is running."""
+    if os.name == "nt" or not lock_file.exists():
+        return False
+    lock = try_lock(lock_file)
+    if lock is None:
+        return True
+    os.close(lock)
+    return False
+
+
+def lock_holder(lock_file: Path) -> int | None:
+    """Get the process ID of the running job holding a lock file, if any."""
+    if not is_locked(lock_file):
+        return None
+    try:
+        return int(lock_file.read_text())
+    except ValueError:
+        # Locked but not yet written
+        return None
+
+
+def spawn(project_dir: Path, command: str, session_id: str | None) -> None:
+    """Start a python-claude command detached from the calling hook.
+
+    The command runs in its own session with no output, and gets the
+    session ID as hook input, so the caller returns at once.
+    """
+    import subprocess
+
+    process = subprocess.Popen(
+        [sys.executable, "-m", "python_claude.cli", *command.split()],
+        cwd=project_dir,
+        env={**os.environ, "CLAUDE_PROJECT_DIR": str(project_dir)},
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    if process.stdin is not None:
+        process.stdin.write(json.dumps({"session_id": session_id}).encode())
+        process.stdin.close()
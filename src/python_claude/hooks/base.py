@@ -1,22 +1,219 @@
 """Base hook functionality for Claude Code hooks."""
 
-import json
+import itertools
 import os
 import sys
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from datetime import datetime
+from collections.abc import Callable, Mapping
 from pathlib import Path
-from typing import Any
+from types import FrameType
+from typing import TYPE_CHECKING, Any, NamedTuple, Protocol, TextIO
 
+from python_claude.hooks.logger import HookLogger
 
-@dataclass
-class HookInput:
+if TYPE_CHECKING:
+    import subprocess
+    import threading
+
+    from python_claude.hooks.config import Config
+    from python_claude.hooks.tracking import EditStore, PendingEdits
+
+# Exit code of a tool stopped at its deadline, as reported by timeout(1)
+TIMEOUT_EXIT = 124
+# Seconds a tool's process group gets to exit after SIGTERM before SIGKILL
+KILL_GRACE_SECONDS = 5.0
+# Seconds between checks of a cancel event while a tool runs
+CANCEL_POLL_SECONDS = 0.05
+
+# Hook input values parsed up front, by key path
+INPUT_KEYS = {("session_id",), ("tool_input", "file_path")}
+
+# Tools running now, stopped if the hook itself is terminated
+_running: set["subprocess.Popen[bytes]"] = set()
+_handling_termination = False
+
+
+class Cancelled(Exception):
+    """Raised when a tool was stopped because its run was cancelled."""
+
+
+def _group_alive(pgid: int) -> bool:
+    if os.name == "nt":
+        return False
+    try:
+        os.killpg(pgid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _signal_groups(pgids: list[int], signum: int) -> None:
+    for pgid in pgids:
+        try:
+            os.killpg(pgid, signum)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+
+def stop_processes(processes: list["subprocess.Popen[bytes]"]) -> None:
+    """Stop the process groups of tools, with SIGKILL if SIGTERM isn't enough.
+
+    Every process in a group gets SIGTERM. Groups with processes left after
+    KILL_GRACE_SECONDS get SIGKILL.
+    """
+    if os.name == "nt":
+        # No process groups: only the tools themselves can be stopped
+        for process in processes:
+            process.kill()
+            process.wait()
+        return
+
+    def reap() -> None:
+        for process in processes:
+            # Reap exited tools, which otherwise keep their group alive
+            process.poll()
+
+    stop_groups([process.pid for process in processes], reap)
+    for process in processes:
+        process.wait()
+
+
+def stop_groups(pgids: list[int], reap: Callable[[], None] | None = None) -> None:
+    """Stop process groups, with SIGKILL if SIGTERM isn't enough.
+
+    ``reap`` is called while waiting for the groups to exit, to reap those
+    of their processes that are the caller's children.
+    """
+    import signal
+
+    _signal_groups(pgids, signal.SIGTERM)
+    deadline = time.monotonic() + KILL_GRACE_SECONDS
+    while pgids and time.monotonic() < deadline:
+        if reap is not None:
+            reap()
+        pgids = [pgid for pgid in pgids if _group_alive(pgid)]
+        if pgids:
+            time.sleep(0.05)
+    _signal_groups(pgids, signal.SIGKILL)
+
+
+def _terminate(signum: int, frame: FrameType | None) -> None:
+    stop_processes(list(_running))
+    raise SystemExit(128 + signum)
+
+
+def stop_tools_on_termination() -> None:
+    """Stop running tools when the hook gets SIGTERM, SIGHUP or SIGINT.
+
+    Claude Code terminates hooks that exceed its own timeout; without this
+    their tools would keep running. Must be called from the main thread.
+    """
+    global _handling_termination
+    if _handling_termination:
+        return
+    import signal
+
+    for signum in (signal.SIGTERM, signal.SIGHUP, signal.SIGINT):
+        # Signals ignored by whoever started the hook stay ignored
+        if signal.getsignal(signum) in (signal.SIG_DFL, signal.default_int_handler):
+            signal.signal(signum, _terminate)
+    _handling_termination = True
+
+
+def _wait(
+    process: "subprocess.Popen[bytes]",
+    timeout: float | None,
+    cancel: "threading.Event | None",
+) -> int:
+    """Wait for a process like Popen.wait, raising Cancelled once cancel is set."""
+    import subprocess
+
+    if cancel is None:
+        return process.wait(timeout)
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        step = CANCEL_POLL_SECONDS
+        if deadline is not None:
+            step = max(min(step, deadline - time.monotonic()), 0)
+        try:
+            return process.wait(step)
+        except subprocess.TimeoutExpired:
+            if cancel.is_set():
+                raise Cancelled(process.args) from None
+            if deadline is not None and time.monotonic() >= deadline:
+                raise subprocess.TimeoutExpired(process.args, timeout or 0) from None
+
+
+def run_process(
+    args: list[str],
+    *,
+    cwd: Path,
+    env: dict[str, str] | None = None,
+    stdout: Any = None,
+    stderr: Any = None,
+    timeout: float | None = None,
+    cancel: "threading.Event | None" = None,
+) -> "subprocess.CompletedProcess[bytes]":
+    """Run a command in a new process group, like subprocess.run.
+
+    Raises subprocess.TimeoutExpired once the timeout passes, after stopping
+    the whole group, or at once if the timeout is already used up. Likewise
+    raises Cancelled once the ``cancel`` event is set. Processes the command
+    leaves behind in its group are stopped when it exits.
+    """
+    import subprocess
+    import threading
+
+    if timeout is not None and timeout <= 0:
+        raise subprocess.TimeoutExpired(args, 0)
+    if cancel is not None and cancel.is_set():
+        raise Cancelled(args)
+    if threading.current_thread() is threading.main_thread():
+        stop_tools_on_termination()
+    process = subprocess.Popen(
+        args, cwd=cwd, env=env, stdout=stdout, stderr=stderr, start_new_session=True
+    )
+    _running.add(process)
+    try:
+        returncode = _wait(process, timeout, cancel)
+    except BaseException:
+        stop_processes([process])
+        raise
+    finally:
+        _running.discard(process)
+    if _group_alive(process.pid):
+        # Orphaned children, such as test servers, don't outlive the tool
+        stop_processes([process])
+    return subprocess.CompletedProcess(args, returncode)
+
+
+class ProcessRunner(Protocol):
+    """Runs a tool as run_process does."""
+
+    def __call__(
+        self,
+        args: list[str],
+        *,
+        cwd: Path,
+        env: dict[str, str] | None = None,
+        stdout: Any = None,
+        stderr: Any = None,
+        timeout: float | None = None,
+        cancel: "threading.Event | None" = None,
+    ) -> "subprocess.CompletedProcess[bytes]": ...
+
+
+# Not a dataclass: importing dataclasses (and with it inspect and ast) would
+# about double the startup cost of the edited hook
+class HookInput(NamedTuple):
     """Parsed input from Claude Code hook."""
 
     session_id: str | None
-    tool_input: dict[str, Any]
-    raw: dict[str, Any]
+    tool_input: Mapping[str, Any]
+    raw: Mapping[str, Any]
 
     @property
     def file_path(self) -> str | None:
@@ -25,16 +222,25 @@ class HookInput:
 
     @classmethod
     def from_stdin(cls) -> "HookInput":
-        """Read and parse hook input from stdin."""
+        """Read and parse hook input from stdin.
+
+        Only the session ID and file path are parsed up front; the rest of the
+        payload, such as a written file's contents, is parsed if a hook reads it.
+        """
+        if sys.stdin.isatty():
+            # Run by hand from a terminal rather than by Claude Code
+            return cls(session_id=None, tool_input={}, raw={})
         raw_input = sys.stdin.read()
         if not raw_input.strip():
             return cls(session_id=None, tool_input={}, raw={})
 
-        data = json.loads(raw_input)
+        from python_claude.hooks.payload import LazyPayload
+
+        data = LazyPayload.parse(raw_input, INPUT_KEYS)
         session_id = data.get("session_id")
         if session_id == "null":
             session_id = None
-        tool_input = data.get("tool_input", {})
+        tool_input = data.child("tool_input")
         return cls(session_id=session_id, tool_input=tool_input, raw=data)
 
 
@@ -42,11 +248,30 @@ class Hook(ABC):
     """Base class for Claude Code hooks."""
 
     name: str = "base"
+    # Configuration section whose timeout applies to this hook's tools
+    timeout_section: str | None = None
+    # Whether runs are added to the timing log read by `python-claude stats`
+    record_timings: bool = True
 
     def __init__(self, hook_input: HookInput | None = None) -> None:
         self.input = hook_input or HookInput.from_stdin()
         self._project_dir: Path | None = None
         self._log_dir: Path | None = None
+        # Tool output is fed back to Claude via stderr; pipelines may redirect it
+        self.output: TextIO = sys.stderr
+        # Directory tools run in when not the project's, such as a workspace package
+        self.cwd: Path | None = None
+        self.logger = HookLogger(self.name, lambda: self.log_file, lambda: self.config)
+        # Measurements for this run's timing record
+        self.tool_seconds = 0.0
+        self.file_count = 0
+        self.cache_hit = False
+        # Monotonic time by which all tools must have finished, set by pipelines
+        self.deadline: float | None = None
+        # Set by pipelines to stop this hook's running tools, raising Cancelled
+        self.cancel: threading.Event | None = None
+        self._first_tool_start: float | None = None
+        self._tool_runs = itertools.count()
 
     @property
     def project_dir(self) -> Path:
@@ -59,6 +284,13 @@ class Hook(ABC):
                 self._project_dir = Path.cwd()
         return self._project_dir
 
+    @property
+    def config(self) -> "Config":
+        """Get the project's hook configuration."""
+        from python_claude.hooks.config import load_config
+
+        return load_config(self.project_dir)
+
     @property
     def log_dir(self) -> Path:
         """Get the log directory for this session."""
@@ -71,17 +303,218 @@ class Hook(ABC):
             self._log_dir.mkdir(parents=True, exist_ok=True)
         return self._log_dir
 
+    @property
+    def state_dir(self) -> Path:
+        """Get the directory for this check's reports and session state.
+
+        That is the session's directory, or a directory in it for each
+        workspace package, so packages checked concurrently don't share files.
+        """
+        if self.cwd is None or self.cwd == self.project_dir:
+            return self.log_dir
+        state_dir = self.log_dir / "packages" / self.cwd.relative_to(self.project_dir)
+        state_dir.mkdir(parents=True, exist_ok=True)
+        return state_dir
+
+    @property
+    def edits(self) -> "EditStore":
+        """Get the session's store of edited files."""
+        from python_claude.hooks.tracking import EditStore
+
+        return EditStore(self.log_dir)
+
+    def pending_edits(self) -> "PendingEdits":
+        """Get the files edited since this check last succeeded.
+
+        Files changed since the session's snapshot, for example by Bash
+        commands, are recorded as edited first.
+        """
+        if self.config.flag("snapshot", "enabled"):
+            from python_claude.hooks.snapshot import record_tree_changes
+
+            recorded = record_tree_changes(self.project_dir, self.log_dir, self.edits)
+            if recorded:
+                self.log(f"{recorded} files changed outside edit tools")
+        return self.edits.pending(self.name)
+
+    def record_rewrites(self, files: list[str]) -> None:
+        """Note files this check rewrote, so they don't count as changed later."""
+        if self.config.flag("snapshot", "enabled"):
+            from python_claude.hooks.snapshot import record_rewrites
+
+            record_rewrites(self.project_dir, self.log_dir, self.edits, files)
+
     @property
     def log_file(self) -> Path:
         """Get the log file path."""
         return self.log_dir / "hooks.log"
 
-    def log(self, message: str) -> None:
-        """Log a message to the hook log file."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        log_line = f"[{timestamp}] [{self.name}] {message}\n"
-        with open(self.log_file, "a") as f:
-            f.write(log_line)
+    def log(self, message: str, level: str = "info") -> None:
+        """Log a message to the hook log file when the run ends."""
+        self.logger.log(message, level)
+
+    def flush_log(self) -> None:
+        """Write the messages logged so far to the hook log file."""
+        self.logger.flush()
+
+    def record_timing(
+        self,
+        exit_code: int,
+        wall_seconds: float,
+        tool_cpu_seconds: float | None = None,
+        parent: str | None = None,
+    ) -> None:
+        """Append this run's timing record to the project's timing log."""
+        if not self.record_timings:
+            return
+        from python_claude.hooks.timings import record_run
+
+        record_run(
+            self.project_dir,
+            self.name,
+            self.input.session_id,
+            exit_code,
+            wall_seconds,
+            self.tool_seconds,
+            tool_cpu_seconds,
+            self.file_count,
+            self.cache_hit,
+            parent,
+            self.config.integer("timings", "max-bytes"),
+        )
+
+    def tool_command(self, args: list[str]) -> tuple[list[str], dict[str, str]]:
+        """Resolve a `uv run` command to the project venv's tool executable.
+
+        Returns the command to run and extra environment variables for it.
+        Set ``tools.uv-run`` to always go through `uv run`.
+        """
+        if self.config.flag("tools", "uv-run"):
+            return args, {}
+        # Imported here to keep it off the startup path of the edited hook
+        from python_claude.hooks.tool_resolver import ToolResolver
+
+        # A sync counts towards the check's timeout, like the tool itself
+        return ToolResolver(self.project_dir, self.tool_timeout()).command(args)
+
+    def tool_timeout(self) -> float | None:
+        """Get the seconds left for this hook's next tool, or None for no limit.
+
+        The check's ``timeout`` setting counts from its first tool, and a
+        pipeline's deadline can cut it shorter.
+        """
+        if self._first_tool_start is None:
+            self._first_tool_start = time.monotonic()
+        deadlines = [] if self.deadline is None else [self.deadline]
+        if self.timeout_section is not None:
+            seconds = self.config.integer(self.timeout_section, "timeout")
+            if seconds:
+                deadlines.append(self._first_tool_start + seconds)
+        if not deadlines:
+            return None
+        return min(deadlines) - time.monotonic()
+
+    def output_file(self) -> Path:
+        """Get a new file for the full output of one of this hook's tools."""
+        run = next(self._tool_runs)
+        output_dir = self.log_dir / "output"
+        output_dir.mkdir(exist_ok=True)
+        return output_dir / (
+            f"{self.name}.log" if run == 0 else f"{self.name}-{run}.log"
+        )
+
+    def run_tool(
+        self,
+        args: list[str],
+        env: dict[str, str] | None = None,
+        output: TextIO | None = None,
+        process: ProcessRunner | None = None,
+    ) -> int:
+        """Run a tool in the project directory and report its output to self.output.
+
+        The tool's stdout and stderr are captured together in a file in the
+        log directory and written out once the tool exits, so tools running
+        concurrently never interleave output. Output longer than the
+        ``output.max-bytes`` setting is replaced by a summary of it. For
+        tools reporting JSON, stderr is captured separately, so it can't
+        break the report, and written out after it.
+        Extra environment variables, a different output stream and a stand-in
+        for run_process may be given. `uv run` commands run the venv's
+        executable directly when possible.
+        A tool still running at the deadline is stopped, and TIMEOUT_EXIT is
+        returned after its output so far. A tool running when ``cancel`` is
+        set is stopped, and Cancelled raised.
+        """
+        # Imported here to keep them off the startup path of the edited hook
+        import subprocess
+        import tempfile
+
+        from python_claude.hooks.diagnostics import format_output, tool_name, wants_json
+
+        tool = tool_name(args)
+        json_output = wants_json(args)
+        args, tool_env = self.tool_command(args)
+        env = {**tool_env, **env} if env else tool_env
+        output = output or self.output
+        start = time.perf_counter()
+        timed_out = False
+        log_path = self.output_file()
+        max_bytes = self.config.integer("output", "max-bytes")
+        examples = self.config.integer("output", "examples")
+        with open(log_path, "w+") as captured, tempfile.TemporaryFile("w+") as errors:
+            try:
+                returncode = (process or run_process)(
+                    args,
+                    cwd=self.cwd or self.project_dir,
+                    env={**os.environ, **env} if env else None,
+                    stdout=captured,
+                    stderr=errors if json_output else subprocess.STDOUT,
+                    timeout=self.tool_timeout(),
+                    cancel=self.cancel,
+                ).returncode
+            except subprocess.TimeoutExpired:
+                timed_out = True
+                returncode = TIMEOUT_EXIT
+            elapsed = time.perf_counter() - start
+            self.tool_seconds += elapsed
+            captured.seek(0)
+            rel_log = log_path.relative_to(self.project_dir)
+            output.write(format_output(captured, args, rel_log, max_bytes, examples))
+            errors.seek(0)
+            if json_output and errors.read(1):
+                # Kept after the report in the full log too
+                errors.seek(0)
+                captured.seek(0, os.SEEK_END)
+                captured.writelines(errors)
+                errors.seek(0)
+                output.write(
+                    format_output(errors, [tool], rel_log, max_bytes, examples)
+                )
+        if timed_out:
+            output.write(f"{self.name}: {tool} timed out after {elapsed:.0f}s\n")
+            self.log(f"{' '.join(args)} timed out after {elapsed:.0f}s", "warning")
+        output.flush()
+        return returncode
+
+    def run_quietly(self, args: list[str]) -> int:
+        """Run a tool like run_tool, but discard its output."""
+        import subprocess
+
+        args, env = self.tool_command(args)
+        try:
+            result = run_process(
+                args,
+                cwd=self.cwd or self.project_dir,
+                env={**os.environ, **env} if env else None,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=self.tool_timeout(),
+                cancel=self.cancel,
+            )
+        except subprocess.TimeoutExpired:
+            self.log(f"{' '.join(args)} timed out", "warning")
+            return TIMEOUT_EXIT
+        return result.returncode
 
     def is_python_file(self, file_path: str | None = None) -> bool:
         """Check if the given or input file path is a Python file."""
@@ -0,0 +1,264 @@
+"""Project configuration for the hooks, read once and cached by mtime.
+
+Settings come from, in increasing priority: the defaults below, the
+``[tool.python-claude]`` table in pyproject.toml, the check toggles in
+``.claude/quality-checks.json``, and ``PYTHON_CLAUDE_<SECTION>_<KEY>``
+environment variables (``-`` in keys becomes ``_``).
+"""
+
+import json
+import os
+import shlex
+import sys
+from pathlib import Path
+from typing import Any
+
+# Every setting with its default; the default's type is the setting's type
+DEFAULTS: dict[str, dict[str, Any]] = {
+    "ruff": {"enabled": True, "timeout": 60},
+    "mypy": {
+        "enabled": True,
+        "args": [],
+        "targets": ["."],
+        "daemon": False,
+        "daemon-idle-minutes": 60,
+        "affected": False,
+        "depth": 1,
+        "full-every": 10,
+        "timeout": 300,
+    },
+    "pytest": {
+        "enabled": True,
+        "args": [],
+        "targets": [],
+        "affected": False,
+        "workers": "1",
+        "failed-first": False,
+        "preload": False,
+        "preload-idle-minutes": 60,
+        "timeout": 300,
+    },
+    "packages": {"enabled": False, "jobs": 4},
+    "stop": {"fail-fast": False, "timeout": 0},
+    "snapshot": {"enabled": True},
+    "warm": {"enabled": False},
+    "serve": {"enabled": False, "idle-minutes": 60},
+    "watch": {"enabled": False, "quiet-ms": 500, "idle-minutes": 30},
+    "git": {"summary": False, "timeout": 5, "paths": 20, "fsmonitor": False},
+    "tools": {"uv-run": False},
+    "cache": {"enabled": False, "max-bytes": 50 * 1024 * 1024},
+    "output": {"max-bytes": 20000, "examples": 10},
+    "log": {"level": "info", "max-bytes": 1024 * 1024},
+    "timings": {"max-bytes": 5 * 1024 * 1024},
+    "gc": {
+        "interval-hours": 24,
+        "max-age-days": 14,
+        "max-sessions": 100,
+        "max-bytes": 200 * 1024 * 1024,
+    },
+}
+
+# Checks that can be toggled on and off at runtime
+CHECKS = ("pytest", "mypy", "ruff")
+
+TRUE_VALUES = ("1", "true", "yes", "on")
+FALSE_VALUES = ("0", "false", "no", "off")
+
+CACHE_VERSION = 1
+
+# Parsed configuration per project, with the file stats it was built from
+_loaded: dict[Path, tuple[Any, "Config"]] = {}
+
+
+def _coerce(default: Any, value: Any) -> Any:
+    """Convert a value to the type of a setting's default, or raise ValueError."""
+    if isinstance(default, bool):
+        if isinstance(value, bool):
+            return value
+        text = str(value).strip().lower()
+        if text in TRUE_VALUES:
+            return True
+        if text in FALSE_VALUES:
+            return False
+    elif isinstance(default, int):
+        if isinstance(value, int) and not isinstance(value, bool) and value >= 0:
+            return value
+        if isinstance(value, str) and value.strip().isdigit():
+            return int(value)
+    elif isinstance(default, list):
+        if isinstance(value, str):
+            return shlex.split(value)
+        if isinstance(value, list) and all(isinstance(v, str) for v in value):
+            return value
+    elif isinstance(value, (str, int)) and not isinstance(value, bool):
+        return str(value)
+    raise ValueError(f"Invalid value: {value!r}")
+
+
+def env_name(section: str, key: str) -> str:
+    """Get the environment variable that overrides a setting."""
+    return f"PYTHON_CLAUDE_{section}_{key}".upper().replace("-", "_")
+
+
+class Config:
+    """Merged settings, with environment overrides applied on each lookup."""
+
+    def __init__(self, values: dict[str, dict[str, Any]]) -> None:
+        self.values = values
+
+    def get(self, section: str, key: str) -> Any:
+        """Get a setting, converted to the type of its default."""
+        default = DEFAULTS[section][key]
+        override = os.environ.get(env_name(section, key), "").strip()
+        if override:
+            try:
+                return _coerce(default, override)
+            except ValueError:
+                pass
+        return self.values.get(section, {}).get(key, default)
+
+    def flag(self, section: str, key: str) -> bool:
+        """Get a boolean setting."""
+        return bool(self.get(section, key))
+
+    def integer(self, section: str, key: str) -> int:
+        """Get a non-negative integer setting."""
+        return int(self.get(section, key))
+
+    def string(self, section: str, key: str) -> str:
+        """Get a string setting."""
+        return str(self.get(section, key))
+
+    def strings(self, section: str, key: str) -> list[str]:
+        """Get a list-of-strings setting, such as extra tool arguments."""
+        return list(self.get(section, key))
+
+
+def pyproject_file(project_dir: Path) -> Path:
+    """Get the project's pyproject.toml."""
+    return project_dir / "pyproject.toml"
+
+
+def toggles_file(project_dir: Path) -> Path:
+    """Get the file recording which checks were toggled off or on."""
+    return project_dir / ".claude" / "quality-checks.json"
+
+
+def cache_file(project_dir: Path) -> Path:
+    """Get the file caching the parsed pyproject settings across processes."""
+    return project_dir / ".claude" / "config-cache.json"
+
+
+def _stat_key(path: Path) -> list[int] | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def read_toggles(path: Path) -> dict[str, bool]:
+    """Read the check toggles, ignoring a missing or malformed file."""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {k: v for k, v in data.items() if isinstance(v, bool)}
+
+
+def write_json_atomic(path: Path, data: Any, indent: int | None = None) -> None:
+    """Replace a JSON file in one step, so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = path.with_suffix(f".{os.getpid()}.tmp")
+    with open(tmp_file, "w") as f:
+        json.dump(data, f, indent=indent)
+    os.replace(tmp_file, path)
+
+
+def _validate(table: Any) -> dict[str, dict[str, Any]]:
+    """Keep the known settings of a [tool.python-claude] table that are valid."""
+    values: dict[str, dict[str, Any]] = {}
+    if not isinstance(table, dict):
+        return values
+    for section, settings in table.items():
+        if section not in DEFAULTS or not isinstance(settings, dict):
+            continue
+        for key, value in settings.items():
+            if key not in DEFAULTS[section]:
+                continue
+            try:
+                coerced = _coerce(DEFAULTS[section][key], value)
+            except ValueError:
+                continue
+            values.setdefault(section, {})[key] = coerced
+    return values
+
+
+def _parse_pyproject(path: Path) -> dict[str, dict[str, Any]]:
+    if sys.version_info >= (3, 11):
+        import tomllib
+    else:
+        try:
+            import tomli as tomllib
+        except ImportError:
+            # Installed without its dependencies: pyproject settings are not
+            # available, which mustn't go unnoticed
+            try:
+                if b"[tool.python-claude" in path.read_bytes():
+                    print(
+                        "python-claude: [tool.python-claude] settings are ignored:"
+                        " reading pyproject.toml needs tomli on Python 3.10",
+                        file=sys.stderr,
+                    )
+            except OSError:
+                pass
+            return {}
+    try:
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError):
+        return {}
+    return _validate(data.get("tool", {}).get("python-claude", {}))
+
+
+def _pyproject_values(project_dir: Path, key: Any) -> dict[str, dict[str, Any]]:
+    """Get the pyproject settings, parsing the file only when it changed."""
+    if key is None:
+        return {}
+    cache = cache_file(project_dir)
+    try:
+        with open(cache) as f:
+            data = json.load(f)
+        if data.get("version") == CACHE_VERSION and data.get("key") == key:
+            return dict(data["values"])
+    except (json.JSONDecodeError, OSError, AttributeError, KeyError):
+        pass
+    values = _parse_pyproject(pyproject_file(project_dir))
+    try:
+        write_json_atomic(
+            cache, {"version": CACHE_VERSION, "key": key, "values": values}
+        )
+    except OSError:
+        pass
+    return values
+
+
+def load_config(project_dir: Path) -> Config:
+    """Get the project's configuration, reloading only changed files."""
+    pyproject_key = _stat_key(pyproject_file(project_dir))
+    toggles_key = _stat_key(toggles_file(project_dir))
+    key = (pyproject_key, toggles_key)
+    loaded = _loaded.get(project_dir)
+    if loaded is not None and loaded[0] == key:
+        return loaded[1]
+
+    values = _pyproject_values(project_dir, pyproject_key)
+    for check, enabled in read_toggles(toggles_file(project_dir)).items():
+        if check in CHECKS:
+            values.setdefault(check, {})["enabled"] = enabled
+    config = Config(values)
+    _loaded[project_dir] = (key, config)
+    return config
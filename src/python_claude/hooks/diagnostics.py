@@ -0,0 +1,221 @@
+"""Bounded capture of tool output, summarized when it is too long to feed back.
+
+Tool output goes to a log file on disk. Output within the size limit is
+passed on as is. Longer output is summarized from the diagnostics parsed
+out of it: counts grouped by file and code, the first distinct instances,
+the last lines of output and the path of the full log.
+"""
+
+import json
+import re
+from collections import Counter, deque
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import NamedTuple, TextIO
+
+# Lines kept from the end of long output, and the length each is cut to
+TAIL_LINES = 20
+MAX_LINE_CHARS = 500
+# Files and codes listed in a summary
+TOP_FILES = 10
+TOP_CODES = 3
+
+MYPY_ERROR = re.compile(
+    r"^(?P<file>[^:\s][^:]*):(?P<line>\d+):(?:\d+:)? error: (?P<message>.*?)"
+    r"(?:  \[(?P<code>[\w-]+)\])?$"
+)
+PYTEST_FAILURE = re.compile(
+    r"^(?P<code>FAILED|ERROR) (?P<nodeid>\S+)(?: - (?P<message>.*))?$"
+)
+
+
+class Diagnostic(NamedTuple):
+    """One problem reported by a tool."""
+
+    file: str
+    code: str
+    message: str
+    # The problem as the tool reported it, for listing instances
+    text: str
+
+
+def tool_name(args: list[str]) -> str:
+    """Get the name of the tool a command runs, looking through `uv run`."""
+    if args[:2] == ["uv", "run"] and len(args) > 2:
+        return args[2]
+    return Path(args[0]).name
+
+
+def wants_json(args: list[str]) -> bool:
+    """Check whether a ruff command asks for JSON output."""
+    if tool_name(args) != "ruff":
+        return False
+    if "--output-format=json" in args:
+        return True
+    if "--output-format" not in args:
+        return False
+    i = args.index("--output-format")
+    return args[i + 1 : i + 2] == ["json"]
+
+
+def parse_mypy(line: str) -> Diagnostic | None:
+    """Parse a mypy or dmypy error line; notes and summaries are skipped."""
+    match = MYPY_ERROR.match(line)
+    if match is None:
+        return None
+    code = match["code"] or "error"
+    return Diagnostic(match["file"], code, match["message"], line)
+
+
+def parse_pytest(line: str) -> Diagnostic | None:
+    """Parse a line of pytest's short test summary."""
+    match = PYTEST_FAILURE.match(line)
+    if match is None:
+        return None
+    message = match["message"] or ""
+    return Diagnostic(match["nodeid"].split("::")[0], match["code"], message, line)
+
+
+def parse_ruff_json(stream: TextIO) -> list[Diagnostic] | None:
+    """Parse ruff's JSON output, or return None if it isn't a JSON report."""
+    try:
+        data = json.load(stream)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(data, list):
+        return None
+    diagnostics = []
+    for item in data:
+        location = item.get("location") or {}
+        code = item.get("code") or "syntax-error"
+        file_path = item.get("filename", "")
+        position = f"{location.get('row', 0)}:{location.get('column', 0)}"
+        text = f"{file_path}:{position}: {code} {item.get('message', '')}"
+        diagnostics.append(Diagnostic(file_path, code, item.get("message", ""), text))
+    return diagnostics
+
+
+class Summary:
+    """Aggregates diagnostics in bounded memory: counts and first instances."""
+
+    def __init__(self, examples: int) -> None:
+        self.examples = examples
+        self.total = 0
+        self.per_file: Counter[str] = Counter()
+        self.codes: dict[str, Counter[str]] = {}
+        # First instance of each distinct problem by code and message
+        self.instances: dict[tuple[str, str], str] = {}
+        self.repeats: Counter[tuple[str, str]] = Counter()
+
+    def add(self, diagnostic: Diagnostic) -> None:
+        """Count a diagnostic and keep it if it is among the first distinct ones."""
+        self.total += 1
+        self.per_file[diagnostic.file] += 1
+        self.codes.setdefault(diagnostic.file, Counter())[diagnostic.code] += 1
+        key = (diagnostic.code, diagnostic.message)
+        if key in self.instances:
+            self.repeats[key] += 1
+        elif len(self.instances) < self.examples:
+            self.instances[key] = diagnostic.text[:MAX_LINE_CHARS]
+
+    def lines(self, noun: str) -> Iterator[str]:
+        """Render the counts by file and the first distinct instances."""
+        files = len(self.per_file)
+        yield f"# {self.total} {noun} in {files} files\n"
+        for file_path, count in self.per_file.most_common(TOP_FILES):
+            codes = ", ".join(
+                f"{code} {n}"
+                for code, n in self.codes[file_path].most_common(TOP_CODES)
+            )
+            yield f"#   {file_path}: {count} ({codes})\n"
+        if files > TOP_FILES:
+            yield f"#   and {files - TOP_FILES} more files\n"
+        if self.instances:
+            yield f"# First {len(self.instances)} distinct {noun}:\n"
+        for key, text in self.instances.items():
+            repeats = self.repeats[key]
+            yield f"{text}  (and {repeats} more like it)\n" if repeats else f"{text}\n"
+
+
+def _summarize(
+    tool: str,
+    log_path: Path,
+    size: int,
+    line_count: int,
+    summary: Summary,
+    tail: Iterable[str],
+    noun: str,
+) -> str:
+    out = [
+        f"# {tool}: {line_count} lines ({size} bytes) of output, summarized.\n",
+        f"# Full output: {log_path}\n",
+    ]
+    if summary.total:
+        out.extend(summary.lines(noun))
+    out.append("# Last lines:\n")
+    out.extend(tail)
+    return "".join(out)
+
+
+def format_output(
+    stream: TextIO, args: list[str], log_path: Path, max_bytes: int, examples: int
+) -> str:
+    """Get the text to feed back for a tool's captured output.
+
+    Reads the output once, keeping no more than ``max_bytes`` of it plus the
+    last lines. ruff's JSON output is rendered one diagnostic per line.
+    """
+    tool = tool_name(args)
+    if wants_json(args):
+        diagnostics = parse_ruff_json(stream)
+        stream.seek(0)
+        if diagnostics is not None:
+            return _format_ruff(diagnostics, tool, log_path, max_bytes, examples)
+
+    parser = {"mypy": parse_mypy, "dmypy": parse_mypy, "pytest": parse_pytest}.get(tool)
+    noun = "failed tests" if tool == "pytest" else "errors"
+    head: list[str] | None = []
+    tail: deque[str] = deque(maxlen=TAIL_LINES)
+    summary = Summary(examples)
+    size = 0
+    line_count = 0
+    for line in stream:
+        size += len(line)
+        line_count += 1
+        if head is not None:
+            head.append(line)
+            if size > max_bytes:
+                # Too long to pass on: keep only what the summary needs
+                head = None
+        if parser is not None:
+            diagnostic = parser(line.rstrip("\n"))
+            if diagnostic is not None:
+                summary.add(diagnostic)
+        if len(line) > MAX_LINE_CHARS:
+            line = f"{line[:MAX_LINE_CHARS]}...\n"
+        tail.append(line)
+    if head is not None:
+        return "".join(head)
+    return _summarize(tool, log_path, size, line_count, summary, tail, noun)
+
+
+def _format_ruff(
+    diagnostics: list[Diagnostic],
+    tool: str,
+    log_path: Path,
+    max_bytes: int,
+    examples: int,
+) -> str:
+    lines = [f"{d.text}\n" for d in diagnostics]
+    if diagnostics:
+        plural = "" if len(diagnostics) == 1 else "s"
+        lines.append(f"Found {len(diagnostics)} error{plural}.\n")
+    rendered = "".join(lines)
+    if len(rendered) <= max_bytes:
+        return rendered
+    summary = Summary(examples)
+    for diagnostic in diagnostics:
+        summary.add(diagnostic)
+    return _summarize(
+        tool, log_path, len(rendered), len(lines), summary, lines[-1:], "errors"
+    )
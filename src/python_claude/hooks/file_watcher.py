@@ -0,0 +1,167 @@
+"""Notification of changes to the project's Python files.
+
+Linux's inotify is used through ctypes, with one watch per directory of the
+tree. Elsewhere, or when inotify is unavailable or out of watches, the tree
+is polled with the same stat scan as the session snapshot.
+"""
+
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+
+from python_claude.hooks.snapshot import SKIP_DIRS, FileStat, scan_python_files
+
+# Seconds between scans of the tree when polling
+POLL_SECONDS = 2.0
+
+# inotify event flags, from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (
+    IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_ONLYDIR
+)
+
+# struct inotify_event: wd, mask, cookie and the length of the name after it
+EVENT = struct.Struct("iIII")
+
+
+def _watched_dir(name: str) -> bool:
+    return not name.startswith(".") and name not in SKIP_DIRS
+
+
+class InotifyWatcher:
+    """Follows changes to Python files with inotify, one watch per directory."""
+
+    def __init__(self, root: Path) -> None:
+        import ctypes
+
+        self.root = root
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self._fd: int = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        self._dirs: dict[int, str] = {}
+        try:
+            self._watch_tree(str(root))
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def _watch_tree(self, top: str) -> list[str]:
+        """Watch a directory and those below it; returns the Python files found."""
+        import ctypes
+
+        files: list[str] = []
+        stack = [top]
+        while stack:
+            path = stack.pop()
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+            if wd < 0:
+                errno = ctypes.get_errno()
+                if errno == 28:
+                    # ENOSPC: out of watches, see fs.inotify.max_user_watches
+                    raise OSError(errno, "inotify watch limit reached")
+                # Removed since it was listed
+                continue
+            self._dirs[wd] = path
+            try:
+                entries = list(os.scandir(path))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if _watched_dir(entry.name):
+                        stack.append(entry.path)
+                elif entry.name.endswith(".py"):
+                    files.append(entry.path)
+        return files
+
+    def wait(self, timeout: float) -> set[str]:
+        """Wait up to ``timeout`` seconds for changes; returns the changed files."""
+        ready, _, _ = select.select([self._fd], [], [], max(timeout, 0))
+        if not ready:
+            return set()
+        data = b""
+        while True:
+            try:
+                data += os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+        changed: set[str] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT.unpack_from(data, offset)
+            offset += EVENT.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost: every file may have changed
+                changed.update(
+                    str(self.root / rel) for rel in scan_python_files(self.root)
+                )
+                continue
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            parent = self._dirs.get(wd)
+            if parent is None:
+                continue
+            path = os.path.join(parent, name)
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and _watched_dir(name):
+                    changed.update(self._watch_tree(path))
+            elif name.endswith(".py"):
+                changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        """Release the inotify instance and its watches."""
+        os.close(self._fd)
+
+
+class PollingWatcher:
+    """Follows changes to Python files by comparing stat scans of the tree."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._stats: dict[str, FileStat] = scan_python_files(root)
+
+    def wait(self, timeout: float) -> set[str]:
+        """Wait up to ``timeout`` seconds for changes; returns the changed files."""
+        deadline = time.monotonic() + max(timeout, 0)
+        while True:
+            time.sleep(max(min(POLL_SECONDS, deadline - time.monotonic()), 0))
+            stats = scan_python_files(self.root)
+            changed = {
+                rel
+                for rel in stats.keys() | self._stats.keys()
+                if stats.get(rel) != self._stats.get(rel)
+            }
+            self._stats = stats
+            if changed or time.monotonic() >= deadline:
+                return {str(self.root / rel) for rel in changed}
+
+    def close(self) -> None:
+        """Nothing to release."""
+
+
+def open_watcher(root: Path) -> InotifyWatcher | PollingWatcher:
+    """Watch the tree with inotify where possible, or else by polling."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            # No inotify in libc, or too many watches for this tree
+            pass
+    return PollingWatcher(root)
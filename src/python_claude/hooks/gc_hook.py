@@ -0,0 +1,29 @@
+"""Garbage collection command for session debug directories."""
+
+import sys
+
+from python_claude.hooks.base import Hook
+from python_claude.hooks.retention import RetentionPolicy, collect
+
+
+class GcHook(Hook):
+    """Prunes old session directories and archives their stale track files."""
+
+    name = "gc"
+    record_timings = False
+
+    def run(self) -> int:
+        """Apply the retention policy, or only report it with --dry-run."""
+        # sys.argv will be: ['python-claude', 'gc', '--dry-run']
+        dry_run = "--dry-run" in sys.argv[2:]
+        keep = {self.input.session_id} if self.input.session_id else set()
+        pruned, archive = collect(
+            self.project_dir, RetentionPolicy.from_config(self.config), keep, dry_run
+        )
+
+        verb = "Would remove" if dry_run else "Removed"
+        size_mb = sum(s.size for s in pruned) / (1024 * 1024)
+        print(f"{verb} {len(pruned)} session directories ({size_mb:.1f} MB)")
+        if archive is not None:
+            print(f"Archived track files of unfinished sessions to {archive}")
+        return 0
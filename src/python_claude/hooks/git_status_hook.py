@@ -1,20 +1,169 @@
 """Git status hook for Claude Code."""
 
+import json
 import subprocess
+from collections.abc import Iterator
+from typing import IO, NamedTuple
 
-from python_claude.hooks.base import Hook, HookInput
+from python_claude.hooks.base import Hook, HookInput, run_process
+
+# Bytes read at a time from `git status -z` output
+CHUNK_SIZE = 64 * 1024
+
+
+class GitStatusSummary(NamedTuple):
+    """The branch and working tree state from `git status --porcelain=v2`."""
+
+    branch: str
+    upstream: str | None
+    ahead: int
+    behind: int
+    counts: dict[str, int]
+    entries: int
+    # The first paths with their two-letter short status, as in `git status -s`
+    paths: list[str]
+
+    def describe(self) -> str:
+        """Render the summary as context for Claude."""
+        upstream = ""
+        if self.upstream is not None:
+            upstream = (
+                f" tracking {self.upstream}, ahead {self.ahead}, behind {self.behind}"
+            )
+        lines = [f"git status: on branch {self.branch}{upstream}"]
+        counts = [f"{n} {status}" for status, n in self.counts.items() if n]
+        lines.append(", ".join(counts) if counts else "working tree clean")
+        lines.extend(self.paths)
+        if self.entries > len(self.paths):
+            lines.append(f"... and {self.entries - len(self.paths)} more paths")
+        return "\n".join(lines)
+
+
+def _records(stream: IO[bytes]) -> Iterator[str]:
+    """Split NUL-terminated `git status -z` records without reading it all."""
+    pending = b""
+    while chunk := stream.read(CHUNK_SIZE):
+        *records, pending = (pending + chunk).split(b"\0")
+        for record in records:
+            yield record.decode(errors="replace")
+    if pending:
+        yield pending.decode(errors="replace")
+
+
+def parse_porcelain_v2(records: Iterator[str], max_paths: int) -> GitStatusSummary:
+    """Summarize `git status --porcelain=v2 --branch -z` output.
+
+    Keeps only counts and the first ``max_paths`` paths, however many
+    entries the status has.
+    """
+    branch = "(unknown)"
+    upstream: str | None = None
+    ahead = behind = 0
+    counts = {"staged": 0, "modified": 0, "conflicted": 0, "untracked": 0}
+    paths: list[str] = []
+    entries = 0
+    for record in records:
+        kind, _, rest = record.partition(" ")
+        if kind == "#":
+            header, _, value = rest.partition(" ")
+            if header == "branch.head":
+                branch = value
+            elif header == "branch.upstream":
+                upstream = value
+            elif header == "branch.ab":
+                plus, _, minus = value.partition(" ")
+                ahead, behind = int(plus.lstrip("+")), int(minus.lstrip("-"))
+            continue
+        if kind in ("1", "2"):
+            fields = rest.split(" ", 8 if kind == "2" else 7)
+            status, path = fields[0], fields[-1]
+            if kind == "2":
+                # The rename's original path is the next record
+                next(records, None)
+            if status[0] != ".":
+                counts["staged"] += 1
+            if status[1] != ".":
+                counts["modified"] += 1
+            short = status.replace(".", " ")
+        elif kind == "u":
+            path = rest.split(" ", 9)[-1]
+            counts["conflicted"] += 1
+            short = rest[:2]
+        elif kind == "?":
+            path = rest
+            counts["untracked"] += 1
+            short = "??"
+        else:
+            continue
+        entries += 1
+        if len(paths) < max_paths:
+            paths.append(f"{short} {path}")
+    return GitStatusSummary(branch, upstream, ahead, behind, counts, entries, paths)
 
 
 class GitStatusHook(Hook):
     """Shows git status."""
 
     name = "git-status"
+    timeout_section = "git"
 
     def __init__(self, hook_input: HookInput | None = None) -> None:
         super().__init__(hook_input)
 
+    def status_command(self) -> list[str]:
+        """Get the porcelain v2 status command, using git's caches where possible."""
+        options = ["-c", "core.untrackedCache=true"]
+        if self.config.flag("git", "fsmonitor"):
+            # Opt-in, since it leaves a daemon running for the repository;
+            # ignored where git's built-in fsmonitor is unsupported
+            options += ["-c", "core.fsmonitor=true"]
+        return [
+            "git",
+            *options,
+            "status",
+            "--porcelain=v2",
+            "--branch",
+            "-z",
+            "--untracked-files=normal",
+            "--no-renames",
+        ]
+
+    def summarize(self) -> int:
+        """Print a summary of git status as additionalContext JSON."""
+        import tempfile
+
+        with tempfile.TemporaryFile() as captured:
+            try:
+                result = run_process(
+                    self.status_command(),
+                    cwd=self.project_dir,
+                    stdout=captured,
+                    stderr=subprocess.DEVNULL,
+                    timeout=self.tool_timeout(),
+                )
+            except subprocess.TimeoutExpired:
+                seconds = self.config.integer("git", "timeout")
+                context = f"git status: timed out after {seconds}s"
+                print(json.dumps({"additionalContext": context}))
+                return 0
+            except OSError as e:
+                self.log(f"git status failed: {e}", "warning")
+                return 0
+            if result.returncode != 0:
+                # Not a git repository
+                self.log(f"git status exited {result.returncode}", "warning")
+                return 0
+            captured.seek(0)
+            summary = parse_porcelain_v2(
+                _records(captured), self.config.integer("git", "paths")
+            )
+        print(json.dumps({"additionalContext": summary.describe()}))
+        return 0
+
     def run(self) -> int:
         """Run git status and output the result."""
+        if self.config.flag("git", "summary"):
+            return self.summarize()
         print("# git status")
         result = subprocess.run(
             ["git", "status"],
@@ -0,0 +1,346 @@
+"""Static import graph of a project, used to select the tests affected by edits."""
+
+import ast
+import hashlib
+import json
+import os
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+from python_claude.hooks.snapshot import SKIP_DIRS
+from python_claude.hooks.workspace import package_dir
+
+CACHE_VERSION = 3
+
+# Changes to these can affect any test, so they always select the full suite
+CONFIG_FILES = ("pyproject.toml", "setup.cfg", "pytest.ini", "tox.ini")
+
+
+def is_test_file(path: Path) -> bool:
+    """Check whether pytest would collect tests from this file by default."""
+    return path.name.startswith("test_") or path.name.endswith("_test.py")
+
+
+def iter_python_files(root: Path) -> list[Path]:
+    """List the project's Python files, skipping hidden and build directories."""
+    files: list[Path] = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [
+            d for d in dirnames if not d.startswith(".") and d not in SKIP_DIRS
+        ]
+        files.extend(Path(dirpath) / f for f in filenames if f.endswith(".py"))
+    return files
+
+
+def _imports(tree: ast.Module, path: Path, module: str | None) -> list[str]:
+    """Get the absolute names of all modules imported by a parsed file.
+
+    Relative imports are left out of files without a module name.
+    """
+    is_package = path.name == "__init__.py"
+    package = (module or "").split(".")
+    if not is_package:
+        package = package[:-1]
+    imports: list[str] = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imports.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level and module is None:
+                continue
+            if node.level:
+                base = package[: len(package) - node.level + 1]
+                prefix = ".".join(base)
+                name = f"{prefix}.{node.module}" if node.module else prefix
+            else:
+                name = node.module or ""
+            if not name:
+                continue
+            imports.append(name)
+            # `from package import module` imports a submodule
+            imports.extend(f"{name}.{alias.name}" for alias in node.names)
+    return imports
+
+
+def _is_public(name: str) -> bool:
+    return not name.startswith("_") or (name.startswith("__") and name.endswith("__"))
+
+
+def _signatures(body: list[ast.stmt]) -> list[str]:
+    """Dump the parts of statements that other modules can depend on.
+
+    Function and method bodies are left out, as are private names.
+    Unannotated assignments keep their value, since mypy infers their type
+    from it. Anything else at this level, such as conditional definitions,
+    is kept whole.
+    """
+    parts: list[str] = []
+    for node in body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if _is_public(node.name):
+                parts.append(
+                    f"{type(node).__name__} {node.name} {ast.dump(node.args)}"
+                    f" {ast.dump(node.returns) if node.returns else ''}"
+                    f" {[ast.dump(d) for d in node.decorator_list]}"
+                )
+        elif isinstance(node, ast.ClassDef):
+            if _is_public(node.name):
+                header = [*node.bases, *node.keywords, *node.decorator_list]
+                parts.append(f"class {node.name} {[ast.dump(n) for n in header]}")
+                parts.extend(f"  {part}" for part in _signatures(node.body))
+        elif isinstance(node, ast.AnnAssign):
+            parts.append(f"{ast.dump(node.target)}: {ast.dump(node.annotation)}")
+        elif not isinstance(node, (ast.Expr, ast.Pass)):
+            parts.append(ast.dump(node))
+    return parts
+
+
+def interface_hash(tree: ast.Module) -> str:
+    """Hash the public interface of a parsed module, ignoring implementations."""
+    return hashlib.sha256("\n".join(_signatures(tree.body)).encode()).hexdigest()
+
+
+def _parse_file(path: Path, module: str | None) -> tuple[list[str], str] | None:
+    """Get the modules a file imports and the hash of its public interface.
+
+    Returns None if the file cannot be parsed.
+    """
+    try:
+        tree = ast.parse(path.read_bytes(), filename=str(path))
+    except (SyntaxError, ValueError, OSError):
+        return None
+    return _imports(tree, path, module), interface_hash(tree)
+
+
+class ImportGraph:
+    """Maps each project file to the project files that import it.
+
+    The parsed imports of every file are cached in ``.claude/import-graph.json``
+    and only re-parsed when the file's mtime or size changes.
+    """
+
+    def __init__(self, project_dir: Path) -> None:
+        self.project_dir = project_dir
+        self.cache_file = project_dir / ".claude" / "import-graph.json"
+        # Relative paths of files that failed to parse
+        self.unparsable: set[str] = set()
+        # Whether a config file changed since the last accepted full run
+        self.config_changed = False
+        self._modules: dict[str, str] = {}
+        self._importers: dict[str, set[str]] = {}
+        self._interfaces: dict[str, str | None] = {}
+        self._external: set[str] = set()
+        # Package directory of each directory looked up
+        self._packages: dict[Path, Path] = {}
+        self._built = False
+
+    def source_root(self, path: Path) -> Path:
+        """Get the directory that module names of files are relative to.
+
+        That is the nearest package directory with a ``pyproject.toml``, or
+        the project, or the ``src/`` directory in it for files inside one.
+        """
+        package = package_dir(path, self.project_dir, self._packages)
+        src = package / "src"
+        return src if path.is_relative_to(src) else package
+
+    def module_name(self, rel_path: str) -> str | None:
+        """Get the importable module name of a project-relative file path.
+
+        Returns None if the path has no valid module name, such as a script
+        in a directory with a dash in its name.
+        """
+        path = self.project_dir / rel_path
+        parts = list(path.relative_to(self.source_root(path)).with_suffix("").parts)
+        if parts and parts[-1] == "__init__":
+            parts = parts[:-1]
+        if not parts or not all(part.isidentifier() for part in parts):
+            return None
+        return ".".join(parts)
+
+    def _load_cache(self) -> dict[str, Any]:
+        try:
+            data = json.loads(self.cache_file.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != CACHE_VERSION:
+            return {}
+        return data
+
+    def _save_cache(self, data: dict[str, Any]) -> None:
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(data))
+        os.replace(tmp_file, self.cache_file)
+
+    def _config_stats(self) -> dict[str, list[int]]:
+        stats: dict[str, list[int]] = {}
+        for name in CONFIG_FILES:
+            path = self.project_dir / name
+            if path.exists():
+                stat = path.stat()
+                stats[name] = [stat.st_mtime_ns, stat.st_size]
+        return stats
+
+    def build(self) -> None:
+        """Scan the project, re-parsing only files that changed since last time."""
+        cache = self._load_cache()
+        cached_files: dict[str, Any] = cache.get("files", {})
+        # The recorded config only moves forward once a full run accepts it
+        config = cache.get("config", self._config_stats())
+        self.config_changed = config != self._config_stats()
+
+        files: dict[str, Any] = {}
+        for path in iter_python_files(self.project_dir):
+            rel_path = path.relative_to(self.project_dir).as_posix()
+            stat = path.stat()
+            entry = cached_files.get(rel_path)
+            if (
+                entry is None
+                or entry["mtime"] != stat.st_mtime_ns
+                or entry["size"] != stat.st_size
+            ):
+                parsed = _parse_file(path, self.module_name(rel_path))
+                entry = {
+                    "mtime": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "imports": parsed[0] if parsed else None,
+                    "interface": parsed[1] if parsed else None,
+                }
+            files[rel_path] = entry
+
+        if files != cached_files or config != cache.get("config"):
+            data = {"version": CACHE_VERSION, "config": config, "files": files}
+            self._save_cache(data)
+
+        names = {rel: self.module_name(rel) for rel in files}
+        self._modules = {name: rel for rel, name in names.items() if name is not None}
+        self._importers = {rel: set() for rel in files}
+        self._interfaces = {rel: entry["interface"] for rel, entry in files.items()}
+        self.unparsable = set()
+        local = {name.split(".")[0] for name in self._modules}
+        self._external = set()
+        for rel_path, entry in files.items():
+            if entry["imports"] is None:
+                self.unparsable.add(rel_path)
+                continue
+            self._external.update(
+                name for name in entry["imports"] if name.split(".")[0] not in local
+            )
+            for dependency in self._resolve(entry["imports"]):
+                if dependency != rel_path:
+                    self._importers[dependency].add(rel_path)
+        self._built = True
+
+    def accept_config(self) -> None:
+        """Record the current config files as verified by a full test run."""
+        cache = self._load_cache()
+        if cache:
+            cache["config"] = self._config_stats()
+            self._save_cache(cache)
+        self.config_changed = False
+
+    def _resolve(self, imports: list[str]) -> set[str]:
+        """Map imported module names to the project files they execute."""
+        resolved: set[str] = set()
+        for name in imports:
+            # Importing a.b.c also runs the __init__ of packages a and a.b
+            parts = name.split(".")
+            for i in range(1, len(parts) + 1):
+                rel_path = self._modules.get(".".join(parts[:i]))
+                if rel_path is not None:
+                    resolved.add(rel_path)
+        return resolved
+
+    def interfaces(self) -> dict[str, str | None]:
+        """Get the public interface hash of every file, None if unparsable."""
+        if not self._built:
+            self.build()
+        return dict(self._interfaces)
+
+    def external_imports(self) -> set[str]:
+        """Get the names imported by project files from outside the project.
+
+        Includes the standard library, and for ``from a import b`` both
+        ``a`` and ``a.b``, whether or not ``b`` is a module.
+        """
+        if not self._built:
+            self.build()
+        return set(self._external)
+
+    def dependents(self, rel_paths: set[str], max_depth: int | None = None) -> set[str]:
+        """Get the files that import any of the given files.
+
+        Importers of importers are followed up to ``max_depth`` levels, or
+        transitively if it is None. The given files are included.
+        """
+        if not self._built:
+            self.build()
+        seen = set(rel_paths)
+        queue = deque((rel, 0) for rel in rel_paths)
+        while queue:
+            rel, depth = queue.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for importer in self._importers.get(rel, ()):
+                if importer not in seen:
+                    seen.add(importer)
+                    queue.append((importer, depth + 1))
+        return seen
+
+    def locate(self, edited: list[str]) -> set[str] | None:
+        """Map edited file paths to their project-relative paths in the graph.
+
+        Returns None if any of them can't be located: deleted files, files
+        outside the project and files the scan skips.
+        """
+        if not self._built:
+            self.build()
+        rel_paths: set[str] = set()
+        for file_path in edited:
+            path = Path(file_path)
+            if not path.is_absolute():
+                path = self.project_dir / path
+            if not path.exists():
+                # Deleted files can't be located; importers may now fail
+                return None
+            try:
+                rel_path = path.resolve().relative_to(self.project_dir.resolve())
+            except ValueError:
+                return None
+            rel = rel_path.as_posix()
+            if rel not in self._importers:
+                return None
+            rel_paths.add(rel)
+        return rel_paths
+
+    def affected_tests(self, edited: list[str]) -> list[str] | None:
+        """Get the test files affected by the edited files.
+
+        Returns None if the full suite must run: when a config file changed,
+        an edited file can't be located in the import graph, an edited module
+        has no name or nothing imports it, since it may still be loaded by
+        path or by a plugin, or a conftest.py is among the affected files.
+        """
+        if not self._built:
+            self.build()
+        if self.config_changed:
+            return None
+
+        rel_paths = self.locate(edited)
+        if rel_paths is None:
+            return None
+        for rel in rel_paths:
+            if rel in self.unparsable:
+                return None
+            if not is_test_file(Path(rel)) and (
+                self.module_name(rel) is None or not self._importers[rel]
+            ):
+                return None
+
+        affected = self.dependents(rel_paths)
+        # pytest loads conftest.py for every test below it
+        if any(Path(rel).name == "conftest.py" for rel in affected):
+            return None
+        return sorted(rel for rel in affected if is_test_file(Path(rel)))
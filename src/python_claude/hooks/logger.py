@@ -0,0 +1,94 @@
+"""Buffered hook log with levels and size-based rotation."""
+
+import os
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from python_claude.hooks.config import Config
+
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40, "off": 100}
+
+# Number of compressed logs kept next to the active one
+BACKUPS = 3
+# Buffered lines are written early past this, to bound memory in long runs
+MAX_BUFFERED = 256
+
+
+class HookLogger:
+    """Collects a hook's log lines in memory and appends them in one write.
+
+    Messages below the ``log.level`` setting (default info) are dropped
+    without any I/O. Once the log grows past ``log.max-bytes`` it is gzipped
+    to ``hooks.log.1.gz``, shifting older logs up to ``hooks.log.3.gz``.
+    """
+
+    def __init__(
+        self, name: str, log_file: Callable[[], Path], config: Callable[[], "Config"]
+    ) -> None:
+        self.name = name
+        # Both resolved on first use, so runs that log nothing touch no files
+        self._log_file = log_file
+        self._config = config
+        self._threshold: int | None = None
+        self.buffer: list[str] = []
+
+    def enabled(self, level: str) -> bool:
+        """Check whether messages of a level are logged."""
+        if self._threshold is None:
+            level_name = self._config().string("log", "level").lower()
+            self._threshold = LEVELS.get(level_name, LEVELS["info"])
+        return LEVELS[level] >= self._threshold
+
+    def log(self, message: str, level: str = "info") -> None:
+        """Buffer a message if its level is enabled."""
+        if not self.enabled(level):
+            return
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        self.buffer.append(f"[{timestamp}] [{level.upper()}] [{self.name}] {message}\n")
+        if len(self.buffer) >= MAX_BUFFERED:
+            self.flush()
+
+    def flush(self) -> None:
+        """Append the buffered lines to the log file, rotating it if too large."""
+        if not self.buffer:
+            return
+        data = "".join(self.buffer).encode()
+        self.buffer = []
+        path = self._log_file()
+        try:
+            max_bytes = self._config().integer("log", "max-bytes")
+            if path.stat().st_size + len(data) > max_bytes:
+                rotate(path)
+        except FileNotFoundError:
+            pass
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+
+
+def rotate(path: Path, backups: int = BACKUPS) -> None:
+    """Compress the log into its first backup, shifting older backups up.
+
+    The log is first renamed aside, so when several processes rotate at once
+    only one of them moves it and the others keep appending to a new log.
+    """
+    import gzip
+    import shutil
+
+    aside = path.with_name(f"{path.name}.{os.getpid()}.rotating")
+    try:
+        os.rename(path, aside)
+    except FileNotFoundError:
+        return
+    for i in range(backups - 1, 0, -1):
+        older = path.with_name(f"{path.name}.{i}.gz")
+        if older.exists():
+            os.replace(older, path.with_name(f"{path.name}.{i + 1}.gz"))
+    with open(aside, "rb") as src, gzip.open(f"{path}.1.gz", "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    aside.unlink()
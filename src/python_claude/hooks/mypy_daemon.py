@@ -0,0 +1,123 @@
+"""Persistent dmypy daemon backend for the mypy hook."""
+
+import hashlib
+from pathlib import Path
+
+from python_claude.hooks.base import Hook
+
+# Changes to any of these invalidate the daemon's view of the project
+CONFIG_FILES = ("pyproject.toml", "mypy.ini", ".mypy.ini", "setup.cfg", "uv.lock")
+
+# dmypy exits with 2 both for mypy's blocking errors and for daemon failures
+BLOCKING_OR_FAILED = 2
+
+
+def config_fingerprint(project_dir: Path) -> str:
+    """Hash the mypy configuration and lockfile of a project."""
+    digest = hashlib.sha256()
+    for name in CONFIG_FILES:
+        path = project_dir / name
+        digest.update(name.encode())
+        if path.exists():
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class MypyDaemon:
+    """Manages one dmypy daemon per project, or workspace package, and session.
+
+    The daemon's files are kept in ``state_dir``, the hook's by default.
+    """
+
+    def __init__(self, hook: Hook, state_dir: Path | None = None) -> None:
+        self.hook = hook
+        self.state_dir = state_dir or hook.state_dir
+
+    @property
+    def status_file(self) -> Path:
+        """Get the dmypy status file for this session."""
+        return self.state_dir / "dmypy.json"
+
+    @property
+    def fingerprint_file(self) -> Path:
+        """Get the file recording the config the daemon was started with."""
+        return self.state_dir / "dmypy-fingerprint.txt"
+
+    def _command(self, *args: str) -> list[str]:
+        return ["uv", "run", "dmypy", "--status-file", str(self.status_file), *args]
+
+    def fingerprint(self) -> str:
+        """Hash the mypy configuration and lockfile of the project and package."""
+        fingerprint = config_fingerprint(self.hook.project_dir)
+        if self.hook.cwd is not None and self.hook.cwd != self.hook.project_dir:
+            fingerprint += config_fingerprint(self.hook.cwd)
+        return fingerprint
+
+    def is_current(self, fingerprint: str) -> bool:
+        """Check whether a daemon is running with the current configuration."""
+        if not self.status_file.exists() or not self.fingerprint_file.exists():
+            return False
+        return self.fingerprint_file.read_text().strip() == fingerprint
+
+    def is_alive(self) -> bool:
+        """Check whether the daemon process is still responding."""
+        return self._run_quietly("status") == 0
+
+    def _run_quietly(self, *args: str) -> int:
+        return self.hook.run_quietly(self._command(*args))
+
+    def start(self, fingerprint: str) -> bool:
+        """Start a fresh daemon, replacing any existing one.
+
+        The daemon exits by itself after ``mypy.daemon-idle-minutes`` without
+        requests, in case the session ends without stopping it.
+        """
+        self.stop()
+        args = ["start"]
+        idle_minutes = self.hook.config.integer("mypy", "daemon-idle-minutes")
+        if idle_minutes:
+            args += ["--timeout", str(idle_minutes * 60)]
+        self.hook.log(f"dmypy {' '.join(args)}")
+        if self._run_quietly(*args) != 0:
+            self.hook.log("dmypy failed to start", "warning")
+            return False
+        self.fingerprint_file.write_text(f"{fingerprint}\n")
+        return True
+
+    def stop(self) -> None:
+        """Stop the daemon if one is running for this session."""
+        if self.status_file.exists():
+            self.hook.log("dmypy stop")
+            self._run_quietly("stop")
+        self.status_file.unlink(missing_ok=True)
+        self.fingerprint_file.unlink(missing_ok=True)
+
+    def check(
+        self, paths: list[str], targets: list[str], start: bool = True
+    ) -> int | None:
+        """Type check the project, rechecking only the given changed paths.
+
+        A warm daemon rechecks the paths with ``dmypy recheck --update``.
+        Otherwise, or when the configuration changed, the daemon is restarted
+        and checks the targets, the whole project. Returns None if the daemon
+        is unusable, or without ``start`` if it would have to be started.
+        """
+        fingerprint = self.fingerprint()
+        if paths and self.is_current(fingerprint):
+            updated = [p for p in paths if Path(p).exists()]
+            removed = [p for p in paths if not Path(p).exists()]
+            args = ["recheck"]
+            if updated:
+                args += ["--update", *updated]
+            if removed:
+                args += ["--remove", *removed]
+            self.hook.log(f"dmypy {' '.join(args)}")
+            exit_code = self.hook.run_tool(self._command(*args))
+            if exit_code != BLOCKING_OR_FAILED or self.is_alive():
+                return exit_code
+            self.hook.log("dmypy daemon died", "warning")
+
+        if not start or not self.start(fingerprint):
+            return None
+        self.hook.log(f"dmypy check {' '.join(targets)}")
+        return self.hook.run_tool(self._command("check", *targets))
@@ -1,32 +1,140 @@
 """Mypy hook for Claude Code."""
 
-import subprocess
-import sys
 from pathlib import Path
 
-from python_claude.hooks.base import Hook, HookInput
+from python_claude.hooks.base import TIMEOUT_EXIT, Hook, HookInput
+from python_claude.hooks.mypy_daemon import MypyDaemon
+from python_claude.hooks.mypy_scope import MypyScope
+from python_claude.hooks.result_cache import MYPY_CONFIG, open_cache, run_cached
 from python_claude.hooks.state import QualityCheckState
+from python_claude.hooks.tracking import PendingEdits
+from python_claude.hooks.workspace import (
+    affected_packages,
+    local_paths,
+    merge_exit_codes,
+    nested_packages,
+    package_config,
+    package_path,
+    paths_outside,
+    run_packages,
+)
 
 
 class MypyHook(Hook):
     """Runs mypy type checking on edited Python files."""
 
     name = "mypy"
+    timeout_section = "mypy"
 
     def __init__(self, hook_input: HookInput | None = None) -> None:
         super().__init__(hook_input)
 
     @property
-    def track_file(self) -> Path:
-        """Get the path to the edited files tracking file."""
-        return self.log_dir / "mypy-files.txt"
+    def use_daemon(self) -> bool:
+        """Whether to check through a persistent dmypy daemon."""
+        return self.config.flag("mypy", "daemon")
+
+    @property
+    def check_affected(self) -> bool:
+        """Whether Stop checks only the edited files and their importers."""
+        return self.config.flag("mypy", "affected")
+
+    def scope(self) -> MypyScope:
+        """Get the selection of affected files, as configured."""
+        depth = self.config.integer("mypy", "depth")
+        full_every = self.config.integer("mypy", "full-every")
+        return MypyScope(
+            self.project_dir, depth or None, full_every, package_path(self)
+        )
+
+    def full_targets(self, excluded: list[Path]) -> list[str]:
+        """Get the configured targets, leaving out the given workspace packages."""
+        targets = self.config.strings("mypy", "targets")
+        return paths_outside(self.cwd or self.project_dir, targets, excluded)
+
+    def _check(
+        self,
+        changed: list[str],
+        mypy_targets: list[str],
+        full_targets: list[str],
+        start: bool = True,
+    ) -> int:
+        """Type check with the daemon if enabled, otherwise with plain mypy.
+
+        A daemon that must be started checks ``full_targets``. Without
+        ``start``, plain mypy is used unless a daemon is already running.
+        """
+        if self.use_daemon:
+            exit_code = MypyDaemon(self).check(changed, full_targets, start)
+            if exit_code is not None:
+                return exit_code
+        # mypy writes errors to stdout, but only stderr is fed back to Claude
+        args = self.config.strings("mypy", "args")
+        return self.run_tool(["uv", "run", "mypy", *args, *mypy_targets])
+
+    def check_edits(self, files: list[str]) -> int:
+        """Type check the hook's directory after the given files were edited.
+
+        Returns mypy's exit code. Workspace packages below the directory are
+        left out when they are checked on their own.
+        """
+        excluded = nested_packages(self)
+        scope: MypyScope | None = None
+        targets: list[str] | None = None
+        if self.check_affected and not self.use_daemon:
+            scope = self.scope()
+            selected = scope.targets(files)
+            if selected is not None:
+                targets = local_paths(self, selected, excluded)
+        # Check the affected files, or else the entire project
+        full_targets = self.full_targets(excluded)
+        mypy_targets = targets or full_targets
+        if not mypy_targets:
+            self.log("No files to check outside the workspace packages")
+            return 0
+
+        self.file_count = len(files)
+        self.log(" ".join(mypy_targets))
+
+        # An identical tree has the same result
+        cache = open_cache(self.project_dir)
+        prefix = package_path(self)
+        key_args = [*([prefix] if prefix else []), *self.config.strings("mypy", "args")]
+        key_args += mypy_targets
+        config_files = package_config(self, MYPY_CONFIG)
+        key = cache.tree_key("mypy", key_args, config_files) if cache else ""
+        exit_code = run_cached(
+            self, cache, key, lambda: self._check(files, mypy_targets, full_targets)
+        )
+        if exit_code == 0 and scope is not None:
+            scope.accept(full=targets is None)
+        return exit_code
+
+    def _check_packages(
+        self, pending: PendingEdits, packages: dict[Path, list[str]]
+    ) -> int:
+        """Type check each workspace package with edits, in parallel."""
+        self.file_count = len(pending.files)
+        self.log(f"Checking {len(packages)} packages")
+        exit_code = merge_exit_codes(run_packages(self, packages, MypyHook.check_edits))
+        self.log(f"exit {exit_code}")
+        if exit_code == 0:
+            self.edits.mark_done(self.name, pending.seq)
+        if exit_code in (1, TIMEOUT_EXIT):
+            return 2
+        return exit_code
 
     def run(self) -> int:
         """Run mypy on the edited file or entire project if enabled.
 
         If file_path is provided and is a Python file, run mypy on that file.
         If no file_path is provided (e.g., Stop hook), run mypy on entire project
-        only if files were edited.
+        only if files were edited. In daemon mode, a warm dmypy daemon rechecks
+        just the edited files, falling back to mypy if the daemon is unusable.
+        A single edited file is only checked with a daemon already running.
+        Otherwise, in affected mode, only the edited files and their importers
+        are checked. With per-package checks, each workspace package with
+        edits is checked the same way from its own directory instead.
         """
         state = QualityCheckState(self.project_dir)
         if not state.is_enabled("mypy"):
@@ -34,38 +142,32 @@ class MypyHook(Hook):
             return 0
 
         file_path = self.input.file_path
-
-        # Determine what to type check
         if file_path:
             # File path provided - check if it's a Python file
             if not self.is_python_file(file_path):
                 return 0
-            mypy_target = file_path
+            self.file_count = 1
+            self.log(file_path)
+            # A cold daemon would check the whole project on every edit
+            exit_code = self._check([file_path], [file_path], [], start=False)
+            self.log(f"exit {exit_code}")
         else:
             # No file path (Stop hook) - check if any Python files were edited
-            if not self.track_file.exists() or self.track_file.stat().st_size == 0:
+            pending = self.pending_edits()
+            if not pending.files:
                 self.log("No edited Python files")
                 return 0
-            # Check entire project
-            mypy_target = "."
-
-        self.log(mypy_target)
-
-        # mypy writes errors to stdout, but only stderr is fed back to Claude
-        result = subprocess.run(
-            ["uv", "run", "mypy", mypy_target],
-            cwd=self.project_dir,
-            stdout=sys.stderr,  # Redirect stdout to stderr for Claude
-        )
-
-        exit_code = result.returncode
-        self.log(f"exit {exit_code}")
-
-        # Clean up tracking file on success (only for Stop hook)
-        if exit_code == 0 and not file_path:
-            self.track_file.unlink(missing_ok=True)
-
-        # Map mypy exit code 1 (type errors) to exit code 2 for Claude Code correction
-        if exit_code == 1:
+            packages = affected_packages(self, pending.files)
+            if packages is not None:
+                return self._check_packages(pending, packages)
+            exit_code = self.check_edits(pending.files)
+            self.log(f"exit {exit_code}")
+            # Mark the edits as checked on success (only for Stop hook)
+            if exit_code == 0:
+                self.edits.mark_done(self.name, pending.seq)
+
+        # Map mypy exit code 1 (type errors) to exit code 2 for Claude Code correction,
+        # and a timeout too, so Claude sees which check ran out of time
+        if exit_code in (1, TIMEOUT_EXIT):
             return 2
         return exit_code
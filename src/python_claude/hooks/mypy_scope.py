@@ -0,0 +1,98 @@
+"""Narrow Stop-time mypy runs to the modules affected by the edits."""
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from python_claude.hooks.import_graph import ImportGraph
+from python_claude.hooks.mypy_daemon import config_fingerprint
+
+
+class MypyScope:
+    """Chooses the files mypy must check for a set of edited files.
+
+    Edited files are always checked. When an edited file's public interface
+    differs from the one last checked successfully, its importers are checked
+    too, up to ``depth`` levels (all levels if None). The whole project is
+    checked instead when no full run has passed yet, the mypy configuration
+    changed, an edited file can't be located or has no module name, since
+    its importers can't be found, or ``full_every`` scoped runs have passed
+    since the last full run. State is kept in
+    ``.claude/mypy-scope.json``, or for a workspace package, given by its
+    project-relative directory, in ``.claude/packages/<package>/``.
+    Selected paths are relative to the project either way.
+    """
+
+    def __init__(
+        self, project_dir: Path, depth: int | None, full_every: int, package: str = ""
+    ) -> None:
+        self.project_dir = project_dir
+        self.package = package
+        state_dir = project_dir / ".claude"
+        if package:
+            state_dir = state_dir / "packages" / package
+        self.state_file = state_dir / "mypy-scope.json"
+        self.depth = depth
+        self.full_every = full_every
+        self.graph = ImportGraph(project_dir)
+        # Project-relative edited files of the last scoped selection
+        self.edited: set[str] = set()
+
+    def _load(self) -> dict[str, Any]:
+        try:
+            data = json.loads(self.state_file.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save(self, data: dict[str, Any]) -> None:
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(data))
+        os.replace(tmp_file, self.state_file)
+
+    def config(self) -> str:
+        """Hash the mypy configuration of the project and package."""
+        fingerprint = config_fingerprint(self.project_dir)
+        if self.package:
+            fingerprint += config_fingerprint(self.project_dir / self.package)
+        return fingerprint
+
+    def targets(self, edited: list[str]) -> list[str] | None:
+        """Get the files to check, or None if the whole project must be checked."""
+        state = self._load()
+        if state.get("config") != self.config():
+            return None
+        if self.full_every and state.get("scoped_runs", 0) >= self.full_every:
+            return None
+        rel_paths = self.graph.locate(edited)
+        if rel_paths is None or any(
+            self.graph.module_name(rel) is None for rel in rel_paths
+        ):
+            return None
+
+        checked: dict[str, str | None] = state.get("interfaces", {})
+        current = self.graph.interfaces()
+        changed = {
+            rel
+            for rel in rel_paths
+            if current[rel] is None or current[rel] != checked.get(rel)
+        }
+        self.edited = rel_paths
+        return sorted(rel_paths | self.graph.dependents(changed, self.depth))
+
+    def accept(self, full: bool) -> None:
+        """Record a successful run as the baseline for the next selection."""
+        current = self.graph.interfaces()
+        if full:
+            config = self.config()
+            self._save({"config": config, "interfaces": current, "scoped_runs": 0})
+            return
+        state = self._load()
+        interfaces: dict[str, str | None] = state.get("interfaces", {})
+        for rel in self.edited:
+            interfaces[rel] = current.get(rel)
+        state["interfaces"] = interfaces
+        state["scoped_runs"] = state.get("scoped_runs", 0) + 1
+        self._save(state)
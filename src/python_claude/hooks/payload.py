@@ -0,0 +1,141 @@
+"""Lazy parsing of hook input JSON.
+
+Edit hooks get the whole tool input on stdin, including the full contents
+of a written file, but most only need the session ID and the file path.
+``scan_payload`` finds string values by their key path in one pass over the
+JSON text, skipping over other strings without decoding them, and stops
+once every wanted value is found. ``LazyPayload`` answers the scanned keys
+directly and parses the whole payload only when other keys are read.
+"""
+
+import json
+import re
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+# A JSON string, or a character that opens, closes or separates a container.
+# Numbers, booleans and null are skipped: only string values are scanned for.
+_TOKEN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]:,]', re.DOTALL)
+
+KeyPath = tuple[str, ...]
+
+
+def scan_payload(text: str, wanted: set[KeyPath]) -> dict[KeyPath, str] | None:
+    """Find the string values at the wanted key paths of a JSON object.
+
+    Values that aren't strings, or are inside arrays, are not found. Returns
+    None when the text doesn't look like a JSON object, so the caller can
+    parse it in full and report the error.
+    """
+    if not text.lstrip().startswith("{"):
+        return None
+    found: dict[KeyPath, str] = {}
+    # Open containers, and the keys leading to those below the top object
+    stack: list[str] = []
+    path: list[str] = []
+    key: str | None = None
+    expect_key = False
+    for match in _TOKEN.finditer(text):
+        token = match.group()
+        if token in ("{", "["):
+            if stack:
+                path.append(key if stack[-1] == "{" and key is not None else "")
+            stack.append(token)
+            expect_key = token == "{"
+        elif token in ("}", "]"):
+            if not stack:
+                return None
+            stack.pop()
+            if stack:
+                path.pop()
+            else:
+                break
+        elif token == ",":
+            if not stack:
+                return None
+            expect_key = stack[-1] == "{"
+        elif token == ":":
+            continue
+        elif expect_key:
+            key = json.loads(token)
+            expect_key = False
+        elif stack and "[" not in stack and key is not None:
+            key_path = (*path, key)
+            if key_path in wanted:
+                found[key_path] = json.loads(token)
+                if len(found) == len(wanted):
+                    break
+    return found
+
+
+class _Document:
+    """JSON text with the scanned values, parsed in full on first use."""
+
+    def __init__(self, text: str, wanted: set[KeyPath]) -> None:
+        self.text = text
+        self.wanted = wanted
+        found = scan_payload(text, wanted)
+        self._data: dict[str, Any] | None = None
+        if found is None:
+            # Not an object: parse now to raise the usual error
+            found = {}
+            self.data  # noqa: B018
+        self.found = found
+
+    @property
+    def data(self) -> dict[str, Any]:
+        if self._data is None:
+            self._data = json.loads(self.text)
+        return self._data
+
+
+class LazyPayload(Mapping[str, Any]):
+    """An object in hook input JSON, parsed only for keys that weren't scanned."""
+
+    def __init__(self, document: _Document, path: KeyPath = ()) -> None:
+        self._document = document
+        self._path = path
+        depth = len(path)
+        # Scanned keys of this object, absent from it unless found
+        self._scanned = {
+            key_path[depth]
+            for key_path in document.wanted
+            if len(key_path) == depth + 1 and key_path[:depth] == path
+        }
+        self._found = {
+            key_path[depth]: value
+            for key_path, value in document.found.items()
+            if len(key_path) == depth + 1 and key_path[:depth] == path
+        }
+
+    @classmethod
+    def parse(cls, text: str, wanted: set[KeyPath]) -> "LazyPayload":
+        """Scan JSON text for the values at the wanted key paths, deferring the rest."""
+        return cls(_Document(text, wanted))
+
+    def child(self, key: str) -> "LazyPayload":
+        """Get the object at one of this object's keys, empty if missing."""
+        return LazyPayload(self._document, (*self._path, key))
+
+    @property
+    def _value(self) -> Mapping[str, Any]:
+        value: Any = self._document.data
+        for key in self._path:
+            value = value.get(key, {}) if isinstance(value, dict) else {}
+        return value if isinstance(value, dict) else {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._scanned:
+            return self._found[key]
+        return self._value[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._value)
+
+    def __len__(self) -> int:
+        return len(self._value)
+
+    def __repr__(self) -> str:
+        if self._document._data is None:
+            return f"LazyPayload({self._found!r}, unparsed)"
+        return repr(dict(self._value))
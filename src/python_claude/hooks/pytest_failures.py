@@ -0,0 +1,118 @@
+"""Failure-first pytest runs that retry the session's failed tests before the rest."""
+
+import io
+import json
+import os
+from pathlib import Path
+
+from python_claude.hooks.base import TIMEOUT_EXIT, Hook
+from python_claude.hooks.pytest_shards import PLUGIN, read_report, run_sharded
+from python_claude.pytest_plugin import REPORT_ENV
+
+# pytest exit codes
+TESTS_FAILED = 1
+NO_TESTS_COLLECTED = 5
+
+
+class FailureStore:
+    """Node IDs of the tests that failed last, kept in the session's directory."""
+
+    def __init__(self, log_dir: Path) -> None:
+        self.path = log_dir / "pytest-failed.json"
+
+    def load(self) -> list[str]:
+        """Load the failed node IDs in the order they were reported."""
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return []
+        if not isinstance(data, list):
+            return []
+        return [nodeid for nodeid in data if isinstance(nodeid, str)]
+
+    def save(self, nodeids: list[str]) -> None:
+        """Replace the failed node IDs, forgetting them all if none are given."""
+        if not nodeids:
+            self.path.unlink(missing_ok=True)
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(nodeids))
+        os.replace(tmp_path, self.path)
+
+
+def _run_reported(
+    hook: Hook, args: list[str]
+) -> tuple[int, dict[str, str] | None, str]:
+    """Run pytest with the reporting plugin and capture its output.
+
+    Returns the exit code, the outcome of every test that ran, and the
+    output. The outcomes are None if the plugin wrote no report.
+    """
+    report = hook.state_dir / "pytest-report.json"
+    report.unlink(missing_ok=True)
+    output = io.StringIO()
+    exit_code = hook.run_tool(
+        ["uv", "run", "pytest", *PLUGIN, *args],
+        env={REPORT_ENV: str(report)},
+        output=output,
+    )
+    if not report.exists():
+        return exit_code, None, output.getvalue()
+    tests = read_report(report).get("tests", {})
+    report.unlink(missing_ok=True)
+    outcomes = {nodeid: test["outcome"] for nodeid, test in tests.items()}
+    return exit_code, outcomes, output.getvalue()
+
+
+def run_failed_first(
+    hook: Hook, targets: list[str], workers: int, args: list[str]
+) -> int | None:
+    """Rerun the tests that failed last with -x, then the other selected tests.
+
+    The other tests only run once the failed ones pass, and the failures of
+    either tier are saved for the next run. Returns pytest's exit code, or
+    None if the reporting plugin can't be loaded into the project's pytest.
+    """
+    store = FailureStore(hook.state_dir)
+    failed = store.load()
+    passed: list[str] = []
+    if failed:
+        hook.log(f"Rerunning {len(failed)} failed tests first")
+        exit_code, outcomes, output = _run_reported(hook, [*args, "-x", *failed])
+        if outcomes is None and exit_code != TIMEOUT_EXIT:
+            return None
+        if outcomes is None or exit_code == TESTS_FAILED:
+            hook.output.write(f"# pytest: rerun of {len(failed)} failed tests\n")
+            hook.output.write(output)
+            hook.output.flush()
+            if outcomes is not None:
+                # Tests after the first failure didn't run, so they stay
+                store.save([n for n in failed if outcomes.get(n) != "passed"])
+            return exit_code
+        if exit_code == 0:
+            passed = failed
+        else:
+            # Failed tests that were renamed or removed can't be selected
+            hook.log(f"Rerun of failed tests exited {exit_code}, running all")
+        store.save([])
+
+    deselect = [arg for nodeid in passed for arg in ("--deselect", nodeid)]
+    if workers > 1:
+        sharded = run_sharded(hook, targets, workers, [*args, *deselect], store)
+        if sharded is None:
+            return None
+        exit_code = sharded
+    else:
+        exit_code, outcomes, output = _run_reported(hook, [*args, *deselect, *targets])
+        if outcomes is None and exit_code != TIMEOUT_EXIT:
+            return None
+        hook.output.write(output)
+        hook.output.flush()
+        if outcomes is not None and exit_code in (0, TESTS_FAILED):
+            store.save([n for n, outcome in outcomes.items() if outcome == "failed"])
+
+    if passed and exit_code == NO_TESTS_COLLECTED:
+        # The failed tests were all the selected tests, and they pass now
+        return 0
+    return exit_code
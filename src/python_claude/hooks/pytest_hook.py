@@ -1,58 +1,170 @@
 """Pytest hook for Claude Code."""
 
-import subprocess
-import sys
 from pathlib import Path
 
-from python_claude.hooks.base import Hook, HookInput
+from python_claude.hooks.base import TIMEOUT_EXIT, Hook, HookInput
+from python_claude.hooks.import_graph import ImportGraph
+from python_claude.hooks.pytest_failures import run_failed_first
+from python_claude.hooks.pytest_preload import preloaded
+from python_claude.hooks.pytest_shards import resolve_workers, run_sharded
+from python_claude.hooks.result_cache import PYTEST_CONFIG, open_cache, run_cached
 from python_claude.hooks.state import QualityCheckState
+from python_claude.hooks.tracking import PendingEdits
+from python_claude.hooks.workspace import (
+    affected_packages,
+    local_paths,
+    merge_exit_codes,
+    nested_packages,
+    package_config,
+    package_path,
+    run_packages,
+)
+
+# pytest's exit code when no tests were collected
+NO_TESTS_COLLECTED = 5
 
 
 class PytestHook(Hook):
     """Runs pytest when stopping."""
 
     name = "pytest"
+    timeout_section = "pytest"
 
     def __init__(self, hook_input: HookInput | None = None) -> None:
         super().__init__(hook_input)
 
     @property
-    def track_file(self) -> Path:
-        """Get the path to the edited files tracking file."""
-        return self.log_dir / "pytest-files.txt"
+    def select_affected(self) -> bool:
+        """Whether to run only the tests that import the edited files."""
+        return self.config.flag("pytest", "affected")
+
+    @property
+    def workers(self) -> int:
+        """Number of parallel pytest processes, 1 to run serially."""
+        return resolve_workers(self.config.string("pytest", "workers"))
+
+    @property
+    def failed_first(self) -> bool:
+        """Whether the tests that failed last run first, alone and with -x."""
+        return self.config.flag("pytest", "failed-first")
+
+    def _pytest(self, targets: list[str], args: list[str]) -> int:
+        """Run pytest, in parallel shards if more than one worker is configured.
+
+        Failed-first runs fall back to plain shards, and shards to a serial
+        run, when they get no report from the reporting plugin.
+        """
+        exit_code = None
+        if self.failed_first:
+            exit_code = run_failed_first(self, targets, self.workers, args)
+        if exit_code is None and self.workers > 1:
+            exit_code = run_sharded(self, targets, self.workers, args)
+        if exit_code is not None:
+            return exit_code
+        if self.failed_first or self.workers > 1:
+            self.log("pytest plugin unavailable, running serially", "warning")
+        if self.config.flag("pytest", "preload"):
+            return self.run_tool(
+                ["uv", "run", "pytest", *args, *targets],
+                process=preloaded(self, [*args, *targets]),
+            )
+        return self.run_tool(["uv", "run", "pytest", *args, *targets])
+
+    def check_edits(self, files: list[str]) -> int:
+        """Run the tests of the hook's directory after the given files were edited.
+
+        Returns pytest's exit code, or 0 if no tests are affected. Workspace
+        packages below the directory are left out when they are tested on
+        their own.
+        """
+        excluded = nested_packages(self)
+        directory = self.cwd or self.project_dir
+        args = self.config.strings("pytest", "args")
+        args += [f"--ignore={p.relative_to(directory).as_posix()}" for p in excluded]
+        self.file_count = len(files)
+
+        graph: ImportGraph | None = None
+        targets: list[str] | None = None
+        if self.select_affected:
+            graph = ImportGraph(self.project_dir)
+            selected = graph.affected_tests(files)
+            if selected is not None:
+                targets = local_paths(self, selected, excluded)
+                if not targets:
+                    self.log("No tests affected by edited files")
+                    return 0
+
+        if targets is None:
+            self.log("Running pytest")
+        else:
+            self.log(f"Running {len(targets)} affected test files")
+
+        run_targets = self.config.strings("pytest", "targets")
+        if targets is not None:
+            run_targets = targets
+
+        # An identical tree has the same result
+        cache = open_cache(self.project_dir)
+        prefix = package_path(self)
+        key_args = [*([prefix] if prefix else []), *args, *run_targets]
+        config_files = package_config(self, PYTEST_CONFIG)
+        key = cache.tree_key("pytest", key_args, config_files) if cache else ""
+        exit_code = run_cached(
+            self,
+            cache,
+            key,
+            lambda: self._pytest(run_targets, args),
+            cacheable=(0, 1, 5),
+        )
+        if exit_code == 0 and graph is not None and targets is None:
+            graph.accept_config()
+        return exit_code
+
+    def _test_packages(
+        self, pending: PendingEdits, packages: dict[Path, list[str]]
+    ) -> int:
+        """Run the tests of each workspace package with edits, in parallel."""
+        self.file_count = len(pending.files)
+        self.log(f"Testing {len(packages)} packages")
+        exit_codes = run_packages(self, packages, PytestHook.check_edits)
+        # Packages without tests don't count unless none has any
+        with_tests = [code for code in exit_codes if code != NO_TESTS_COLLECTED]
+        exit_code = merge_exit_codes(with_tests) if with_tests else NO_TESTS_COLLECTED
+        if exit_code in (1, TIMEOUT_EXIT):
+            exit_code = 2
+        self.log(f"exit {exit_code}")
+        if exit_code == 0:
+            self.edits.mark_done(self.name, pending.seq)
+        return exit_code
 
     def run(self) -> int:
         """Run pytest if enabled and files were edited."""
         state = QualityCheckState(self.project_dir)
-        self.log(f"state:{state}")
+        self.log(f"state:{state}", "debug")
         if not state.is_enabled("pytest"):
             self.log("Skipped (disabled)")
             return 0
 
-        self.log(f"{self.track_file}")
-
-        # Check if any Python files were edited
-        if not self.track_file.exists() or self.track_file.stat().st_size == 0:
+        # Check if any Python files were edited since the last successful run
+        pending = self.pending_edits()
+        if not pending.files:
             self.log("No edited Python files")
             return 0
 
-        self.log("Running pytest")
-
-        result = subprocess.run(
-            ["uv", "run", "pytest"],
-            cwd=self.project_dir,
-            stdout=sys.stderr,
-        )
+        packages = affected_packages(self, pending.files)
+        if packages is not None:
+            return self._test_packages(pending, packages)
 
-        exit_code = result.returncode
+        exit_code = self.check_edits(pending.files)
         # Transform pytest exit code 1 (test failures) to exit code 2
-        # for Claude Code to properly understand test failures
-        if exit_code == 1:
+        # for Claude Code to properly understand test failures; a hanging
+        # test is reported the same way
+        if exit_code in (1, TIMEOUT_EXIT):
             exit_code = 2
         self.log(f"exit {exit_code}")
 
-        # Clean up tracking file on success
+        # Mark the edits as tested on success
         if exit_code == 0:
-            self.track_file.unlink(missing_ok=True)
+            self.edits.mark_done(self.name, pending.seq)
 
         return exit_code
@@ -0,0 +1,183 @@
+"""Running pytest in a warm worker with the project's dependencies imported.
+
+Large dependencies can take pytest longer to import than the tests take to
+run. With ``pytest.preload`` enabled, the hook starts a worker in the
+project's environment that imports pytest and every third-party module the
+project's files import, found with the import graph and installed outside
+the project's own directories, and then forks a child for each run. The
+first run after the worker is started, or after the set of dependencies
+changed, runs pytest as usual while the worker preloads.
+
+The dependency set is keyed by the imported module names and the contents of
+``uv.lock`` and ``pyproject.toml``. A worker preloaded for another key exits
+when asked to run, and a new one is started in its place.
+"""
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
+from python_claude.hooks import base
+from python_claude.hooks.background import is_locked
+from python_claude.hooks.import_graph import ImportGraph
+from python_claude.hooks.server import send_request
+from python_claude.hooks.tool_resolver import LOCK_FILES
+
+if TYPE_CHECKING:
+    import subprocess
+    import threading
+
+    from python_claude.hooks.base import Hook, ProcessRunner
+
+# Held by the running worker, with its process ID as contents
+LOCK_FILE = "pytest-worker.lock"
+SOCKET_FILE = "pytest-worker.sock"
+
+
+def lock_file(project_dir: Path) -> Path:
+    """Get the project's pytest worker lock file."""
+    return project_dir / ".claude" / LOCK_FILE
+
+
+def socket_file(project_dir: Path) -> Path:
+    """Get the project's pytest worker socket."""
+    return project_dir / ".claude" / SOCKET_FILE
+
+
+def preload_modules(project_dir: Path) -> list[str]:
+    """Get the third-party modules imported by the project's files."""
+    return sorted(
+        name
+        for name in ImportGraph(project_dir).external_imports()
+        if name.split(".")[0] not in sys.stdlib_module_names
+    )
+
+
+def dependency_key(project_dir: Path, modules: list[str]) -> str:
+    """Fingerprint the modules to preload and the files pinning their versions."""
+    digest = hashlib.sha256(json.dumps(modules).encode())
+    for name in LOCK_FILES:
+        path = project_dir / name
+        if path.exists():
+            digest.update(name.encode() + b"\0" + path.read_bytes())
+    return digest.hexdigest()
+
+
+def start_worker(hook: "Hook", modules: list[str], key: str) -> None:
+    """Start a detached worker preloading the modules in the project's environment."""
+    import subprocess
+
+    worker = ["uv", "run", "python", "-m", "python_claude.pytest_worker"]
+    args, env = hook.tool_command(worker)
+    settings = {
+        "project": str(hook.project_dir),
+        "socket": str(socket_file(hook.project_dir)),
+        "lock": str(lock_file(hook.project_dir)),
+        "key": key,
+        "modules": modules,
+        "idle_seconds": hook.config.integer("pytest", "preload-idle-minutes") * 60,
+    }
+    process = subprocess.Popen(
+        args,
+        cwd=hook.project_dir,
+        env={**os.environ, **env},
+        stdin=subprocess.PIPE,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    if process.stdin is not None:
+        process.stdin.write(json.dumps(settings).encode())
+        process.stdin.close()
+
+
+def run_in_worker(
+    hook: "Hook",
+    pytest_args: list[str],
+    cwd: Path,
+    env: dict[str, str] | None,
+    output: IO[Any],
+    timeout: float | None,
+    cancel: "threading.Event | None" = None,
+) -> int | None:
+    """Run pytest in the project's warm worker, starting one if none is running.
+
+    Returns pytest's exit code, or None if no worker was ready to run it.
+    Raises subprocess.TimeoutExpired if pytest doesn't finish in time, or
+    Cancelled once the ``cancel`` event is set.
+    """
+    import subprocess
+
+    if os.name == "nt":
+        return None
+    modules = preload_modules(hook.project_dir)
+    key = dependency_key(hook.project_dir, modules)
+    path = socket_file(hook.project_dir)
+    exit_code = None
+    if path.exists():
+        argv = ["pytest", *pytest_args]
+        request = {"argv": argv, "cwd": str(cwd), "env": env or dict(os.environ)}
+        stdin = os.open(os.devnull, os.O_RDONLY)
+        try:
+            output.flush()
+            fds = [stdin, output.fileno(), output.fileno()]
+            exit_code = send_request(
+                str(path), {**request, "key": key}, fds, timeout, cancel
+            )
+        except TimeoutError:
+            raise subprocess.TimeoutExpired(argv, timeout or 0) from None
+        finally:
+            os.close(stdin)
+    if exit_code is None and not is_locked(lock_file(hook.project_dir)):
+        hook.log("Starting the pytest worker")
+        try:
+            start_worker(hook, modules, key)
+        except OSError as e:
+            hook.log(f"Starting the pytest worker failed: {e}", "warning")
+    return exit_code
+
+
+def preloaded(hook: "Hook", pytest_args: list[str]) -> "ProcessRunner":
+    """Get a stand-in for run_process that runs pytest in the warm worker.
+
+    ``pytest_args`` are the arguments after ``pytest``. Runs pytest as usual
+    while no worker is ready.
+    """
+
+    def run(
+        args: list[str],
+        *,
+        cwd: Path,
+        env: dict[str, str] | None = None,
+        stdout: Any = None,
+        stderr: Any = None,
+        timeout: float | None = None,
+        cancel: "threading.Event | None" = None,
+    ) -> "subprocess.CompletedProcess[bytes]":
+        import subprocess
+
+        if cancel is not None and cancel.is_set():
+            raise base.Cancelled(args)
+        expired = timeout is not None and timeout <= 0
+        if stdout is not None and stderr == subprocess.STDOUT and not expired:
+            exit_code = run_in_worker(
+                hook, pytest_args, cwd, env, stdout, timeout, cancel
+            )
+            if exit_code is not None:
+                hook.log("Ran pytest in the warm worker")
+                return subprocess.CompletedProcess(args, exit_code)
+        # Looked up when called, like run_tool does
+        return base.run_process(
+            args,
+            cwd=cwd,
+            env=env,
+            stdout=stdout,
+            stderr=stderr,
+            timeout=timeout,
+            cancel=cancel,
+        )
+
+    return run
@@ -0,0 +1,204 @@
+"""Parallel pytest execution with shards balanced by historical durations."""
+
+import heapq
+import io
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from python_claude.hooks.base import Hook
+from python_claude.hooks.scheduler import Task, run_tasks
+from python_claude.hooks.workspace import package_path
+from python_claude.pytest_plugin import REPORT_ENV
+
+if TYPE_CHECKING:
+    from python_claude.hooks.pytest_failures import FailureStore
+
+PLUGIN = ["-p", "python_claude.pytest_plugin"]
+
+# Assumed duration of a test that has never run, if nothing else is known
+DEFAULT_DURATION = 0.1
+
+
+def resolve_workers(value: str) -> int:
+    """Parse a worker count, where "auto" means one worker per CPU."""
+    value = value.strip().lower()
+    if value == "auto":
+        return os.cpu_count() or 1
+    try:
+        return max(int(value), 1)
+    except ValueError:
+        return 1
+
+
+class DurationStore:
+    """Per-test durations from previous runs, kept in project state.
+
+    Workspace packages, whose node IDs are relative to the package, each
+    keep their own.
+    """
+
+    def __init__(self, project_dir: Path, package: str = "") -> None:
+        state_dir = project_dir / ".claude"
+        if package:
+            state_dir = state_dir / "packages" / package
+        self.path = state_dir / "pytest-durations.json"
+
+    def load(self) -> dict[str, float]:
+        """Load the recorded durations, keyed by node ID."""
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def update(self, durations: dict[str, float]) -> None:
+        """Record new durations, keeping those of tests that didn't run."""
+        if not durations:
+            return
+        data = self.load()
+        data.update(durations)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(data))
+        os.replace(tmp_path, self.path)
+
+
+def partition(
+    nodeids: list[str], durations: dict[str, float], workers: int
+) -> list[list[str]]:
+    """Split tests into shards with roughly equal total expected duration.
+
+    Uses the longest-processing-time-first heuristic. Tests without history
+    are assumed to take the mean known duration. Within a shard, tests keep
+    their collection order so module and class fixtures are shared.
+    """
+    known = [durations[n] for n in nodeids if n in durations]
+    default = sum(known) / len(known) if known else DEFAULT_DURATION
+    order = {nodeid: i for i, nodeid in enumerate(nodeids)}
+
+    shards: list[list[str]] = [[] for _ in range(min(workers, len(nodeids)))]
+    loads = [(0.0, i) for i in range(len(shards))]
+    by_duration = sorted(nodeids, key=lambda n: -durations.get(n, default))
+    for nodeid in by_duration:
+        load, i = heapq.heappop(loads)
+        shards[i].append(nodeid)
+        heapq.heappush(loads, (load + durations.get(nodeid, default), i))
+
+    return [sorted(shard, key=order.__getitem__) for shard in shards if shard]
+
+
+def compact(shard: list[str], collected: list[str]) -> list[str]:
+    """Replace node IDs with their file when a shard holds the whole file."""
+    per_file: dict[str, int] = {}
+    for nodeid in collected:
+        file_path = nodeid.split("::")[0]
+        per_file[file_path] = per_file.get(file_path, 0) + 1
+    in_shard: dict[str, int] = {}
+    for nodeid in shard:
+        file_path = nodeid.split("::")[0]
+        in_shard[file_path] = in_shard.get(file_path, 0) + 1
+
+    args: list[str] = []
+    whole_files: set[str] = set()
+    for nodeid in shard:
+        file_path = nodeid.split("::")[0]
+        if in_shard[file_path] != per_file[file_path]:
+            args.append(nodeid)
+        elif file_path not in whole_files:
+            whole_files.add(file_path)
+            args.append(file_path)
+    return args
+
+
+def read_report(path: Path) -> dict[str, Any]:
+    """Read a JSON report written by the pytest plugin."""
+    try:
+        data = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def run_sharded(
+    hook: Hook,
+    targets: list[str],
+    workers: int,
+    args: list[str] | None = None,
+    failures: "FailureStore | None" = None,
+) -> int | None:
+    """Collect the tests, run them in parallel shards and merge the results.
+
+    Returns pytest's exit code for the whole run: 1 if any shard had test
+    failures, otherwise the first other non-zero exit code. Returns None if
+    the tests couldn't be collected with the reporting plugin. Extra pytest
+    ``args`` are passed to the collection and to every shard. The failed
+    tests are saved to ``failures`` once every shard has finished its run.
+    """
+    args = args or []
+    collect_report = hook.state_dir / "pytest-collect.json"
+    collect_report.unlink(missing_ok=True)
+    collect_output = io.StringIO()
+    exit_code = hook.run_tool(
+        ["uv", "run", "pytest", "--collect-only", "-q", *PLUGIN, *args, *targets],
+        env={REPORT_ENV: str(collect_report)},
+        output=collect_output,
+    )
+    if not collect_report.exists():
+        # The plugin couldn't be loaded into the project's pytest
+        return None
+    collected: list[str] = read_report(collect_report).get("collected", [])
+    if exit_code != 0 or not collected:
+        # Collection errors and empty suites are reported exactly as pytest would
+        hook.output.write(collect_output.getvalue())
+        hook.output.flush()
+        return exit_code
+
+    store = DurationStore(hook.project_dir, package_path(hook))
+    shards = partition(collected, store.load(), workers)
+    hook.log(f"Running {len(collected)} tests in {len(shards)} shards")
+
+    outputs = [io.StringIO() for _ in shards]
+    reports = [hook.state_dir / f"pytest-shard-{i}.json" for i in range(len(shards))]
+
+    def shard_task(i: int) -> Task:
+        def run() -> int:
+            reports[i].unlink(missing_ok=True)
+            return hook.run_tool(
+                ["uv", "run", "pytest", *PLUGIN, *args, *compact(shards[i], collected)],
+                env={REPORT_ENV: str(reports[i])},
+                output=outputs[i],
+            )
+
+        return Task(name=f"shard-{i}", run=run)
+
+    results = run_tasks([shard_task(i) for i in range(len(shards))])
+
+    durations: dict[str, float] = {}
+    failed: list[str] = []
+    for i, shard in enumerate(shards):
+        header = f"# pytest shard {i + 1}/{len(shards)} ({len(shard)} tests)\n"
+        hook.output.write(header)
+        hook.output.write(outputs[i].getvalue())
+        for nodeid, test in read_report(reports[i]).get("tests", {}).items():
+            durations[nodeid] = test["duration"]
+            if test["outcome"] == "failed":
+                failed.append(nodeid)
+        reports[i].unlink(missing_ok=True)
+    store.update(durations)
+
+    if failed:
+        listed = hook.config.integer("output", "examples")
+        hook.output.write(f"# {len(failed)} failed across all shards:\n")
+        hook.output.writelines(f"FAILED {nodeid}\n" for nodeid in failed[:listed])
+        if len(failed) > listed:
+            hook.output.write(f"# and {len(failed) - listed} more\n")
+    hook.output.flush()
+
+    exit_codes = [results[f"shard-{i}"] or 0 for i in range(len(shards))]
+    if failures is not None and all(code in (0, 1) for code in exit_codes):
+        failures.save(failed)
+    if 1 in exit_codes:
+        return 1
+    return next((code for code in exit_codes if code != 0), 0)
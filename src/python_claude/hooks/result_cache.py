@@ -0,0 +1,214 @@
+"""Content-addressed cache of check results so unchanged trees skip the tools."""
+
+import hashlib
+import io
+import json
+import os
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from python_claude.hooks.base import Hook
+from python_claude.hooks.config import load_config
+from python_claude.hooks.import_graph import iter_python_files
+
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+# Config files whose contents are part of each tool's cache keys
+RUFF_CONFIG = ("pyproject.toml", "ruff.toml", ".ruff.toml")
+MYPY_CONFIG = ("pyproject.toml", "mypy.ini", ".mypy.ini", "setup.cfg", "uv.lock")
+PYTEST_CONFIG = ("pyproject.toml", "setup.cfg", "pytest.ini", "tox.ini", "uv.lock")
+
+
+@dataclass
+class CachedResult:
+    """A recorded tool run."""
+
+    exit_code: int
+    output: str
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256("\0".join(parts).encode()).hexdigest()
+
+
+class ResultCache:
+    """Size-bounded LRU cache of tool results, stored in .claude/check-cache.
+
+    Each entry is one JSON file named by its key. Reading an entry refreshes
+    its mtime, and the least recently used entries are evicted once the cache
+    grows beyond ``max_bytes``.
+    """
+
+    def __init__(self, project_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.project_dir = project_dir
+        self.cache_dir = project_dir / ".claude" / "check-cache"
+        self.max_bytes = max_bytes
+        self._hashes: dict[str, list[int | str]] | None = None
+        self._hashes_changed = False
+
+    @property
+    def hash_index_file(self) -> Path:
+        """Get the file memoizing content hashes by path, mtime and size."""
+        return self.cache_dir / "hashes.idx"
+
+    def _entry_file(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> CachedResult | None:
+        """Look up a result, marking it as recently used."""
+        entry_file = self._entry_file(key)
+        try:
+            data = json.loads(entry_file.read_text())
+            os.utime(entry_file)
+        except (OSError, json.JSONDecodeError):
+            return None
+        return CachedResult(exit_code=data["exit_code"], output=data["output"])
+
+    def _write(self, key: str, exit_code: int, output: str) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry_file = self._entry_file(key)
+        tmp_file = entry_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps({"exit_code": exit_code, "output": output}))
+        os.replace(tmp_file, entry_file)
+
+    def put(self, key: str, exit_code: int, output: str) -> None:
+        """Store a result and evict old entries if the cache is too large."""
+        self._write(key, exit_code, output)
+        self.evict()
+
+    def is_clean(self, key: str) -> bool:
+        """Check whether a key has a recorded passing result."""
+        hit = self.get(key)
+        return hit is not None and hit.exit_code == 0
+
+    def mark_clean(self, keys: Iterable[str]) -> None:
+        """Record a silent passing result for each key."""
+        for key in keys:
+            self._write(key, 0, "")
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache fits its budget."""
+        entries: list[tuple[float, int, Path]] = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, Path(entry.path)))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def file_hash(self, path: Path) -> str:
+        """Hash a file's contents, reusing the hash while mtime and size match."""
+        if self._hashes is None:
+            try:
+                self._hashes = json.loads(self.hash_index_file.read_text())
+            except (OSError, json.JSONDecodeError):
+                self._hashes = {}
+        stat = path.stat()
+        key = str(path)
+        known = self._hashes.get(key)
+        if known and known[0] == stat.st_mtime_ns and known[1] == stat.st_size:
+            return str(known[2])
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        self._hashes[key] = [stat.st_mtime_ns, stat.st_size, digest]
+        self._hashes_changed = True
+        return digest
+
+    def save_hashes(self) -> None:
+        """Persist memoized content hashes for the next run."""
+        if self._hashes is None or not self._hashes_changed:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.hash_index_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(self._hashes))
+        os.replace(tmp_file, self.hash_index_file)
+        self._hashes_changed = False
+
+    def config_hash(self, config_files: Iterable[str]) -> str:
+        """Hash the contents of the tool's config files in the project root."""
+        parts: list[str] = []
+        for name in config_files:
+            path = self.project_dir / name
+            parts.append(f"{name}:{self.file_hash(path) if path.exists() else ''}")
+        return _digest(*parts)
+
+    def file_keys(
+        self, tool: str, files: list[str], config_files: Iterable[str]
+    ) -> dict[str, str]:
+        """Get per-file keys for a tool that checks each file independently."""
+        config = self.config_hash(config_files)
+        keys = {f: _digest(tool, config, f, self.file_hash(Path(f))) for f in files}
+        self.save_hashes()
+        return keys
+
+    def tree_key(self, tool: str, args: list[str], config_files: Iterable[str]) -> str:
+        """Get a key covering every Python file in the project."""
+        parts = [tool, *args, self.config_hash(config_files)]
+        for path in sorted(iter_python_files(self.project_dir)):
+            rel_path = path.relative_to(self.project_dir).as_posix()
+            parts.append(f"{rel_path}:{self.file_hash(path)}")
+        self.save_hashes()
+        return _digest(*parts)
+
+
+def open_cache(project_dir: Path) -> ResultCache | None:
+    """Get the project's result cache, or None unless it is enabled.
+
+    The background watcher fills the cache, so it is read whenever the
+    watcher is enabled too.
+    """
+    config = load_config(project_dir)
+    if not (config.flag("cache", "enabled") or config.flag("watch", "enabled")):
+        return None
+    return ResultCache(project_dir, config.integer("cache", "max-bytes"))
+
+
+def combine_keys(tool: str, keys: Iterable[str]) -> str:
+    """Get one key for a tool run over a set of per-file keys."""
+    return _digest(tool, *sorted(keys))
+
+
+def run_cached(
+    hook: Hook,
+    cache: ResultCache | None,
+    key: str,
+    run: Callable[[], int],
+    cacheable: tuple[int, ...] = (0, 1),
+    unchanged: Callable[[], bool] | None = None,
+) -> int:
+    """Replay the cached result for a key, or run the check and record it.
+
+    Only exit codes in ``cacheable`` are recorded, so that crashes and
+    environment problems are retried on the next run. Tools that rewrite
+    files pass ``unchanged``, called after the run: unless it confirms the
+    files still match the key, the result describes other contents and is
+    not recorded.
+    """
+    if cache is None:
+        return run()
+
+    hit = cache.get(key)
+    if hit is not None:
+        hook.log(f"cache hit {key[:12]}")
+        hook.cache_hit = True
+        hook.output.write(hit.output)
+        hook.output.flush()
+        return hit.exit_code
+
+    output = hook.output
+    buffer = io.StringIO()
+    hook.output = buffer
+    try:
+        exit_code = run()
+    finally:
+        hook.output = output
+    output.write(buffer.getvalue())
+    output.flush()
+    if exit_code in cacheable and (unchanged is None or unchanged()):
+        cache.put(key, exit_code, buffer.getvalue())
+    return exit_code
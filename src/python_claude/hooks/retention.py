@@ -0,0 +1,178 @@
+"""Retention policy for per-session debug directories."""
+
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import NamedTuple
+
+from python_claude.hooks.config import Config
+
+# Sessions with activity this recent are never pruned
+ACTIVE_SECONDS = 24 * 3600
+
+# Written by the session end hook, so sessions without it ended abnormally
+ENDED_MARKER = "ended"
+
+# Files recording edits that a crashed session never checked
+TRACK_FILE_PATTERNS = ("tracking.db*", "*-files.txt")
+
+
+class SessionInfo(NamedTuple):
+    """A session directory and its retention-relevant facts."""
+
+    path: Path
+    # Newest modification time of anything in the directory
+    last_active: float
+    size: int
+    ended: bool
+
+
+class RetentionPolicy(NamedTuple):
+    """Limits on the sessions kept in .claude/debug/sessions."""
+
+    max_age_days: int
+    max_sessions: int
+    max_bytes: int
+
+    @classmethod
+    def from_config(cls, config: Config) -> "RetentionPolicy":
+        """Read the limits from the gc settings."""
+        return cls(
+            max_age_days=config.integer("gc", "max-age-days"),
+            max_sessions=config.integer("gc", "max-sessions"),
+            max_bytes=config.integer("gc", "max-bytes"),
+        )
+
+
+def sessions_dir(project_dir: Path) -> Path:
+    """Get the directory holding one debug directory per session."""
+    return project_dir / ".claude" / "debug" / "sessions"
+
+
+def _scan_session(path: Path) -> SessionInfo:
+    last_active = path.stat().st_mtime
+    size = 0
+    ended = False
+    stack = [path]
+    while stack:
+        for entry in os.scandir(stack.pop()):
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(Path(entry.path))
+                continue
+            stat = entry.stat(follow_symlinks=False)
+            size += stat.st_size
+            last_active = max(last_active, stat.st_mtime)
+            ended = ended or entry.name == ENDED_MARKER
+    return SessionInfo(path=path, last_active=last_active, size=size, ended=ended)
+
+
+def scan_sessions(project_dir: Path) -> list[SessionInfo]:
+    """Describe every session directory, oldest activity first."""
+    base = sessions_dir(project_dir)
+    try:
+        entries = [Path(e.path) for e in os.scandir(base) if e.is_dir()]
+    except FileNotFoundError:
+        return []
+    sessions: list[SessionInfo] = []
+    for path in entries:
+        try:
+            sessions.append(_scan_session(path))
+        except FileNotFoundError:
+            # Removed by a concurrent collection
+            continue
+    return sorted(sessions, key=lambda s: s.last_active)
+
+
+def select_prunable(
+    sessions: list[SessionInfo],
+    policy: RetentionPolicy,
+    keep: set[str],
+    now: float,
+) -> list[SessionInfo]:
+    """Choose the sessions to remove, oldest first.
+
+    Sessions past the maximum age go first. Then the oldest inactive
+    sessions go until both the session count and the total size are within
+    limits. Sessions named in ``keep`` and recently active sessions stay.
+    """
+    prunable = [
+        s
+        for s in sessions
+        if s.path.name not in keep and now - s.last_active > ACTIVE_SECONDS
+    ]
+    max_age = policy.max_age_days * 86400
+    expired = [s for s in prunable if now - s.last_active > max_age]
+    remaining = [s for s in prunable if now - s.last_active <= max_age]
+    count = len(sessions) - len(expired)
+    total = sum(s.size for s in sessions) - sum(s.size for s in expired)
+    selected = expired
+    for session in remaining:
+        if count <= policy.max_sessions and total <= policy.max_bytes:
+            break
+        selected.append(session)
+        count -= 1
+        total -= session.size
+    return selected
+
+
+def archive_track_files(sessions: list[SessionInfo], archive_dir: Path) -> Path | None:
+    """Bundle the edit tracking files of sessions that didn't end cleanly.
+
+    Returns the compressed tar file, or None if there was nothing to archive.
+    """
+    import tarfile
+
+    members = [
+        (session, path)
+        for session in sessions
+        if not session.ended
+        for pattern in TRACK_FILE_PATTERNS
+        for path in session.path.glob(pattern)
+    ]
+    if not members:
+        return None
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    archive = archive_dir / f"sessions-{stamp}-{os.getpid()}.tar.gz"
+    with tarfile.open(archive, "w:gz") as tar:
+        for session, path in members:
+            tar.add(path, arcname=f"{session.path.name}/{path.name}")
+    return archive
+
+
+def collection_due(project_dir: Path, interval_hours: int) -> bool:
+    """Check whether the last collection is older than the interval.
+
+    Claims the collection by touching a stamp file, so concurrent session
+    starts don't all scan the sessions.
+    """
+    stamp = project_dir / ".claude" / "debug" / "gc-stamp"
+    try:
+        if time.time() - stamp.stat().st_mtime < interval_hours * 3600:
+            return False
+    except FileNotFoundError:
+        stamp.parent.mkdir(parents=True, exist_ok=True)
+    stamp.touch()
+    return True
+
+
+def collect(
+    project_dir: Path,
+    policy: RetentionPolicy,
+    keep: set[str],
+    dry_run: bool = False,
+) -> tuple[list[SessionInfo], Path | None]:
+    """Apply the retention policy to the project's session directories.
+
+    Returns the pruned sessions and the archive of their stale track files.
+    """
+    sessions = scan_sessions(project_dir)
+    selected = select_prunable(sessions, policy, keep, time.time())
+    if dry_run or not selected:
+        return selected, None
+    archive_dir = project_dir / ".claude" / "debug" / "archive"
+    archive = archive_track_files(selected, archive_dir)
+    for session in selected:
+        shutil.rmtree(session.path, ignore_errors=True)
+    return selected, archive
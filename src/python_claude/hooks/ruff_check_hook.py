@@ -1,10 +1,14 @@
 """Ruff check hook for Claude Code."""
 
-import subprocess
-import sys
 from pathlib import Path
 
-from python_claude.hooks.base import Hook, HookInput
+from python_claude.hooks.base import TIMEOUT_EXIT, Hook, HookInput
+from python_claude.hooks.result_cache import (
+    RUFF_CONFIG,
+    combine_keys,
+    open_cache,
+    run_cached,
+)
 from python_claude.hooks.state import QualityCheckState
 
 
@@ -12,15 +16,11 @@ class RuffCheckHook(Hook):
     """Runs ruff check on all files collected during the session."""
 
     name = "ruff-check"
+    timeout_section = "ruff"
 
     def __init__(self, hook_input: HookInput | None = None) -> None:
         super().__init__(hook_input)
 
-    @property
-    def track_file(self) -> Path:
-        """Get the path to the edited files tracking file."""
-        return self.log_dir / "edited-files.txt"
-
     def run(self) -> int:
         """Run ruff check on all tracked files if enabled."""
         state = QualityCheckState(self.project_dir)
@@ -28,38 +28,73 @@ class RuffCheckHook(Hook):
             self.log("Skipped (disabled)")
             return 0
 
-        # Check if tracking file exists and has content
-        if not self.track_file.exists() or self.track_file.stat().st_size == 0:
+        # Check if any files were edited since the last successful run
+        pending = self.pending_edits()
+        if not pending.files:
             self.log("No edited Python files to check")
             return 0
 
-        files: list[str] = []
-        for line in self.track_file.read_text().strip().split("\n"):
-            file_path = line.strip()
-            if file_path and Path(file_path).exists():
-                files.append(file_path)
-
+        files = [f for f in pending.files if Path(f).exists()]
         if not files:
             self.log("No existing Python files to check")
-            self.track_file.unlink(missing_ok=True)
+            self.edits.mark_done(self.name, pending.seq)
             return 0
 
+        # Files whose exact contents already passed need no second run
+        cache = open_cache(self.project_dir)
+        key = ""
+        keys: dict[str, str] = {}
+        if cache is not None:
+            keys = cache.file_keys("ruff-check", files, RUFF_CONFIG)
+            files = [f for f in files if not cache.is_clean(keys[f])]
+            if not files:
+                self.log("All files unchanged since they last passed")
+                self.edits.mark_done(self.name, pending.seq)
+                return 0
+            key = combine_keys("ruff-check", [keys[f] for f in files])
+
+        self.file_count = len(files)
         self.log(f"Checking {len(files)} files: {' '.join(files)}")
 
-        result = subprocess.run(
-            ["uv", "run", "ruff", "check", "--fix", *files],
-            cwd=self.project_dir,
-            stdout=sys.stderr,
+        exit_code = run_cached(
+            self,
+            cache,
+            key,
+            lambda: self.run_tool(
+                [
+                    "uv",
+                    "run",
+                    "ruff",
+                    "check",
+                    "--fix",
+                    "--output-format",
+                    "json",
+                    *files,
+                ]
+            ),
+            cacheable=(0, 1),
+            # Files ruff rewrote are only recorded under their new contents
+            unchanged=lambda: (
+                cache is not None
+                and cache.file_keys("ruff-check", files, RUFF_CONFIG)
+                == {f: keys[f] for f in files}
+            ),
         )
-
-        exit_code = result.returncode
         self.log(f"exit {exit_code}")
+        if exit_code in (0, 1) and not self.cache_hit:
+            self.record_rewrites(files)
 
         if exit_code == 0:
-            self.track_file.unlink(missing_ok=True)
+            self.edits.mark_done(self.name, pending.seq)
+            if cache is not None:
+                # Record the files as they are after ruff's changes
+                cache.mark_clean(
+                    cache.file_keys("ruff-check", files, RUFF_CONFIG).values()
+                )
 
         # ruff check exit code 1 indicates a lint error that was not automatically fixed; return status 2 to signal claude to consider fixing it
-        if exit_code == 1:
+        # A timeout blocks too, so Claude sees which check ran out of time
+        if exit_code in (1, TIMEOUT_EXIT):
             return 2
 
         return exit_code
@@ -0,0 +1,77 @@
+"""Dependency-aware scheduler for running hook stages concurrently."""
+
+import threading
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+
+
+@dataclass
+class Task:
+    """A unit of work that runs once all of its dependencies have finished."""
+
+    name: str
+    run: Callable[[], int]
+    after: tuple[str, ...] = ()
+
+
+def is_blocking(exit_code: int) -> bool:
+    """Return True if the exit code asks Claude Code to correct something."""
+    return exit_code == 2
+
+
+def run_tasks(
+    tasks: list[Task],
+    max_workers: int | None = None,
+    fail_fast: bool = False,
+    cancel: threading.Event | None = None,
+) -> dict[str, int | None]:
+    """Run tasks as a DAG and return each task's exit code.
+
+    A task starts as soon as every task named in its ``after`` has finished,
+    regardless of their exit codes. With ``fail_fast``, no further tasks are
+    started once a blocking failure is known; tasks that never ran map to None.
+    The ``cancel`` event is then set for running tasks to stop early, and
+    tasks finishing after it map to None as well.
+    """
+    names = {task.name for task in tasks}
+    for task in tasks:
+        missing = set(task.after) - names
+        if missing:
+            raise ValueError(f"Task {task.name} depends on unknown {missing}")
+
+    results: dict[str, int | None] = {task.name: None for task in tasks}
+    pending = list(tasks)
+    finished: set[str] = set()
+    running: dict[Future[int], Task] = {}
+    stopped = False
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(tasks) or 1) as pool:
+        while pending or running:
+            if not stopped:
+                for task in [t for t in pending if finished.issuperset(t.after)]:
+                    pending.remove(task)
+                    running[pool.submit(task.run)] = task
+
+            if not running:
+                # Nothing can make progress: either stopped or a dependency cycle
+                if not stopped:
+                    cycle = ", ".join(t.name for t in pending)
+                    raise ValueError(f"Dependency cycle between tasks: {cycle}")
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            cancelled = cancel is not None and cancel.is_set()
+            for future in done:
+                task = running.pop(future)
+                exit_code = future.result()
+                finished.add(task.name)
+                if cancelled:
+                    continue
+                results[task.name] = exit_code
+                if fail_fast and is_blocking(exit_code):
+                    stopped = True
+                    if cancel is not None:
+                        cancel.set()
+
+    return results
@@ -0,0 +1,123 @@
+"""Resident server that runs hooks without starting a new interpreter.
+
+Every hook event otherwise starts Python, imports the package and loads the
+project configuration before doing a few milliseconds of work. The server
+does that once: it imports every built-in hook and loads the configuration,
+then listens on ``.claude/serve.sock``. Each request is run by a forked
+worker that takes over the client's stdin, stdout and stderr, working
+directory and environment, so hooks behave exactly as when run directly and
+can't leak state into the next request. The configuration cache carries
+over from the server, and is still reloaded when its files change.
+
+One server runs per project, and it exits after a period without requests.
+"""
+
+import os
+import signal
+import socket
+from pathlib import Path
+
+from python_claude import cli
+from python_claude.hooks.background import hold_lock, is_locked, spawn
+from python_claude.hooks.base import Hook, HookInput
+from python_claude.hooks.config import load_config
+from python_claude.hooks.server import fork_worker, receive_request, socket_file
+
+# Held by the running server, with its process ID as contents
+LOCK_FILE = "serve.lock"
+# Connections waiting to be accepted while a worker is being forked
+BACKLOG = 64
+# Seconds a client gets to send its request
+REQUEST_SECONDS = 5.0
+
+
+def lock_file(project_dir: Path) -> Path:
+    """Get the project's server lock file."""
+    return project_dir / ".claude" / LOCK_FILE
+
+
+def start_server(project_dir: Path, session_id: str | None) -> bool:
+    """Start a detached server unless one is running for the project.
+
+    Returns whether a server was started.
+    """
+    if os.name == "nt" or is_locked(lock_file(project_dir)):
+        return False
+    spawn(project_dir, "serve", session_id)
+    return True
+
+
+class ServeHook(Hook):
+    """Runs hooks for the project in forked workers of a resident process."""
+
+    name = "serve"
+    record_timings = False
+
+    def __init__(self, hook_input: HookInput | None = None) -> None:
+        super().__init__(hook_input)
+
+    def preload(self) -> None:
+        """Import the built-in hooks and load the configuration, for every worker."""
+        for target in cli.HOOKS.values():
+            try:
+                cli._import_hook(target)
+            except ImportError as e:
+                self.log(f"Preloading {target} failed: {e}", "warning")
+        load_config(self.project_dir)
+
+    def serve(self, conn: socket.socket, closing: list[int]) -> None:
+        """Hand a connection to a new worker; ``closing`` are the server's own fds."""
+        conn.settimeout(REQUEST_SECONDS)
+        try:
+            request, fds = receive_request(conn)
+        except (OSError, ValueError) as e:
+            self.log(f"Bad request: {e}", "warning")
+            conn.close()
+            return
+        conn.settimeout(None)
+        # Closing without an acknowledgement has the client run the hook itself
+        if not fork_worker(conn, request, fds, closing, lambda r: cli.run(r["argv"])):
+            self.log("Starting a worker failed", "warning")
+        self.flush_log()
+
+    def run(self) -> int:
+        """Serve hook requests until none arrive for the idle timeout."""
+        if os.name == "nt":
+            return 0
+        lock_path = lock_file(self.project_dir)
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        lock = hold_lock(lock_path)
+        if lock is None:
+            self.log("Another server is running")
+            return 0
+        path = socket_file(str(self.project_dir))
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self.preload()
+            # Left behind by a server that was killed
+            if os.path.exists(path):
+                os.unlink(path)
+            listener.bind(path)
+            os.chmod(path, 0o600)
+            listener.listen(BACKLOG)
+            idle_seconds = self.config.integer("serve", "idle-minutes") * 60
+            listener.settimeout(idle_seconds or None)
+            # Finished workers are reaped by the kernel
+            signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+            self.log(f"Serving on {path}")
+            self.flush_log()
+            while True:
+                try:
+                    conn, _ = listener.accept()
+                except TimeoutError:
+                    self.log("No requests, exiting")
+                    break
+                self.serve(conn, [listener.fileno(), lock])
+        except OSError as e:
+            self.log(f"Serving failed: {e}", "warning")
+        finally:
+            if os.path.exists(path):
+                os.unlink(path)
+            listener.close()
+            os.close(lock)
+        return 0
@@ -0,0 +1,267 @@
+"""Running commands in resident processes over a Unix socket.
+
+A resident process, such as the ``python-claude serve`` hook server,
+listens on a socket in ``.claude/`` and forks a worker for each request. The
+request carries argv, the working directory and the environment, and passes
+stdin, stdout and stderr as file descriptors, so the worker reads and writes
+them directly. The worker acknowledges the request once it owns it, along
+with its process ID, then sends its exit code when it finishes.
+
+When a command line is run, it is forwarded to the project's hook server if
+one is listening. Without a server, or when it doesn't acknowledge the
+request, the hook runs in-process as usual. Not supported on Windows.
+"""
+
+import json
+import os
+import sys
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import socket
+    import threading
+
+# Sent, followed by its process ID, once a worker has taken over the request's
+# descriptors
+ACK = b"A"
+# Sent instead by a resident process that must be restarted for the request
+RESTART = b"R"
+# Commands that always run in-process: the server itself and background jobs
+LOCAL_COMMANDS = ("serve", "warm", "watch")
+# Bytes of the length prefix before a request's JSON
+LENGTH_BYTES = 4
+# Largest request accepted, mostly the client's environment
+MAX_REQUEST_BYTES = 1024 * 1024
+# Seconds a resident process gets to take a request before it runs elsewhere
+ACK_TIMEOUT_SECONDS = 2.0
+
+
+def socket_file(project_dir: str) -> str:
+    """Get the project's server socket."""
+    return os.path.join(project_dir, ".claude", "serve.sock")
+
+
+def encode_request(request: dict[str, Any]) -> bytes:
+    """Encode a request with its length prefix."""
+    data = json.dumps(request).encode()
+    return len(data).to_bytes(LENGTH_BYTES, "big") + data
+
+
+def send_request(
+    path: str,
+    request: dict[str, Any],
+    fds: list[int],
+    timeout: float | None = None,
+    cancel: "threading.Event | None" = None,
+) -> int | None:
+    """Run a request in the resident process listening on a socket.
+
+    Returns the worker's exit code, or None, having consumed nothing, when
+    no process took the request within ACK_TIMEOUT_SECONDS, for example a
+    wedged or stopped one. Raises TimeoutError if the worker doesn't finish
+    within ``timeout`` seconds, or Cancelled once the ``cancel`` event is
+    set, after stopping the worker's process group.
+    """
+    import socket
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.settimeout(ACK_TIMEOUT_SECONDS)
+        client.connect(path)
+        data = encode_request(request)
+        sent = socket.send_fds(client, [data], fds)
+        client.sendall(data[sent:])
+        acknowledged = client.recv(len(ACK)) == ACK
+    except OSError:
+        acknowledged = False
+    if not acknowledged:
+        # Shutting down, restarting or failed to start a worker
+        client.close()
+        return None
+
+    # The worker owns stdin now, so the request can't be run elsewhere
+    try:
+        reply = _read_reply(client, timeout, cancel, request["argv"])
+    finally:
+        client.close()
+    _, _, exit_code = reply.partition(b"\n")
+    try:
+        return int(exit_code)
+    except ValueError:
+        print("python-claude: the worker exited unexpectedly", file=sys.stderr)
+        return 1
+
+
+def _read_reply(
+    client: "socket.socket",
+    timeout: float | None,
+    cancel: "threading.Event | None",
+    argv: list[str],
+) -> bytes:
+    """Read a worker's process ID and exit code until it closes the connection.
+
+    Stops the worker's process group before raising TimeoutError or
+    Cancelled.
+    """
+    import time
+
+    deadline = None if timeout is None else time.monotonic() + timeout
+    reply = b""
+    while True:
+        step = None if deadline is None else deadline - time.monotonic()
+        if cancel is not None:
+            from python_claude.hooks.base import CANCEL_POLL_SECONDS
+
+            step = (
+                CANCEL_POLL_SECONDS if step is None else min(step, CANCEL_POLL_SECONDS)
+            )
+        try:
+            if step is not None and step <= 0:
+                raise TimeoutError
+            client.settimeout(step)
+            chunk = client.recv(64)
+        except TimeoutError:
+            if cancel is not None and cancel.is_set():
+                from python_claude.hooks.base import Cancelled
+
+                _stop_worker(client, reply)
+                raise Cancelled(argv) from None
+            if deadline is not None and time.monotonic() >= deadline:
+                _stop_worker(client, reply)
+                raise
+            continue
+        except OSError:
+            return reply
+        if not chunk:
+            return reply
+        reply += chunk
+
+
+def _stop_worker(client: "socket.socket", reply: bytes) -> None:
+    """Stop a worker's process group, given the reply it has sent so far."""
+    from python_claude.hooks.base import stop_groups
+
+    # Leaving makes the worker stop its group, even before it sent its ID
+    client.close()
+    pid, newline, _ = reply.partition(b"\n")
+    if newline:
+        stop_groups([int(pid)])
+
+
+def forward(argv: list[str]) -> int | None:
+    """Run a hook in the project's server, returning its exit code.
+
+    Returns None when there's no server to run it.
+    """
+    if len(argv) < 2 or argv[1] in LOCAL_COMMANDS or os.name == "nt":
+        return None
+    project_dir = os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd()
+    path = socket_file(project_dir)
+    if not os.path.exists(path):
+        return None
+    request = {"argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)}
+    return send_request(path, request, [0, 1, 2])
+
+
+def receive_request(conn: "socket.socket") -> tuple[dict[str, Any], list[int]]:
+    """Read a request and the client's stdin, stdout and stderr descriptors."""
+    import socket
+
+    data, fds, _, _ = socket.recv_fds(conn, 64 * 1024, 3)
+    try:
+        if len(fds) != 3 or len(data) < LENGTH_BYTES:
+            raise ValueError("Incomplete request")
+        size = int.from_bytes(data[:LENGTH_BYTES], "big")
+        if size > MAX_REQUEST_BYTES:
+            raise ValueError(f"Request of {size} bytes")
+        data = data[LENGTH_BYTES:]
+        while len(data) < size:
+            chunk = conn.recv(size - len(data))
+            if not chunk:
+                raise ValueError("Incomplete request")
+            data += chunk
+        request = json.loads(data)
+    except (OSError, ValueError):
+        for fd in fds:
+            os.close(fd)
+        raise
+    return dict(request), fds
+
+
+def _adopt(request: dict[str, Any], fds: list[int]) -> None:
+    """Take over a request's standard streams, directory, environment and argv."""
+    for target, fd in enumerate(fds):
+        if fd != target:
+            os.dup2(fd, target)
+            os.close(fd)
+    sys.stdin = os.fdopen(0, "r", closefd=False)
+    sys.stdout = os.fdopen(1, "w", closefd=False)
+    sys.stderr = os.fdopen(2, "w", buffering=1, closefd=False)
+    os.chdir(request["cwd"])
+    os.environ.clear()
+    os.environ.update(request["env"])
+    sys.argv = list(request["argv"])
+
+
+def _stop_when_client_leaves(conn: "socket.socket") -> None:
+    """Terminate the worker if its client exits, as if it had run the command itself."""
+    import select
+    import signal
+    import threading
+
+    def watch() -> None:
+        # Clients send nothing after the request, so readable means closed
+        select.select([conn], [], [])
+        os.killpg(os.getpid(), signal.SIGTERM)
+
+    threading.Thread(target=watch, daemon=True).start()
+
+
+def fork_worker(
+    conn: "socket.socket",
+    request: dict[str, Any],
+    fds: list[int],
+    closing: list[int],
+    run: Callable[[dict[str, Any]], int],
+) -> bool:
+    """Run a request in a forked worker, in its own process group.
+
+    ``closing`` are the resident process's descriptors the worker must not
+    hold, such as its listening socket. Returns whether a worker started;
+    the connection and the request's descriptors are closed either way.
+    """
+    import signal
+
+    try:
+        pid = os.fork()
+    except OSError:
+        pid = -1
+    if pid == 0:
+        exit_code = 1
+        try:
+            os.setsid()
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            for fd in closing:
+                os.close(fd)
+            conn.sendall(ACK + f"{os.getpid()}\n".encode())
+            _adopt(request, fds)
+            _stop_when_client_leaves(conn)
+            try:
+                exit_code = run(request)
+            except SystemExit as e:
+                code = e.code
+                exit_code = code if isinstance(code, int) else int(code is not None)
+            except Exception:  # noqa: BLE001 - reported like an uncaught error
+                import traceback
+
+                traceback.print_exc()
+            sys.stdout.flush()
+            sys.stderr.flush()
+            conn.sendall(f"{exit_code}\n".encode())
+        finally:
+            os._exit(exit_code)
+    for fd in fds:
+        os.close(fd)
+    conn.close()
+    return pid > 0
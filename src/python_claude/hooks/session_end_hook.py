@@ -0,0 +1,27 @@
+"""Session end hook for Claude Code."""
+
+from python_claude.hooks.base import Hook, HookInput
+from python_claude.hooks.mypy_daemon import MypyDaemon
+from python_claude.hooks.retention import ENDED_MARKER
+from python_claude.hooks.watch_hook import stop_watcher
+
+
+class SessionEndHook(Hook):
+    """Releases per-session resources when the session ends."""
+
+    name = "session-end"
+
+    def __init__(self, hook_input: HookInput | None = None) -> None:
+        super().__init__(hook_input)
+
+    def run(self) -> int:
+        """Shut down the session's mypy daemons and watcher, and mark it as ended."""
+        MypyDaemon(self).stop()
+        # Started for workspace packages
+        for status_file in self.log_dir.glob("packages/**/dmypy.json"):
+            MypyDaemon(self, status_file.parent).stop()
+        stop_watcher(self.log_dir)
+        if self.input.session_id:
+            # Lets garbage collection tell finished sessions from crashed ones
+            (self.log_dir / ENDED_MARKER).touch()
+        return 0
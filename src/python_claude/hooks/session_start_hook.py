@@ -4,6 +4,8 @@ import json
 from typing import cast
 
 from python_claude.hooks.base import Hook, HookInput
+from python_claude.hooks.retention import RetentionPolicy, collect, collection_due
+from python_claude.hooks.snapshot import TreeSnapshot, record_tree_changes
 from python_claude.hooks.state import QualityCheck, QualityCheckState
 
 
@@ -15,8 +17,86 @@ class SessionStartHook(Hook):
     def __init__(self, hook_input: HookInput | None = None) -> None:
         super().__init__(hook_input)
 
+    def collect_garbage(self) -> None:
+        """Prune old session directories, at most once per configured interval."""
+        interval = self.config.integer("gc", "interval-hours")
+        if not interval or not collection_due(self.project_dir, interval):
+            return
+        keep = {self.input.session_id} if self.input.session_id else set()
+        try:
+            policy = RetentionPolicy.from_config(self.config)
+            pruned, _ = collect(self.project_dir, policy, keep)
+        except OSError as e:
+            self.log(f"gc failed: {e}", "warning")
+            return
+        if pruned:
+            self.log(f"gc removed {len(pruned)} session directories")
+
+    def snapshot_tree(self) -> None:
+        """Record the baseline that Stop compares the tree to.
+
+        A resumed session keeps its baseline, after recording the changes
+        made since it was last compared.
+        """
+        if not self.config.flag("snapshot", "enabled"):
+            return
+        snapshot = TreeSnapshot(self.project_dir, self.log_dir)
+        if snapshot.load() is None:
+            snapshot.record_baseline()
+        else:
+            record_tree_changes(self.project_dir, self.log_dir, self.edits)
+
+    def start_warmup(self) -> None:
+        """Start the background warm-up of tool caches, if enabled."""
+        if not self.config.flag("warm", "enabled"):
+            return
+        from python_claude.hooks.warm_hook import start_warmup
+
+        try:
+            started = start_warmup(self.project_dir, self.input.session_id)
+        except OSError as e:
+            self.log(f"Starting the warm-up failed: {e}", "warning")
+            return
+        if started:
+            self.log("Started the warm-up")
+
+    def start_server(self) -> None:
+        """Start the project's hook server, if enabled."""
+        if not self.config.flag("serve", "enabled"):
+            return
+        from python_claude.hooks.serve_hook import start_server
+
+        try:
+            started = start_server(self.project_dir, self.input.session_id)
+        except OSError as e:
+            self.log(f"Starting the server failed: {e}", "warning")
+            return
+        if started:
+            self.log("Started the server")
+
+    def start_watcher(self) -> None:
+        """Start the background watcher for the session, if enabled."""
+        if not self.config.flag("watch", "enabled") or not self.input.session_id:
+            return
+        from python_claude.hooks.watch_hook import start_watcher
+
+        try:
+            started = start_watcher(
+                self.project_dir, self.log_dir, self.input.session_id
+            )
+        except OSError as e:
+            self.log(f"Starting the watcher failed: {e}", "warning")
+            return
+        if started:
+            self.log("Started the watcher")
+
     def run(self) -> int:
         """Print the introductory message."""
+        self.collect_garbage()
+        self.snapshot_tree()
+        self.start_warmup()
+        self.start_server()
+        self.start_watcher()
         state = QualityCheckState(self.project_dir)
 
         # Check which quality checks are enabled and disabled
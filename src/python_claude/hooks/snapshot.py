@@ -0,0 +1,170 @@
+"""Snapshots of the project's Python files, to find changes made outside edit tools.
+
+Session start records the stat of every Python file. Before the Stop checks
+read their pending edits, the tree is compared to the snapshot and files
+whose mtime, size or inode changed are recorded as edited, so changes made
+by Bash commands are checked too. Content is hashed only for files whose
+stat changed, to tell real changes from touched files. Files the checks
+rewrite themselves, by formatting or fixing them, are moved forward in the
+snapshot so they don't count as changes.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from python_claude.hooks.tracking import EditStore
+
+SNAPSHOT_VERSION = 1
+
+# Directories that never contain project sources
+SKIP_DIRS = {"__pycache__", "build", "dist", "node_modules", "site-packages", "venv"}
+
+# mtime_ns, size and inode of a file
+FileStat = tuple[int, int, int]
+
+# Sessions whose tree was already compared in this process
+_compared: set[Path] = set()
+
+
+def scan_python_files(root: Path) -> dict[str, FileStat]:
+    """Stat the project's Python files, skipping hidden and build directories.
+
+    Returns the stats keyed by path relative to the root.
+    """
+    prefix = len(str(root)) + 1
+    stats: dict[str, FileStat] = {}
+    stack = [str(root)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if not name.startswith(".") and name not in SKIP_DIRS:
+                        stack.append(entry.path)
+                elif name.endswith(".py"):
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    stats[entry.path[prefix:]] = (st.st_mtime_ns, st.st_size, st.st_ino)
+    return stats
+
+
+def _file_hash(path: Path) -> str | None:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+class TreeSnapshot:
+    """The stat of each Python file as last seen, with content hashes once known."""
+
+    def __init__(self, project_dir: Path, log_dir: Path) -> None:
+        self.project_dir = project_dir
+        self.path = log_dir / "snapshot.json"
+
+    def load(self) -> dict[str, list[int | str | None]] | None:
+        """Load the snapshot's entries, or None if the session has none."""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(data, dict) or data.get("version") != SNAPSHOT_VERSION:
+            return None
+        files = data.get("files")
+        return files if isinstance(files, dict) else None
+
+    def save(self, files: dict[str, list[int | str | None]]) -> None:
+        """Replace the snapshot atomically."""
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"version": SNAPSHOT_VERSION, "files": files}, f)
+        os.replace(tmp_path, self.path)
+
+    def record_baseline(self) -> None:
+        """Snapshot the tree without hashing anything."""
+        stats = scan_python_files(self.project_dir)
+        self.save({rel: [*stat, None] for rel, stat in stats.items()})
+
+    def diff(self) -> list[tuple[str, str | None]] | None:
+        """Find the files changed since the snapshot and move it forward.
+
+        Returns the changed paths relative to the project, with their new
+        content hash (None for deleted files), or None without a snapshot.
+        """
+        baseline = self.load()
+        if baseline is None:
+            return None
+        current = scan_python_files(self.project_dir)
+        files: dict[str, list[int | str | None]] = {}
+        changed: list[tuple[str, str | None]] = []
+        for rel, stat in current.items():
+            entry = baseline.get(rel)
+            known_hash = entry[3] if entry is not None else None
+            if entry is not None and tuple(entry[:3]) == stat:
+                files[rel] = entry
+                continue
+            digest = _file_hash(self.project_dir / rel)
+            files[rel] = [*stat, digest]
+            if digest is None or digest != known_hash:
+                changed.append((rel, digest))
+        changed.extend((rel, None) for rel in baseline.keys() - current.keys())
+        if files != baseline:
+            self.save(files)
+        return changed
+
+
+def record_tree_changes(project_dir: Path, log_dir: Path, edits: EditStore) -> int:
+    """Record the files changed since the session's snapshot as edited.
+
+    Files whose new content was already recorded by the edit hook are left
+    alone. Compares the tree at most once per process. Returns the number
+    of files recorded.
+    """
+    if log_dir in _compared:
+        return 0
+    _compared.add(log_dir)
+    changed = TreeSnapshot(project_dir, log_dir).diff()
+    recorded = 0
+    for rel, digest in changed or []:
+        path = str(project_dir / rel)
+        if digest is not None and edits.content_hash(path) == digest:
+            continue
+        edits.record(path, digest)
+        recorded += 1
+    return recorded
+
+
+def record_rewrites(
+    project_dir: Path, log_dir: Path, edits: EditStore, files: list[str]
+) -> None:
+    """Move the snapshot and the recorded content hashes past rewritten files.
+
+    For files a check rewrote itself, so the next comparison doesn't record
+    them as edited again.
+    """
+    snapshot = TreeSnapshot(project_dir, log_dir)
+    entries = snapshot.load()
+    for file_path in files:
+        path = Path(file_path)
+        digest = _file_hash(path)
+        edits.update_hash(file_path, digest)
+        if entries is None or digest is None:
+            continue
+        try:
+            rel = path.relative_to(project_dir).as_posix()
+            st = path.stat()
+        except (ValueError, OSError):
+            continue
+        if rel in entries:
+            entries[rel] = [st.st_mtime_ns, st.st_size, st.st_ino, digest]
+    if entries is not None:
+        snapshot.save(entries)
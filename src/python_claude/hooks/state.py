@@ -1,10 +1,16 @@
 """State management for quality check toggles."""
 
-import json
 import os
 from pathlib import Path
 from typing import Literal
 
+from python_claude.hooks.config import (
+    load_config,
+    read_toggles,
+    toggles_file,
+    write_json_atomic,
+)
+
 QualityCheck = Literal["pytest", "mypy", "ruff"]
 
 
@@ -19,38 +25,24 @@ class QualityCheckState:
             else:
                 project_dir = Path.cwd()
         self.project_dir = project_dir
-        self.state_file = project_dir / ".claude" / "quality-checks.json"
+        self.state_file = toggles_file(project_dir)
 
     def _load_state(self) -> dict[str, bool]:
-        """Load state from file, return default if file doesn't exist."""
-        if not self.state_file.exists():
-            # Default: all checks enabled
-            return {"pytest": True, "mypy": True, "ruff": True}
-
-        try:
-            with open(self.state_file) as f:
-                data = json.load(f)
-                if isinstance(data, dict):
-                    return data
-                return {"pytest": True, "mypy": True, "ruff": True}
-        except (json.JSONDecodeError, OSError):
-            return {"pytest": True, "mypy": True, "ruff": True}
+        """Load the checks toggled at runtime; others keep their configured state."""
+        return read_toggles(self.state_file)
 
     def _save_state(self, state: dict[str, bool]) -> None:
         """Save state to file."""
-        self.state_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.state_file, "w") as f:
-            json.dump(state, f, indent=2)
+        write_json_atomic(self.state_file, state, indent=2)
 
     def is_enabled(self, check: QualityCheck) -> bool:
         """Check if a quality check is enabled."""
-        state = self._load_state()
-        return state.get(check, True)
+        return load_config(self.project_dir).flag(check, "enabled")
 
     def toggle(self, check: QualityCheck) -> bool:
         """Toggle a quality check and return new state."""
         state = self._load_state()
-        new_value = not state.get(check, True)
+        new_value = not self.is_enabled(check)
         state[check] = new_value
         self._save_state(state)
         return new_value
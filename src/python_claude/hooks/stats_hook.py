@@ -0,0 +1,85 @@
+"""Stats command summarizing hook timing records."""
+
+import argparse
+import json
+import sys
+import time
+from typing import Any
+
+from python_claude.hooks.base import Hook
+from python_claude.hooks.timings import (
+    group_by_window,
+    load_records,
+    parse_duration,
+    summarize,
+    timings_file,
+)
+
+COLUMNS = (
+    ("runs", "runs"),
+    ("p50_ms", "p50 ms"),
+    ("p95_ms", "p95 ms"),
+    ("max_ms", "max ms"),
+    ("tool_p50_ms", "tool p50 ms"),
+    ("cache_hits", "cache hits"),
+    ("failures", "failures"),
+)
+
+
+def _format_table(summary: dict[str, dict[str, float]]) -> list[str]:
+    width = max([len("hook"), *(len(name) for name in summary)])
+    header = "hook".ljust(width) + "".join(f"  {title:>11}" for _, title in COLUMNS)
+    lines = [header]
+    for name, stats in summary.items():
+        cells = "".join(f"  {stats[key]:>11.10g}" for key, _ in COLUMNS)
+        lines.append(name.ljust(width) + cells)
+    return lines
+
+
+class StatsHook(Hook):
+    """Prints p50/p95/max run times per hook from the timing log."""
+
+    name = "stats"
+    record_timings = False
+
+    def run(self) -> int:
+        """Aggregate the timing records selected by the command line options."""
+        # sys.argv will be: ['python-claude', 'stats', ...]
+        parser = argparse.ArgumentParser(prog="python-claude stats")
+        parser.add_argument("--since", help="only runs in the last 30m, 24h, 7d, ...")
+        parser.add_argument("--session", help="only runs of this session ID")
+        parser.add_argument(
+            "--by", choices=("hour", "day"), help="summarize each time window"
+        )
+        parser.add_argument("--json", action="store_true", help="print JSON")
+        try:
+            args = parser.parse_args(sys.argv[2:])
+        except SystemExit as e:
+            return e.code if isinstance(e.code, int) else 1
+
+        since = None
+        if args.since:
+            try:
+                since = time.time() - parse_duration(args.since)
+            except ValueError as e:
+                print(e, file=sys.stderr)
+                return 1
+
+        records = load_records(timings_file(self.project_dir), since, args.session)
+        if not records:
+            print("No hook runs recorded", file=sys.stderr)
+            return 0
+
+        groups = group_by_window(records, args.by) if args.by else {"": records}
+        report: dict[str, Any] = {
+            label: summarize(group) for label, group in groups.items()
+        }
+        if args.json:
+            print(json.dumps(report if args.by else report[""], indent=2))
+            return 0
+
+        for label, summary in report.items():
+            if label:
+                print(f"# {label}")
+            print("\n".join(_format_table(summary)))
+        return 0
@@ -0,0 +1,106 @@
+"""Single-process Stop pipeline for Claude Code."""
+
+import io
+import sys
+import threading
+import time
+from collections.abc import Callable
+
+from python_claude.hooks.base import (
+    Cancelled,
+    Hook,
+    HookInput,
+    stop_tools_on_termination,
+)
+from python_claude.hooks.mypy_hook import MypyHook
+from python_claude.hooks.pytest_hook import PytestHook
+from python_claude.hooks.ruff_check_hook import RuffCheckHook
+from python_claude.hooks.ruff_format_hook import RuffFormatHook
+from python_claude.hooks.scheduler import Task, is_blocking, run_tasks
+
+
+class StopHook(Hook):
+    """Runs all quality checks in one process.
+
+    ruff format runs first, then ruff check --fix, then mypy and pytest run
+    concurrently. Pass ``--fail-fast`` to skip the remaining stages once a
+    blocking failure is known, stopping the tools of those already running.
+    The ``stop.timeout`` setting bounds the whole pipeline, on top of each
+    check's own timeout.
+    """
+
+    name = "stop"
+
+    def __init__(self, hook_input: HookInput | None = None) -> None:
+        super().__init__(hook_input)
+
+    @property
+    def fail_fast(self) -> bool:
+        """Whether the pipeline stops starting stages after a blocking failure."""
+        return "--fail-fast" in sys.argv[2:] or self.config.flag("stop", "fail-fast")
+
+    def stages(self) -> list[tuple[Hook, tuple[str, ...]]]:
+        """Get the pipeline stages in report order with their dependencies."""
+        return [
+            (RuffFormatHook(self.input), ()),
+            (RuffCheckHook(self.input), ("ruff-format",)),
+            (MypyHook(self.input), ("ruff-check",)),
+            (PytestHook(self.input), ("ruff-check",)),
+        ]
+
+    def _timed(self, hook: Hook) -> Callable[[], int]:
+        """Wrap a stage so its run is recorded in the timing log."""
+
+        def run() -> int:
+            start = time.perf_counter()
+            try:
+                exit_code = hook.run()
+            except Cancelled:
+                # Its result is dropped along with those of other cancelled stages
+                hook.log("Stopped (fail fast)")
+                return 0
+            hook.record_timing(exit_code, time.perf_counter() - start, parent=self.name)
+            return exit_code
+
+        return run
+
+    def run(self) -> int:
+        """Run the pipeline and combine the stage exit codes."""
+        stages = self.stages()
+        timeout = self.config.integer("stop", "timeout")
+        deadline = time.monotonic() + timeout if timeout else None
+        cancel = threading.Event()
+        outputs: dict[str, io.StringIO] = {}
+        tasks: list[Task] = []
+        for hook, after in stages:
+            # Buffer each stage so concurrent stages don't interleave output
+            outputs[hook.name] = io.StringIO()
+            hook.output = outputs[hook.name]
+            hook.deadline = deadline
+            hook.cancel = cancel
+            tasks.append(Task(name=hook.name, run=self._timed(hook), after=after))
+
+        # Stages run in worker threads, which can't install signal handlers
+        stop_tools_on_termination()
+        results = run_tasks(tasks, fail_fast=self.fail_fast, cancel=cancel)
+
+        exit_codes: list[int] = []
+        for hook, _ in stages:
+            self.output.write(outputs[hook.name].getvalue())
+            hook.flush_log()
+            self.tool_seconds += hook.tool_seconds
+            self.file_count = max(self.file_count, hook.file_count)
+            exit_code = results[hook.name]
+            if exit_code is None:
+                self.log(f"{hook.name} skipped (fail fast)")
+                continue
+            self.log(f"{hook.name} exit {exit_code}")
+            exit_codes.append(exit_code)
+        self.output.flush()
+
+        # A blocking failure from any stage blocks the Stop; otherwise report
+        # the first unexpected exit code in pipeline order
+        failures = [code for code in exit_codes if code != 0]
+        if any(is_blocking(code) for code in failures):
+            return 2
+        return failures[0] if failures else 0
@@ -0,0 +1,170 @@
+"""Structured per-run timing records for hooks, and their aggregation."""
+
+import gzip
+import json
+import math
+import os
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+from python_claude.hooks.logger import BACKUPS, rotate
+
+# Suffixes accepted in durations such as "30m", "24h" or "7d"
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def timings_file(project_dir: Path) -> Path:
+    """Get the project's timing log, shared by all sessions."""
+    return project_dir / ".claude" / "debug" / "timings.jsonl"
+
+
+def record_run(
+    project_dir: Path,
+    name: str,
+    session_id: str | None,
+    exit_code: int,
+    wall_seconds: float,
+    tool_seconds: float,
+    tool_cpu_seconds: float | None,
+    file_count: int,
+    cache_hit: bool,
+    parent: str | None = None,
+    max_bytes: int = 0,
+) -> None:
+    """Append one hook run to the timing log.
+
+    Each record is a single line written with one append, so concurrent hook
+    processes don't interleave records. A log that would grow past
+    ``max_bytes`` is rotated first, like the hook log; 0 means no limit.
+    Failing to record never fails a hook.
+    """
+    record: dict[str, Any] = {
+        "ts": round(time.time(), 3),
+        "hook": name,
+        "session": session_id,
+        "wall_ms": round(wall_seconds * 1000, 2),
+        "tool_ms": round(tool_seconds * 1000, 2),
+        "tool_cpu_ms": (
+            None if tool_cpu_seconds is None else round(tool_cpu_seconds * 1000, 2)
+        ),
+        "files": file_count,
+        "exit": exit_code,
+        "cache_hit": cache_hit,
+    }
+    if parent is not None:
+        record["parent"] = parent
+    line = json.dumps(record, separators=(",", ":")) + "\n"
+    path = timings_file(project_dir)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if max_bytes:
+            try:
+                if path.stat().st_size + len(line) > max_bytes:
+                    rotate(path)
+            except FileNotFoundError:
+                pass
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def parse_duration(value: str) -> float:
+    """Parse a duration such as "90s", "30m", "24h" or "7d" into seconds."""
+    value = value.strip().lower()
+    unit = DURATION_UNITS.get(value[-1:]) if value else None
+    if unit is None or not value[:-1].isdigit():
+        raise ValueError(f"Invalid duration: {value!r}")
+    return int(value[:-1]) * unit
+
+
+def _read_lines(path: Path) -> Iterator[str]:
+    """Read the lines of the rotated timing logs, oldest first, then the log's."""
+    for i in range(BACKUPS, 0, -1):
+        backup = path.with_name(f"{path.name}.{i}.gz")
+        try:
+            with gzip.open(backup, "rt") as f:
+                yield from f
+        except OSError:
+            continue
+    try:
+        with open(path) as f:
+            yield from f
+    except OSError:
+        return
+
+
+def load_records(
+    path: Path, since: float | None = None, session_id: str | None = None
+) -> list[dict[str, Any]]:
+    """Read timing records, optionally only recent ones or one session's.
+
+    Records rotated out of the log into its compressed backups are included.
+    """
+    records: list[dict[str, Any]] = []
+    for line in _read_lines(path):
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            # A partial line from a run that was killed mid-write
+            continue
+        if since is not None and record.get("ts", 0) < since:
+            continue
+        if session_id is not None and record.get("session") != session_id:
+            continue
+        records.append(record)
+    return records
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Get the nearest-rank percentile of a non-empty list of values."""
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def summarize(records: list[dict[str, Any]]) -> dict[str, dict[str, float]]:
+    """Aggregate wall and tool times per hook, keyed by hook name.
+
+    Stages of a pipeline are reported as "<parent>/<hook>".
+    """
+    by_hook: dict[str, list[dict[str, Any]]] = {}
+    for record in records:
+        name = record["hook"]
+        if record.get("parent"):
+            name = f"{record['parent']}/{name}"
+        by_hook.setdefault(name, []).append(record)
+
+    summary: dict[str, dict[str, float]] = {}
+    for name, runs in sorted(by_hook.items()):
+        wall = [r["wall_ms"] for r in runs]
+        tool = [r["tool_ms"] for r in runs]
+        summary[name] = {
+            "runs": len(runs),
+            "p50_ms": percentile(wall, 50),
+            "p95_ms": percentile(wall, 95),
+            "max_ms": max(wall),
+            "tool_p50_ms": percentile(tool, 50),
+            "cache_hits": sum(1 for r in runs if r.get("cache_hit")),
+            "failures": sum(1 for r in runs if r.get("exit")),
+        }
+    return summary
+
+
+def group_by_window(
+    records: list[dict[str, Any]], window: str
+) -> dict[str, list[dict[str, Any]]]:
+    """Split records into local-time windows, "hour" or "day", oldest first."""
+    formats = {"hour": "%Y-%m-%d %H:00", "day": "%Y-%m-%d"}
+    if window not in formats:
+        raise ValueError(f"Invalid window: {window!r}")
+    groups: dict[str, list[dict[str, Any]]] = {}
+    for record in sorted(records, key=lambda r: r.get("ts", 0)):
+        label = time.strftime(formats[window], time.localtime(record.get("ts", 0)))
+        groups.setdefault(label, []).append(record)
+    return groups
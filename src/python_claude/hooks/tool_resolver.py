@@ -0,0 +1,138 @@
+"""Resolve project tools to venv executables so checks skip `uv run`."""
+
+import hashlib
+import json
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import Any
+
+# Changes to these mean the venv may no longer match the project
+LOCK_FILES = ("uv.lock", "pyproject.toml")
+
+# Serializes syncs between hooks running concurrently in one process
+_sync_lock = threading.Lock()
+
+
+def _bin_dir(venv: Path) -> Path:
+    return venv / ("Scripts" if os.name == "nt" else "bin")
+
+
+class ToolResolver:
+    """Maps `uv run <tool>` commands to the tool executables in the project venv.
+
+    ``uv run`` checks the lockfile and environment on every invocation. The
+    resolver instead records the state of ``uv.lock`` and ``pyproject.toml``
+    in ``.claude/tool-cache.json`` and only runs ``uv sync`` when their
+    contents changed. Commands are left to ``uv run`` whenever the venv or
+    the tool can't be found, or the sync fails or takes longer than
+    ``timeout`` seconds.
+    """
+
+    def __init__(self, project_dir: Path, timeout: float | None = None) -> None:
+        self.project_dir = project_dir
+        self.timeout = timeout
+        self.cache_file = project_dir / ".claude" / "tool-cache.json"
+
+    @property
+    def venv(self) -> Path:
+        """Get the project environment that `uv run` would use."""
+        env_dir = os.environ.get("UV_PROJECT_ENVIRONMENT")
+        if env_dir:
+            return self.project_dir / env_dir
+        return self.project_dir / ".venv"
+
+    def _load_cache(self) -> dict[str, Any]:
+        try:
+            data = json.loads(self.cache_file.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save_cache(self, data: dict[str, Any]) -> None:
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp_file.write_text(json.dumps(data))
+        os.replace(tmp_file, self.cache_file)
+
+    def lock_state(self, known: dict[str, Any]) -> dict[str, list[int | str]]:
+        """Get the mtime, size and hash of each lock file.
+
+        Hashes are reused from ``known`` while mtime and size are unchanged,
+        so a touched but unchanged lockfile doesn't trigger a sync.
+        """
+        state: dict[str, list[int | str]] = {}
+        for name in LOCK_FILES:
+            path = self.project_dir / name
+            if not path.exists():
+                continue
+            stat = path.stat()
+            entry = known.get(name)
+            if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                state[name] = entry
+                continue
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            state[name] = [stat.st_mtime_ns, stat.st_size, digest]
+        return state
+
+    def _sync(self) -> bool:
+        from python_claude.hooks.base import run_process
+
+        try:
+            result = run_process(
+                ["uv", "sync", "--inexact", "--quiet"],
+                cwd=self.project_dir,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=self.timeout,
+            )
+        except subprocess.TimeoutExpired:
+            return False
+        return result.returncode == 0
+
+    def _synced(self) -> bool:
+        """Sync the venv if the lock files changed since the last sync."""
+        cache = self._load_cache()
+        known: dict[str, Any] = cache.get("lock", {})
+        state = self.lock_state(known)
+        hashes = {name: entry[2] for name, entry in state.items()}
+        synced = {name: entry[2] for name, entry in known.items()}
+        if hashes != synced and not self._sync():
+            return False
+        if state != known or cache.get("venv") != str(self.venv):
+            self._save_cache({"venv": str(self.venv), "lock": state})
+        return True
+
+    def resolve(self, tool: str) -> Path | None:
+        """Get the venv executable of a tool, or None to use `uv run`."""
+        bin_dir = _bin_dir(self.venv)
+        if not bin_dir.is_dir():
+            # uv run creates the venv on first use
+            return None
+        with _sync_lock:
+            if not self._synced():
+                return None
+        suffix = ".exe" if os.name == "nt" else ""
+        executable = bin_dir / f"{tool}{suffix}"
+        if not os.access(executable, os.X_OK):
+            return None
+        return executable
+
+    def command(self, args: list[str]) -> tuple[list[str], dict[str, str]]:
+        """Rewrite a `uv run` command to run the tool directly.
+
+        Returns the command and the environment variables `uv run` would set.
+        Other commands, and tools that can't be resolved, are returned as is.
+        """
+        if args[:2] != ["uv", "run"] or len(args) < 3:
+            return args, {}
+        executable = self.resolve(args[2])
+        if executable is None:
+            return args, {}
+        path = os.environ.get("PATH", "")
+        env = {
+            "VIRTUAL_ENV": str(self.venv),
+            "PATH": f"{executable.parent}{os.pathsep}{path}",
+        }
+        return [str(executable), *args[3:]], env
@@ -0,0 +1,152 @@
+"""Session store of edited files, shared by all quality checks."""
+
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    import sqlite3
+
+# Tracking files used before the store existed, one per check
+LEGACY_TRACK_FILES = (
+    "edited-files.txt",
+    "format-files.txt",
+    "mypy-files.txt",
+    "pytest-files.txt",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS edits (
+    path TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    edited_at REAL NOT NULL,
+    hash TEXT
+);
+CREATE INDEX IF NOT EXISTS edits_seq ON edits (seq);
+CREATE TABLE IF NOT EXISTS cursors (
+    name TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL
+);
+"""
+
+
+class PendingEdits(NamedTuple):
+    """Files edited since a check last succeeded."""
+
+    files: list[str]
+    # Highest sequence number included, to mark as done on success
+    seq: int
+
+
+class EditStore:
+    """Records each edited path once, with per-check consumer cursors.
+
+    Every edit bumps the path's sequence number. A check consumes the paths
+    edited since its cursor, and moves the cursor forward when it succeeds.
+    The store is a SQLite database in WAL mode, so concurrent hook processes
+    can record and consume edits safely.
+    """
+
+    def __init__(self, log_dir: Path) -> None:
+        self.log_dir = log_dir
+        self.db_file = log_dir / "tracking.db"
+
+    def _connect(self) -> "sqlite3.Connection":
+        import sqlite3
+
+        is_new = not self.db_file.exists()
+        conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # Another process may have created the file but not yet the tables
+        conn.executescript(SCHEMA)
+        if is_new:
+            self._import_legacy(conn)
+        return conn
+
+    def _import_legacy(self, conn: "sqlite3.Connection") -> None:
+        """Carry over files tracked in the old per-check text files."""
+        for name in LEGACY_TRACK_FILES:
+            track_file = self.log_dir / name
+            if not track_file.exists():
+                continue
+            for line in track_file.read_text().split("\n"):
+                if line.strip():
+                    self._record(conn, line.strip(), None)
+            track_file.unlink()
+
+    def _record(
+        self, conn: "sqlite3.Connection", path: str, digest: str | None
+    ) -> None:
+        conn.execute(
+            "INSERT INTO edits (path, seq, edited_at, hash)"
+            " VALUES (?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM edits), ?, ?)"
+            " ON CONFLICT (path) DO UPDATE SET"
+            " seq = excluded.seq, edited_at = excluded.edited_at, hash = excluded.hash",
+            (path, time.time(), digest),
+        )
+
+    def record(self, path: str, digest: str | None = None) -> None:
+        """Record that a file was edited, with its new content hash if known."""
+        conn = self._connect()
+        try:
+            self._record(conn, path, digest)
+        finally:
+            conn.close()
+
+    def update_hash(self, path: str, digest: str | None) -> None:
+        """Replace the content hash of a recorded file without a new edit."""
+        if not self.db_file.exists():
+            return
+        conn = self._connect()
+        try:
+            conn.execute("UPDATE edits SET hash = ? WHERE path = ?", (digest, path))
+        finally:
+            conn.close()
+
+    def content_hash(self, path: str) -> str | None:
+        """Get the content hash recorded for a file's latest edit."""
+        if not self.db_file.exists():
+            return None
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT hash FROM edits WHERE path = ?", (path,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return row[0] if row else None
+
+    def pending(self, name: str) -> PendingEdits:
+        """Get the files edited since the named check last succeeded."""
+        if not self.db_file.exists():
+            return PendingEdits(files=[], seq=0)
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN")
+            row = conn.execute(
+                "SELECT seq FROM cursors WHERE name = ?", (name,)
+            ).fetchone()
+            cursor = row[0] if row else 0
+            rows = conn.execute(
+                "SELECT path, seq FROM edits WHERE seq > ? ORDER BY seq", (cursor,)
+            ).fetchall()
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        files = [path for path, _ in rows]
+        return PendingEdits(files=files, seq=max((seq for _, seq in rows), default=0))
+
+    def mark_done(self, name: str, seq: int) -> None:
+        """Move a check's cursor past the edits it has successfully processed."""
+        if seq == 0:
+            return
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT INTO cursors (name, seq) VALUES (?, ?)"
+                " ON CONFLICT (name) DO UPDATE SET seq = MAX(seq, excluded.seq)",
+                (name, seq),
+            )
+        finally:
+            conn.close()
@@ -0,0 +1,99 @@
+"""Warm-up job that does the first Stop's cold-start work in the background.
+
+Started by the session start hook, the job syncs the project environment,
+runs mypy to fill ``.mypy_cache`` for the current tree and collects the
+tests, at low CPU priority and with all output discarded. One warm-up runs
+per project at a time: sessions starting while one is running skip theirs.
+"""
+
+import os
+import time
+from pathlib import Path
+
+from python_claude.hooks.background import hold_lock, is_locked, spawn
+from python_claude.hooks.base import Hook, HookInput
+from python_claude.hooks.state import QualityCheckState
+
+# Held by the running warm-up, with its process ID as contents
+LOCK_FILE = "warm.lock"
+# Added to the job's nice value, so it yields the CPU to the session's work
+NICENESS = 10
+
+
+def lock_file(project_dir: Path) -> Path:
+    """Get the project's warm-up lock file."""
+    return project_dir / ".claude" / LOCK_FILE
+
+
+def start_warmup(project_dir: Path, session_id: str | None) -> bool:
+    """Start a detached warm-up unless one is running for the project.
+
+    Returns whether a warm-up was started.
+    """
+    if os.name == "nt" or is_locked(lock_file(project_dir)):
+        return False
+    spawn(project_dir, "warm", session_id)
+    return True
+
+
+class WarmHook(Hook):
+    """Warms the environment and tool caches ahead of the first Stop."""
+
+    name = "warm"
+    record_timings = False
+
+    def __init__(self, hook_input: HookInput | None = None) -> None:
+        super().__init__(hook_input)
+
+    def _warm(self, label: str, args: list[str], section: str | None = None) -> None:
+        """Run a tool quietly, within the timeout of a check's settings."""
+        seconds = self.config.integer(section, "timeout") if section else 0
+        self.deadline = time.monotonic() + seconds if seconds else None
+        start = time.perf_counter()
+        try:
+            exit_code = self.run_quietly(args)
+        except OSError as e:
+            self.log(f"{label} failed: {e}", "warning")
+            return
+        self.log(f"{label} exit {exit_code} in {time.perf_counter() - start:.1f}s")
+
+    def sync(self) -> None:
+        """Bring the project environment in line with its lock file."""
+        if self.config.flag("tools", "uv-run"):
+            self._warm("uv sync", ["uv", "sync", "--inexact", "--quiet"])
+            return
+        try:
+            # Syncs the venv only if the lock files changed since the last sync
+            self.tool_command(["uv", "run", "python"])
+        except OSError as e:
+            self.log(f"uv sync failed: {e}", "warning")
+
+    def run(self) -> int:
+        """Sync the environment, then fill mypy's cache and collect the tests."""
+        if os.name == "nt":
+            return 0
+        lock_path = lock_file(self.project_dir)
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        lock = hold_lock(lock_path)
+        if lock is None:
+            self.log("Another warm-up is running")
+            return 0
+        try:
+            os.nice(NICENESS)
+            state = QualityCheckState(self.project_dir)
+            self.sync()
+            if state.is_enabled("mypy"):
+                args = self.config.strings("mypy", "args")
+                targets = self.config.strings("mypy", "targets")
+                self._warm("mypy", ["uv", "run", "mypy", *args, *targets], "mypy")
+            if state.is_enabled("pytest"):
+                args = self.config.strings("pytest", "args")
+                targets = self.config.strings("pytest", "targets")
+                self._warm(
+                    "pytest --collect-only",
+                    ["uv", "run", "pytest", "--collect-only", "-q", *args, *targets],
+                    "pytest",
+                )
+        finally:
+            os.close(lock)
+        return 0
@@ -0,0 +1,227 @@
+"""Background watcher that checks edited files before Stop asks for them.
+
+Started by the session start hook, the watcher follows changes to the
+project's Python files. Once edits have been quiet for a moment it runs the
+read-only checks, ``ruff format --check``, ``ruff check`` without ``--fix``
+and mypy, and stores their results in the result cache under the same keys
+the Stop checks look up. It never modifies files: results for files that
+changed while a check ran are discarded. The watcher exits when the session
+ends or after a period without edits.
+"""
+
+import io
+import os
+import time
+from pathlib import Path
+
+from python_claude.hooks.background import hold_lock, is_locked, lock_holder, spawn
+from python_claude.hooks.base import Hook, HookInput, run_process
+from python_claude.hooks.diagnostics import parse_ruff_json
+from python_claude.hooks.file_watcher import open_watcher
+from python_claude.hooks.result_cache import (
+    MYPY_CONFIG,
+    RUFF_CONFIG,
+    ResultCache,
+)
+from python_claude.hooks.retention import ENDED_MARKER
+from python_claude.hooks.state import QualityCheckState
+
+# Held by the running watcher, with its process ID as contents
+LOCK_FILE = "watcher.lock"
+# Longest wait between checks for the end of the session
+ENDED_POLL_SECONDS = 60.0
+
+
+def watcher_pid(log_dir: Path) -> int | None:
+    """Get the process ID of the session's running watcher, if any."""
+    return lock_holder(log_dir / LOCK_FILE)
+
+
+def start_watcher(project_dir: Path, log_dir: Path, session_id: str) -> bool:
+    """Start a detached watcher for the session unless one is running.
+
+    Returns whether a watcher was started.
+    """
+    if os.name == "nt" or is_locked(log_dir / LOCK_FILE):
+        return False
+    spawn(project_dir, "watch", session_id)
+    return True
+
+
+def stop_watcher(log_dir: Path) -> None:
+    """Ask the session's watcher to exit, if one is running."""
+    import signal
+
+    pid = watcher_pid(log_dir)
+    if pid is None:
+        return
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except ProcessLookupError:
+        pass
+
+
+def _would_reformat(output: str) -> set[str]:
+    """Get the files `ruff format --check` would change."""
+    prefix = "Would reformat: "
+    return {
+        line[len(prefix) :].strip()
+        for line in output.splitlines()
+        if line.startswith(prefix)
+    }
+
+
+class WatchHook(Hook):
+    """Watches the project and checks edited files ahead of Stop."""
+
+    name = "watch"
+    record_timings = False
+
+    def __init__(self, hook_input: HookInput | None = None) -> None:
+        super().__init__(hook_input)
+
+    def output_file(self) -> Path:
+        """Get the file for a tool's full output, reused by every run."""
+        output_dir = self.log_dir / "output"
+        output_dir.mkdir(exist_ok=True)
+        return output_dir / f"{self.name}.log"
+
+    def _limit(self, section: str) -> None:
+        """Give the next tool the timeout of a check's settings."""
+        seconds = self.config.integer(section, "timeout")
+        self.deadline = time.monotonic() + seconds if seconds else None
+
+    def _capture(self, args: list[str]) -> tuple[int, str] | None:
+        """Run a tool and get its exit code and stdout, or None on timeout."""
+        import subprocess
+        import tempfile
+
+        args, env = self.tool_command(args)
+        with tempfile.TemporaryFile("w+") as captured:
+            try:
+                result = run_process(
+                    args,
+                    cwd=self.project_dir,
+                    env={**os.environ, **env} if env else None,
+                    stdout=captured,
+                    stderr=subprocess.DEVNULL,
+                    timeout=self.tool_timeout(),
+                )
+            except subprocess.TimeoutExpired:
+                self.log(f"{' '.join(args)} timed out", "warning")
+                return None
+            captured.seek(0)
+            return result.returncode, captured.read()
+
+    def _precheck_ruff(
+        self, cache: ResultCache, tool: str, args: list[str], files: list[str]
+    ) -> None:
+        """Record the files that pass a read-only ruff command as clean."""
+        keys = cache.file_keys(tool, files, RUFF_CONFIG)
+        files = [f for f in files if not cache.is_clean(keys[f])]
+        if not files:
+            return
+        self._limit("ruff")
+        result = self._capture([*args, *files])
+        if result is None or result[0] not in (0, 1):
+            return
+        exit_code, output = result
+        reported: set[str] = set()
+        if exit_code == 1:
+            if tool == "ruff-format":
+                reported = _would_reformat(output)
+            else:
+                diagnostics = parse_ruff_json(io.StringIO(output))
+                if diagnostics is None:
+                    return
+                reported = {d.file for d in diagnostics}
+        # ruff may report paths relative to the project
+        failed = {str(self.project_dir / path) for path in reported}
+        # Files edited while ruff ran were checked in an unknown state
+        current = cache.file_keys(tool, files, RUFF_CONFIG)
+        clean = [keys[f] for f in files if f not in failed and current[f] == keys[f]]
+        cache.mark_clean(clean)
+        self.log(f"{tool}: {len(clean)} of {len(files)} files clean")
+
+    def _precheck_mypy(self, cache: ResultCache) -> None:
+        """Record mypy's result for the tree as the Stop check would key it."""
+        args = self.config.strings("mypy", "args")
+        targets = self.config.strings("mypy", "targets")
+        key = cache.tree_key("mypy", [*args, *targets], MYPY_CONFIG)
+        if cache.get(key) is not None:
+            return
+        self._limit("mypy")
+        buffer = io.StringIO()
+        exit_code = self.run_tool(["uv", "run", "mypy", *args, *targets], output=buffer)
+        if exit_code not in (0, 1):
+            return
+        # The tree changed while mypy ran
+        if cache.tree_key("mypy", [*args, *targets], MYPY_CONFIG) != key:
+            return
+        cache.put(key, exit_code, buffer.getvalue())
+        self.log(f"mypy: exit {exit_code}")
+
+    def precheck(self, files: list[str]) -> None:
+        """Run the read-only checks for the edited files and cache the results."""
+        cache = ResultCache(self.project_dir, self.config.integer("cache", "max-bytes"))
+        state = QualityCheckState(self.project_dir)
+        files = [f for f in files if Path(f).exists()]
+        if state.is_enabled("ruff") and files:
+            self._precheck_ruff(
+                cache, "ruff-format", ["uv", "run", "ruff", "format", "--check"], files
+            )
+            self._precheck_ruff(
+                cache,
+                "ruff-check",
+                ["uv", "run", "ruff", "check", "--output-format", "json"],
+                files,
+            )
+        # Affected-module and per-package checks are keyed by their targets,
+        # which Stop picks
+        if (
+            state.is_enabled("mypy")
+            and not self.config.flag("mypy", "affected")
+            and not self.config.flag("packages", "enabled")
+        ):
+            self._precheck_mypy(cache)
+
+    def run(self) -> int:
+        """Watch the tree until the session ends or goes idle."""
+        if not self.input.session_id or os.name == "nt":
+            return 0
+        lock = hold_lock(self.log_dir / LOCK_FILE)
+        if lock is None:
+            self.log("Another watcher is running")
+            return 0
+
+        quiet = self.config.integer("watch", "quiet-ms") / 1000
+        idle = self.config.integer("watch", "idle-minutes") * 60
+        ended = self.log_dir / ENDED_MARKER
+        watcher = open_watcher(self.project_dir)
+        self.log(f"Watching with {type(watcher).__name__}")
+        self.flush_log()
+        changed: set[str] = set()
+        last_edit = time.monotonic()
+        try:
+            while not ended.exists():
+                idle_left = last_edit + idle - time.monotonic()
+                if not changed and idle_left <= 0:
+                    self.log("Exiting after no edits")
+                    break
+                timeout = quiet if changed else min(idle_left, ENDED_POLL_SECONDS)
+                events = watcher.wait(timeout)
+                if events:
+                    changed |= events
+                    last_edit = time.monotonic()
+                elif changed:
+                    try:
+                        self.precheck(sorted(changed))
+                    except OSError as e:
+                        # Stop runs the checks itself
+                        self.log(f"Checking ahead failed: {e}", "warning")
+                    changed.clear()
+                    self.flush_log()
+        finally:
+            watcher.close()
+            os.close(lock)
+        return 0
@@ -0,0 +1,226 @@
+"""Per-package checks for workspaces with several Python packages.
+
+Edited files are grouped by the package they belong to: the nearest
+directory at or above the file, within the project, that has its own
+``pyproject.toml``. Each affected package is then checked from its own
+directory, so the tools pick up its configuration, with packages checked in
+parallel up to the ``packages.jobs`` setting. Packages without edits are not
+checked: checks run from the project root, or from a package containing
+other packages, leave the packages below them out.
+"""
+
+import io
+import os
+from collections.abc import Callable, Iterable
+from functools import partial
+from pathlib import Path
+from typing import TypeVar
+
+from python_claude.hooks.base import Hook
+from python_claude.hooks.scheduler import Task, run_tasks
+from python_claude.hooks.snapshot import SKIP_DIRS, scan_python_files
+
+HookT = TypeVar("HookT", bound=Hook)
+
+
+def package_dir(path: Path, project_dir: Path, known: dict[Path, Path]) -> Path:
+    """Get the package directory of a file, or the project for files outside one.
+
+    ``known`` memoizes the answer for each directory looked at.
+    """
+    directory = path.parent
+    seen: list[Path] = []
+    found = project_dir
+    while directory != project_dir and directory.is_relative_to(project_dir):
+        if directory in known:
+            found = known[directory]
+            break
+        seen.append(directory)
+        if (directory / "pyproject.toml").is_file():
+            found = directory
+            break
+        directory = directory.parent
+    for directory in seen:
+        known[directory] = found
+    return found
+
+
+def group_by_package(files: Iterable[str], project_dir: Path) -> dict[Path, list[str]]:
+    """Group edited files by their package directory, in the order first seen."""
+    known: dict[Path, Path] = {}
+    groups: dict[Path, list[str]] = {}
+    for file_path in files:
+        package = package_dir(Path(file_path), project_dir, known)
+        groups.setdefault(package, []).append(file_path)
+    return groups
+
+
+def affected_packages(hook: Hook, files: list[str]) -> dict[Path, list[str]] | None:
+    """Get the edited files by package, or None to check the project as a whole.
+
+    None unless per-package checks are enabled and an edited file belongs to
+    a package below the project root.
+    """
+    if not hook.config.flag("packages", "enabled"):
+        return None
+    groups = group_by_package(files, hook.project_dir)
+    if list(groups) == [hook.project_dir]:
+        return None
+    return groups
+
+
+def find_packages(project_dir: Path) -> list[Path]:
+    """Find the package directories below the project, skipping build directories."""
+    packages: list[Path] = []
+    for dirpath, dirnames, filenames in os.walk(project_dir):
+        dirnames[:] = [
+            d for d in dirnames if not d.startswith(".") and d not in SKIP_DIRS
+        ]
+        if "pyproject.toml" in filenames and Path(dirpath) != project_dir:
+            packages.append(Path(dirpath))
+    return sorted(packages)
+
+
+def package_path(hook: Hook) -> str:
+    """Get the project-relative directory of the hook's package, "" for the project."""
+    if hook.cwd is None or hook.cwd == hook.project_dir:
+        return ""
+    return hook.cwd.relative_to(hook.project_dir).as_posix()
+
+
+def nested_packages(hook: Hook) -> list[Path]:
+    """Get the packages below the directory the hook checks, to leave out.
+
+    Empty unless per-package checks are enabled, since the packages are
+    otherwise checked as part of the project.
+    """
+    if not hook.config.flag("packages", "enabled"):
+        return []
+    directory = hook.cwd or hook.project_dir
+    return [
+        package
+        for package in find_packages(hook.project_dir)
+        if package != directory and package.is_relative_to(directory)
+    ]
+
+
+def local_paths(
+    hook: Hook, rel_paths: Iterable[str], excluded: list[Path]
+) -> list[str]:
+    """Map project-relative paths to the hook's directory.
+
+    Paths outside it or inside an excluded package are left out.
+    """
+    directory = hook.cwd or hook.project_dir
+    local: list[str] = []
+    for rel_path in rel_paths:
+        path = hook.project_dir / rel_path
+        if path.is_relative_to(directory) and not any(
+            path.is_relative_to(package) for package in excluded
+        ):
+            local.append(path.relative_to(directory).as_posix())
+    return local
+
+
+def _covering_path(root: Path, path: Path, excluded: list[Path]) -> Path | None:
+    """Get the highest directory below root holding a file but no excluded package.
+
+    None if the file is inside an excluded package.
+    """
+    parts = path.relative_to(root).parts
+    for i in range(1, len(parts) + 1):
+        candidate = root.joinpath(*parts[:i])
+        if candidate in excluded:
+            return None
+        if not any(package.is_relative_to(candidate) for package in excluded):
+            return candidate
+    return None
+
+
+def paths_outside(
+    directory: Path, targets: list[str], excluded: list[Path]
+) -> list[str]:
+    """Narrow a tool's targets in a directory so they leave out excluded packages.
+
+    A target containing a package is replaced by the paths covering its
+    Python files outside the package, relative to the directory.
+    """
+    paths: list[str] = []
+    for target in targets:
+        root = Path(os.path.normpath(directory / target))
+        if any(root.is_relative_to(package) for package in excluded):
+            continue
+        if not any(package.is_relative_to(root) for package in excluded):
+            paths.append(target)
+            continue
+        covering = {
+            _covering_path(root, root / rel_path, excluded)
+            for rel_path in scan_python_files(root)
+        }
+        paths.extend(
+            path.relative_to(directory).as_posix()
+            for path in sorted(p for p in covering if p is not None)
+        )
+    return paths
+
+
+def package_config(hook: Hook, config_files: Iterable[str]) -> list[str]:
+    """Get a tool's config files at the project root and in the hook's package."""
+    names = list(config_files)
+    prefix = package_path(hook)
+    if not prefix:
+        return names
+    return [*names, *(f"{prefix}/{name}" for name in names)]
+
+
+def merge_exit_codes(exit_codes: list[int]) -> int:
+    """Combine the packages' exit codes: 1 if any had problems, else the first error."""
+    if 1 in exit_codes:
+        return 1
+    return next((code for code in exit_codes if code != 0), 0)
+
+
+def run_packages(
+    hook: HookT,
+    packages: dict[Path, list[str]],
+    check: Callable[[HookT, list[str]], int],
+) -> list[int]:
+    """Run a check for each package from its own directory and merge the reports.
+
+    Each package is checked by a new instance of the hook running its tools in the
+    package directory, with its output buffered and then written to the
+    hook's output under a header. ``check`` gets the package's edited files.
+    Returns the exit codes in package order.
+    """
+    package_hooks: dict[Path, HookT] = {}
+    outputs: dict[Path, io.StringIO] = {}
+    for package in packages:
+        package_hook = type(hook)(hook.input)
+        package_hook.cwd = package
+        package_hook.output = outputs[package] = io.StringIO()
+        package_hook.deadline = hook.deadline
+        package_hook.cancel = hook.cancel
+        package_hooks[package] = package_hook
+    tasks = [
+        Task(name=str(package), run=partial(check, package_hook, packages[package]))
+        for package, package_hook in package_hooks.items()
+    ]
+    jobs = hook.config.integer("packages", "jobs")
+    results = run_tasks(tasks, max_workers=jobs or None)
+
+    exit_codes: list[int] = []
+    for package, package_hook in package_hooks.items():
+        rel_path = package.relative_to(hook.project_dir).as_posix()
+        exit_code = results[str(package)] or 0
+        count = len(packages[package])
+        plural = "" if count == 1 else "s"
+        hook.output.write(
+            f"# {hook.name} in {rel_path} ({count} edited file{plural})\n"
+        )
+        hook.output.write(outputs[package].getvalue())
+        package_hook.flush_log()
+        hook.tool_seconds += package_hook.tool_seconds
+        hook.log(f"{rel_path}: exit {exit_code}")
+        exit_codes.append(exit_code)
+    hook.output.flush()
+    return exit_codes
@@ -0,0 +1,42 @@
+"""Pytest plugin that reports collected tests and their outcomes to a file.
+
+The hooks load it into the project's pytest with ``-p python_claude.pytest_plugin``
+and set ``PYTHON_CLAUDE_PYTEST_REPORT`` to the path of the JSON report.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import pytest
+
+REPORT_ENV = "PYTHON_CLAUDE_PYTEST_REPORT"
+
+_collected: list[str] = []
+_tests: dict[str, dict[str, Any]] = {}
+
+
+def pytest_collection_finish(session: "pytest.Session") -> None:
+    """Record the node IDs of every collected test."""
+    _collected[:] = [item.nodeid for item in session.items]
+
+
+def pytest_runtest_logreport(report: "pytest.TestReport") -> None:
+    """Accumulate the duration and outcome of each test over all its phases."""
+    test = _tests.setdefault(report.nodeid, {"duration": 0.0, "outcome": "passed"})
+    test["duration"] += report.duration
+    if report.failed:
+        test["outcome"] = "failed"
+    elif report.skipped and report.when != "teardown":
+        test["outcome"] = "skipped"
+
+
+def pytest_sessionfinish(session: "pytest.Session", exitstatus: int) -> None:
+    """Write the report if the hooks asked for one."""
+    report_path = os.environ.get(REPORT_ENV)
+    if not report_path:
+        return
+    report = {"collected": _collected, "tests": _tests, "exitstatus": exitstatus}
+    Path(report_path).write_text(json.dumps(report))
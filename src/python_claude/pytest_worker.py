@@ -0,0 +1,160 @@
+"""Warm pytest worker, run in the project's environment by the pytest hook.
+
+The worker imports pytest and the project's third-party dependencies once,
+then listens on a socket and forks a child for every pytest run, so runs
+skip interpreter startup and those imports. Project modules are never
+imported by the worker itself, so each run imports them fresh; only modules
+found outside the project directory, or in its virtual environment, are
+preloaded.
+
+The hook starts it with ``python -m python_claude.pytest_worker`` and its
+settings as JSON on stdin. Requests carry the key of the dependency set they
+expect; a worker preloaded for another key releases its socket and lock and
+exits, so the hook can start a new one.
+"""
+
+import contextlib
+import importlib
+import importlib.util
+import json
+import os
+import signal
+import socket
+import sys
+from pathlib import Path
+from typing import Any
+
+from python_claude.hooks.background import hold_lock
+from python_claude.hooks.server import RESTART, fork_worker, receive_request
+
+# Connections waiting to be accepted while a child is being forked
+BACKLOG = 16
+# Seconds a client gets to send its request
+REQUEST_SECONDS = 5.0
+
+
+def _plugin_modules() -> set[str]:
+    """Get the top-level modules of installed pytest plugins."""
+    from importlib.metadata import entry_points
+
+    return {ep.module.split(".")[0] for ep in entry_points(group="pytest11")}
+
+
+def is_installed(name: str, project_dir: Path) -> bool:
+    """Check whether a module is found outside the project, or in its venv.
+
+    Project modules found on the path, such as editable installs, are not:
+    children forked later would run the tests against their old code.
+    """
+    try:
+        spec = importlib.util.find_spec(name.split(".")[0])
+    except (ImportError, ValueError):
+        return False
+    if spec is None:
+        return False
+    locations = list(spec.submodule_search_locations or ())
+    if spec.has_location and spec.origin:
+        locations.append(spec.origin)
+    if not locations:
+        return spec.origin in ("built-in", "frozen")
+    project = project_dir.resolve()
+    prefix = Path(sys.prefix).resolve()
+    for location in locations:
+        path = Path(location).resolve()
+        if path.is_relative_to(project) and not path.is_relative_to(prefix):
+            return False
+    return True
+
+
+def preload(modules: list[str], project_dir: Path) -> int:
+    """Import pytest and the given modules, returning how many were imported.
+
+    Plugins are left to pytest, which rewrites their asserts only if it
+    imports them itself. Modules that fail to import or belong to the
+    project are skipped.
+    """
+    import pytest  # noqa: F401
+
+    plugins = _plugin_modules()
+    imported = 0
+    for name in modules:
+        if name.split(".")[0] in plugins or name in sys.modules:
+            continue
+        if not is_installed(name, project_dir):
+            continue
+        # Any import may fail in its own way; the run then imports it itself
+        with contextlib.suppress(Exception):
+            importlib.import_module(name)
+            imported += 1
+    return imported
+
+
+def run_pytest(request: dict[str, Any]) -> int:
+    """Run pytest with a request's arguments, in a forked child."""
+    import pytest
+
+    return int(pytest.main(request["argv"][1:]))
+
+
+def serve(settings: dict[str, Any]) -> None:
+    """Preload the dependencies and run pytest for requests until idle."""
+    path = settings["socket"]
+    lock = hold_lock(Path(settings["lock"]))
+    if lock is None:
+        return
+    bound = False
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        preload(settings["modules"], Path(settings["project"]))
+        if os.path.exists(path):
+            os.unlink(path)
+        listener.bind(path)
+        bound = True
+        os.chmod(path, 0o600)
+        listener.listen(BACKLOG)
+        listener.settimeout(settings["idle_seconds"] or None)
+        # Finished children are reaped by the kernel
+        signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except TimeoutError:
+                break
+            conn.settimeout(REQUEST_SECONDS)
+            try:
+                request, fds = receive_request(conn)
+            except (OSError, ValueError):
+                conn.close()
+                continue
+            conn.settimeout(None)
+            if request.get("key") != settings["key"]:
+                # Let a worker for the new dependencies take over at once
+                os.unlink(path)
+                bound = False
+                listener.close()
+                os.close(lock)
+                lock = None
+                conn.sendall(RESTART)
+                for fd in fds:
+                    os.close(fd)
+                conn.close()
+                break
+            fork_worker(conn, request, fds, [listener.fileno(), lock], run_pytest)
+    finally:
+        if bound and os.path.exists(path):
+            os.unlink(path)
+        listener.close()
+        if lock is not None:
+            os.close(lock)
+
+
+def main() -> None:
+    """Read the worker's settings from stdin and serve."""
+    # Import from where the pytest script would, not the project directory
+    if sys.path and sys.path[0] in ("", os.getcwd()):
+        sys.path[0] = os.path.dirname(sys.executable)
+    serve(json.load(sys.stdin))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""Smoke test for the hook latency benchmarks."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+BENCH_SCRIPT = Path(__file__).parent.parent / "benchmarks" / "bench_hooks.py"
+
+
+class TestBenchmarks:
+    def test_writes_json_report(self, tmp_path: Path) -> None:
+        output = tmp_path / "bench.json"
+        subprocess.run(
+            [
+                sys.executable,
+                str(BENCH_SCRIPT),
+                *("--modules", "3", "--tests", "1", "--edits", "2", "--repeat", "1"),
+                *("--uv-ms", "0", "--tool-ms", "0", "--output", str(output)),
+            ],
+            check=True,
+        )
+        report = json.loads(output.read_text())
+        assert report["params"]["modules"] == 3
+        assert set(report["results"]) == {
+            "edited",
+            "edit_store",
+            "edited_cold",
+            "state_read",
+            "stop_uv_run",
+            "stop_direct",
+        }
+        assert report["results"]["edited"]["n"] == 2
+        assert report["results"]["edit_store"]["bytes"] > 0
@@ -0,0 +1,111 @@
+"""Tests for the CLI hook registry and its startup cost."""
+
+import subprocess
+import sys
+from unittest.mock import patch
+
+import pytest
+
+from python_claude import cli
+from python_claude.hooks.edited_hook import EditedHook
+from python_claude.hooks.session_start_hook import SessionStartHook
+from python_claude.hooks.toggle_hook import ToggleHook
+
+# Budget for the imports of a cold `python-claude edited` run, in milliseconds.
+# About twice the cost on a quiet machine, so loaded CI runners stay green.
+IMPORT_BUDGET_MS = 80
+
+# Modules the edited hook must never pay for before it runs
+HEAVY_MODULES = [
+    "ast",
+    "concurrent.futures",
+    "gzip",
+    "importlib.metadata",
+    "python_claude.hooks.mypy_hook",
+    "python_claude.hooks.pytest_hook",
+    "sqlite3",
+    "subprocess",
+]
+
+EDITED_STARTUP = "from python_claude.cli import resolve_command; resolve_command(['python-claude', 'edited'])"
+
+
+class TestResolveCommand:
+    def test_single_word_command(self) -> None:
+        assert cli.resolve_command(["python-claude", "edited"]) == (
+            "edited",
+            EditedHook,
+        )
+
+    def test_two_word_command(self) -> None:
+        assert cli.resolve_command(["python-claude", "session", "start"]) == (
+            "session start",
+            SessionStartHook,
+        )
+
+    def test_single_word_command_with_argument(self) -> None:
+        assert cli.resolve_command(["python-claude", "toggle", "mypy"]) == (
+            "toggle",
+            ToggleHook,
+        )
+
+    def test_builtin_hooks_skip_entry_points(self) -> None:
+        with patch.object(cli, "_plugin_hooks", side_effect=AssertionError):
+            assert cli.resolve_command(["python-claude", "edited"]) is not None
+
+    def test_entry_point_hook(self) -> None:
+        plugins = {"custom": "python_claude.hooks.edited_hook:EditedHook"}
+        with patch.object(cli, "_plugin_hooks", return_value=plugins):
+            assert cli.resolve_command(["python-claude", "custom"]) == (
+                "custom",
+                EditedHook,
+            )
+
+    def test_unknown_command(self, capsys: pytest.CaptureFixture[str]) -> None:
+        with (
+            patch.object(sys, "argv", ["python-claude", "bogus"]),
+            pytest.raises(SystemExit) as exc_info,
+        ):
+            cli.main()
+        assert exc_info.value.code == 1
+        assert "Unknown command: bogus" in capsys.readouterr().err
+
+
+def _import_times(code: str) -> dict[str, int]:
+    """Get the cumulative import time, in microseconds, of top-level imports."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Nested imports are indented after the single separating space
+        times[name[1:].rstrip()] = int(cumulative)
+    return times
+
+
+class TestStartup:
+    def test_edited_skips_heavy_modules(self) -> None:
+        times = _import_times(EDITED_STARTUP)
+        imported = {name.strip() for name in times}
+        assert imported.isdisjoint(HEAVY_MODULES)
+
+    def test_edited_import_budget(self) -> None:
+        baseline = _import_times("pass")
+        costs: list[float] = []
+        for _ in range(5):
+            times = _import_times(EDITED_STARTUP)
+            # Only top-level imports the interpreter doesn't make on its own
+            own = [
+                cumulative
+                for name, cumulative in times.items()
+                if not name.startswith(" ") and name not in baseline
+            ]
+            costs.append(sum(own) / 1000)
+        # Noise only ever adds time, so the fastest run is the most stable
+        assert 0 < min(costs) < IMPORT_BUDGET_MS, costs
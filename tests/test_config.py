@@ -0,0 +1,121 @@
+"""Tests for the project configuration."""
+
+import json
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from python_claude.hooks.config import cache_file, load_config, toggles_file
+from python_claude.hooks.state import QualityCheckState
+
+needs_toml = pytest.mark.skipif(
+    sys.version_info < (3, 11), reason="tomllib is needed to read pyproject.toml"
+)
+
+
+def _write_pyproject(project_dir: Path, body: str) -> None:
+    (project_dir / "pyproject.toml").write_text(f"[project]\nname = 'x'\n\n{body}")
+
+
+class TestConfig:
+    def test_defaults(self, tmp_path: Path) -> None:
+        config = load_config(tmp_path)
+        assert config.flag("mypy", "enabled")
+        assert config.strings("mypy", "targets") == ["."]
+        assert config.integer("gc", "max-age-days") == 14
+        assert config.string("log", "level") == "info"
+
+    @needs_toml
+    def test_reads_pyproject_table(self, tmp_path: Path) -> None:
+        _write_pyproject(
+            tmp_path,
+            "[tool.python-claude.mypy]\n"
+            'args = ["--strict"]\n'
+            'targets = ["src"]\n'
+            "\n[tool.python-claude.pytest]\n"
+            "enabled = false\n"
+            'args = "-p no:cacheprovider -q"\n',
+        )
+        config = load_config(tmp_path)
+        assert config.strings("mypy", "args") == ["--strict"]
+        assert config.strings("mypy", "targets") == ["src"]
+        assert config.strings("pytest", "args") == ["-p", "no:cacheprovider", "-q"]
+        assert not config.flag("pytest", "enabled")
+
+    @needs_toml
+    def test_invalid_values_are_ignored(self, tmp_path: Path) -> None:
+        _write_pyproject(
+            tmp_path,
+            "[tool.python-claude.gc]\n"
+            'max-age-days = "soon"\n'
+            "max-sessions = -1\n"
+            "unknown = 1\n"
+            "\n[tool.python-claude.mypy]\n"
+            "daemon = 2\n",
+        )
+        config = load_config(tmp_path)
+        assert config.integer("gc", "max-age-days") == 14
+        assert config.integer("gc", "max-sessions") == 100
+        assert not config.flag("mypy", "daemon")
+
+    @needs_toml
+    def test_warns_when_pyproject_cannot_be_read(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        _write_pyproject(tmp_path, "[tool.python-claude.mypy]\ndaemon = true\n")
+        with (
+            patch.object(sys, "version_info", (3, 10)),
+            patch.dict(sys.modules, {"tomli": None}),
+        ):
+            config = load_config(tmp_path)
+            assert not config.flag("mypy", "daemon")
+        assert "settings are ignored" in capsys.readouterr().err
+
+    def test_toggles_override_pyproject(self, tmp_path: Path) -> None:
+        _write_pyproject(tmp_path, "[tool.python-claude.ruff]\nenabled = false\n")
+        state = QualityCheckState(tmp_path)
+        assert not state.is_enabled("ruff")
+        state.toggle("ruff")
+        assert state.is_enabled("ruff")
+
+    @needs_toml
+    def test_environment_overrides_everything(self, tmp_path: Path) -> None:
+        _write_pyproject(tmp_path, "[tool.python-claude.mypy]\nenabled = false\n")
+        QualityCheckState(tmp_path).disable("mypy")
+        with patch.dict(os.environ, {"PYTHON_CLAUDE_MYPY_ENABLED": "1"}):
+            assert load_config(tmp_path).flag("mypy", "enabled")
+        with patch.dict(os.environ, {"PYTHON_CLAUDE_MYPY_FULL_EVERY": "3"}):
+            assert load_config(tmp_path).integer("mypy", "full-every") == 3
+        with patch.dict(os.environ, {"PYTHON_CLAUDE_MYPY_FULL_EVERY": "often"}):
+            assert load_config(tmp_path).integer("mypy", "full-every") == 10
+
+    @needs_toml
+    def test_reloads_when_pyproject_changes(self, tmp_path: Path) -> None:
+        _write_pyproject(tmp_path, "[tool.python-claude.log]\nlevel = 'debug'\n")
+        first = load_config(tmp_path)
+        assert load_config(tmp_path) is first
+        _write_pyproject(tmp_path, "[tool.python-claude.log]\nlevel = 'warning'\n")
+        assert load_config(tmp_path).string("log", "level") == "warning"
+
+    @needs_toml
+    def test_parsed_values_are_cached_on_disk(self, tmp_path: Path) -> None:
+        _write_pyproject(tmp_path, "[tool.python-claude.stop]\nfail-fast = true\n")
+        load_config(tmp_path)
+        cached = json.loads(cache_file(tmp_path).read_text())
+        assert cached["values"] == {"stop": {"fail-fast": True}}
+
+        # Another process reuses the cache without parsing pyproject.toml
+        with (
+            patch.dict("python_claude.hooks.config._loaded", clear=True),
+            patch("python_claude.hooks.config._parse_pyproject") as parse,
+        ):
+            assert load_config(tmp_path).flag("stop", "fail-fast")
+        parse.assert_not_called()
+
+    def test_toggle_file_is_replaced_atomically(self, tmp_path: Path) -> None:
+        QualityCheckState(tmp_path).disable("pytest")
+        assert json.loads(toggles_file(tmp_path).read_text()) == {"pytest": False}
+        assert list(toggles_file(tmp_path).parent.glob("*.tmp")) == []
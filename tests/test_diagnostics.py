@@ -0,0 +1,129 @@
+"""Tests for bounded tool output capture and summaries."""
+
+import io
+import json
+import os
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from python_claude.hooks.base import HookInput
+from python_claude.hooks.diagnostics import format_output
+from python_claude.hooks.mypy_hook import MypyHook
+from python_claude.hooks.ruff_check_hook import RuffCheckHook
+
+LOG = Path(".claude/debug/output/tool.log")
+MYPY = ["uv", "run", "mypy", "."]
+RUFF = ["uv", "run", "ruff", "check", "--fix", "--output-format", "json", "a.py"]
+
+
+def _mypy_output(files: int, errors_per_file: int) -> str:
+    lines = [
+        f'src/m{f}.py:{i + 1}: error: Name "x" is not defined  [name-defined]\n'
+        for f in range(files)
+        for i in range(errors_per_file)
+    ]
+    lines.append(f"Found {files * errors_per_file} errors in {files} files\n")
+    return "".join(lines)
+
+
+class TestFormatOutput:
+    def test_short_output_passes_through(self) -> None:
+        text = _mypy_output(1, 2)
+        assert format_output(io.StringIO(text), MYPY, LOG, 10_000, 5) == text
+
+    def test_long_mypy_output_is_summarized(self) -> None:
+        text = _mypy_output(12, 50)
+        summary = format_output(io.StringIO(text), MYPY, LOG, 1000, 5)
+        assert len(summary) < 2000
+        assert f"# Full output: {LOG}" in summary
+        assert "# 600 errors in 12 files" in summary
+        assert "#   src/m0.py: 50 (name-defined 50)" in summary
+        assert "#   and 2 more files" in summary
+        # Identical messages are listed once
+        assert "(and 599 more like it)" in summary
+        assert summary.endswith("Found 600 errors in 12 files\n")
+
+    def test_pytest_failures_are_grouped(self) -> None:
+        lines = ["E   ImportError: boom\n"] * 3000
+        lines += [
+            f"FAILED tests/test_{i % 3}.py::test_{i} - ImportError: boom\n"
+            for i in range(300)
+        ]
+        lines.append("ERROR tests/test_x.py - SyntaxError: bad\n")
+        text = "".join(lines)
+        summary = format_output(io.StringIO(text), ["pytest"], LOG, 1000, 5)
+        assert "# 301 failed tests in 4 files" in summary
+        assert "#   tests/test_0.py: 100 (FAILED 100)" in summary
+        assert "(and 299 more like it)" in summary
+        assert "ERROR tests/test_x.py - SyntaxError: bad\n" in summary
+
+    def test_long_lines_are_cut(self) -> None:
+        text = "x" * 100_000 + "\n"
+        summary = format_output(io.StringIO(text), ["tool"], LOG, 1000, 5)
+        assert len(summary) < 1000
+
+    def test_ruff_json_is_rendered(self) -> None:
+        report = [
+            {
+                "code": "F401",
+                "message": "`os` imported but unused",
+                "filename": "a.py",
+                "location": {"row": 1, "column": 8},
+            }
+        ]
+        text = format_output(io.StringIO(json.dumps(report)), RUFF, LOG, 1000, 5)
+        assert text == "a.py:1:8: F401 `os` imported but unused\nFound 1 error.\n"
+        assert format_output(io.StringIO("[]"), RUFF, LOG, 1000, 5) == ""
+
+    def test_ruff_failures_pass_through(self) -> None:
+        text = "ruff failed\n  Cause: bad config\n"
+        assert format_output(io.StringIO(text), RUFF, LOG, 1000, 5) == text
+
+
+class TestRunToolCapture:
+    def test_keeps_full_output_on_disk(self, tmp_path: Path) -> None:
+        text = _mypy_output(3, 400)
+
+        def run(args: list[str], **kwargs: Any) -> MagicMock:
+            kwargs["stdout"].write(text)
+            return MagicMock(returncode=1)
+
+        hook_input = HookInput(session_id="abc123", tool_input={}, raw={})
+        with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
+            hook = MypyHook(hook_input)
+            hook.output = io.StringIO()
+            with patch("python_claude.hooks.base.run_process", side_effect=run):
+                assert hook.run_tool(MYPY) == 1
+        log = Path(".claude/debug/sessions/abc123/output/mypy.log")
+        assert (tmp_path / log).read_text() == text
+        assert f"# Full output: {log}" in hook.output.getvalue()
+        assert len(hook.output.getvalue()) < 3000
+
+    def test_ruff_stderr_does_not_break_json(self, tmp_path: Path) -> None:
+        report = [
+            {
+                "code": "F401",
+                "message": "`os` imported but unused",
+                "filename": "a.py",
+                "location": {"row": 1, "column": 8},
+            }
+        ]
+        warning = "warning: The top-level linter settings are deprecated\n"
+
+        def run(args: list[str], **kwargs: Any) -> MagicMock:
+            kwargs["stdout"].write(json.dumps(report))
+            kwargs["stderr"].write(warning)
+            return MagicMock(returncode=1)
+
+        hook_input = HookInput(session_id="abc123", tool_input={}, raw={})
+        with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
+            hook = RuffCheckHook(hook_input)
+            hook.output = io.StringIO()
+            with patch("python_claude.hooks.base.run_process", side_effect=run):
+                assert hook.run_tool(RUFF) == 1
+        assert hook.output.getvalue() == (
+            f"a.py:1:8: F401 `os` imported but unused\nFound 1 error.\n{warning}"
+        )
+        log = tmp_path / ".claude/debug/sessions/abc123/output/ruff-check.log"
+        assert log.read_text() == json.dumps(report) + warning
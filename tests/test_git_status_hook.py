@@ -0,0 +1,120 @@
+"""Tests for GitStatusHook."""
+
+import json
+import os
+import subprocess
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from python_claude.hooks.base import HookInput
+from python_claude.hooks.git_status_hook import GitStatusHook, parse_porcelain_v2
+
+SUMMARY = {"PYTHON_CLAUDE_GIT_SUMMARY": "1"}
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+def _context(capsys: Any) -> str:
+    context: str = json.loads(capsys.readouterr().out)["additionalContext"]
+    return context
+
+
+class TestParsePorcelainV2:
+    def test_counts_and_short_status(self) -> None:
+        records = [
+            "# branch.oid abc",
+            "# branch.head main",
+            "# branch.upstream origin/main",
+            "# branch.ab +2 -1",
+            "1 M. N... 100644 100644 100644 h1 h2 staged file.py",
+            "1 .M N... 100644 100644 100644 h1 h2 modified.py",
+            "2 R. N... 100644 100644 100644 h1 h2 R100 new.py",
+            "old.py",
+            "u UU N... 100644 100644 100644 100644 h1 h2 h3 conflict.py",
+            "? build/",
+        ]
+        summary = parse_porcelain_v2(iter(records), max_paths=3)
+        assert summary.branch == "main"
+        assert (summary.upstream, summary.ahead, summary.behind) == (
+            "origin/main",
+            2,
+            1,
+        )
+        assert summary.counts == {
+            "staged": 2,
+            "modified": 1,
+            "conflicted": 1,
+            "untracked": 1,
+        }
+        assert summary.paths == ["M  staged file.py", " M modified.py", "R  new.py"]
+        assert summary.describe().endswith("... and 2 more paths")
+
+
+class TestGitStatusHook:
+    def test_summary_as_additional_context(self, tmp_path: Path, capsys: Any) -> None:
+        _git(tmp_path, "init", "-q", "-b", "main")
+        (tmp_path / "a.py").write_text("a = 1\n")
+        _git(tmp_path, "add", "a.py")
+        _git(tmp_path, "commit", "-q", "-m", "init")
+        (tmp_path / "a.py").write_text("a = 2\n")
+        for i in range(30):
+            (tmp_path / f"new{i}.py").touch()
+
+        env = {**SUMMARY, "CLAUDE_PROJECT_DIR": str(tmp_path)}
+        with patch.dict(os.environ, env):
+            hook = GitStatusHook(HookInput(session_id=None, tool_input={}, raw={}))
+            assert hook.run() == 0
+        context = _context(capsys)
+        lines = context.splitlines()
+        assert lines[0] == "git status: on branch main"
+        assert lines[1] == "1 modified, 30 untracked"
+        assert lines[2] == " M a.py"
+        assert lines[-1] == "... and 11 more paths"
+
+    def test_fsmonitor_is_opt_in(self, tmp_path: Path) -> None:
+        hook_input = HookInput(session_id=None, tool_input={}, raw={})
+        with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
+            assert (
+                "core.fsmonitor=true" not in GitStatusHook(hook_input).status_command()
+            )
+        env = {"CLAUDE_PROJECT_DIR": str(tmp_path), "PYTHON_CLAUDE_GIT_FSMONITOR": "1"}
+        with patch.dict(os.environ, env):
+            assert "core.fsmonitor=true" in GitStatusHook(hook_input).status_command()
+
+    def test_reports_timeout(self, tmp_path: Path, capsys: Any) -> None:
+        env = {**SUMMARY, "CLAUDE_PROJECT_DIR": str(tmp_path)}
+        with (
+            patch.dict(os.environ, env),
+            patch(
+                "python_claude.hooks.git_status_hook.run_process",
+                side_effect=subprocess.TimeoutExpired(["git"], 5),
+            ),
+        ):
+            hook = GitStatusHook(HookInput(session_id=None, tool_input={}, raw={}))
+            assert hook.run() == 0
+        assert _context(capsys) == "git status: timed out after 5s"
+
+    @pytest.mark.parametrize("error", [None, FileNotFoundError("git")])
+    def test_silent_outside_repository(
+        self, tmp_path: Path, capsys: Any, error: Exception | None
+    ) -> None:
+        env = {**SUMMARY, "CLAUDE_PROJECT_DIR": str(tmp_path), "GIT_DIR": "missing"}
+        with patch.dict(os.environ, env):
+            hook = GitStatusHook(HookInput(session_id=None, tool_input={}, raw={}))
+            if error is None:
+                assert hook.run() == 0
+            else:
+                target = "python_claude.hooks.git_status_hook.run_process"
+                with patch(target, side_effect=error):
+                    assert hook.run() == 0
+        assert capsys.readouterr().out == ""
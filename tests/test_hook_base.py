@@ -1,11 +1,50 @@
 """Tests for base Hook functionality."""
 
+import io
 import os
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import Iterator
 from pathlib import Path
 from unittest.mock import patch
 
-from python_claude.hooks.base import HookInput
+import pytest
+
+from python_claude.hooks.base import TIMEOUT_EXIT, Cancelled, HookInput, run_process
 from python_claude.hooks.edited_hook import EditedHook
+from python_claude.hooks.pytest_hook import PytestHook
+
+SLEEPER = [sys.executable, "-c", "import time; time.sleep(30)"]
+
+
+def _alive(pid: int) -> bool:
+    """Check whether a process exists and isn't a zombie awaiting its reaper."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except OSError:
+        return True
+    return stat.rsplit(")", 1)[1].split()[0] != "Z"
+
+
+def _spawn_and_record(pid_file: Path, wait: bool) -> list[str]:
+    """Get a shell command that starts a sleeping child and records its PID."""
+    script = f"sleep 30 & echo $! > {pid_file}"
+    return ["sh", "-c", f"{script}; wait" if wait else script]
+
+
+def _wait_dead(pid: int) -> bool:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        if not _alive(pid):
+            return True
+        time.sleep(0.05)
+    return False
 
 
 class TestHookBase:
@@ -38,3 +77,84 @@ class TestHookBase:
             hook = EditedHook(hook_input)
             expected = tmp_path / ".claude" / "debug"
             assert hook.log_dir == expected
+
+
+@pytest.mark.skipif(os.name == "nt", reason="process groups are POSIX only")
+class TestRunProcess:
+    @pytest.fixture(autouse=True)
+    def keep_signal_handlers(self) -> Iterator[None]:
+        """Keep the runner from replacing pytest's own signal handlers."""
+        with patch("python_claude.hooks.base._handling_termination", True):
+            yield
+
+    def test_timeout_stops_whole_group(self, tmp_path: Path) -> None:
+        pid_file = tmp_path / "child.pid"
+        with pytest.raises(subprocess.TimeoutExpired):
+            run_process(_spawn_and_record(pid_file, wait=True), cwd=tmp_path, timeout=1)
+        assert _wait_dead(int(pid_file.read_text()))
+
+    def test_escalates_to_sigkill(self, tmp_path: Path) -> None:
+        stubborn = ["sh", "-c", "trap '' TERM; sleep 30 & wait; sleep 30"]
+        start = time.monotonic()
+        with (
+            patch("python_claude.hooks.base.KILL_GRACE_SECONDS", 0.5),
+            pytest.raises(subprocess.TimeoutExpired),
+        ):
+            run_process(stubborn, cwd=tmp_path, timeout=0.5)
+        assert time.monotonic() - start < 10
+
+    def test_cancel_stops_whole_group(self, tmp_path: Path) -> None:
+        pid_file = tmp_path / "child.pid"
+        cancel = threading.Event()
+        timer = threading.Timer(0.5, cancel.set)
+        timer.start()
+        start = time.monotonic()
+        with pytest.raises(Cancelled):
+            run_process(
+                _spawn_and_record(pid_file, wait=True), cwd=tmp_path, cancel=cancel
+            )
+        assert time.monotonic() - start < 10
+        assert _wait_dead(int(pid_file.read_text()))
+
+    def test_cancelled_starts_nothing(self, tmp_path: Path) -> None:
+        cancel = threading.Event()
+        cancel.set()
+        with patch("subprocess.Popen") as popen, pytest.raises(Cancelled):
+            run_process(["true"], cwd=tmp_path, cancel=cancel)
+        popen.assert_not_called()
+
+    def test_stops_processes_left_behind(self, tmp_path: Path) -> None:
+        pid_file = tmp_path / "child.pid"
+        result = run_process(_spawn_and_record(pid_file, wait=False), cwd=tmp_path)
+        assert result.returncode == 0
+        assert _wait_dead(int(pid_file.read_text()))
+
+    def test_used_up_timeout_starts_nothing(self, tmp_path: Path) -> None:
+        with (
+            patch("subprocess.Popen") as popen,
+            pytest.raises(subprocess.TimeoutExpired),
+        ):
+            run_process(["true"], cwd=tmp_path, timeout=0)
+        popen.assert_not_called()
+
+    def test_check_timeout_is_reported(self, tmp_path: Path) -> None:
+        hook_input = HookInput(session_id=None, tool_input={}, raw={})
+        env = {"CLAUDE_PROJECT_DIR": str(tmp_path), "PYTHON_CLAUDE_PYTEST_TIMEOUT": "1"}
+        with patch.dict(os.environ, env):
+            hook = PytestHook(hook_input)
+            hook.output = io.StringIO()
+            assert hook.run_tool(SLEEPER) == TIMEOUT_EXIT
+        assert "pytest: python" in hook.output.getvalue()
+        assert "timed out after 1s" in hook.output.getvalue()
+
+    def test_pipeline_deadline_limits_checks(self, tmp_path: Path) -> None:
+        hook_input = HookInput(session_id=None, tool_input={}, raw={})
+        with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
+            hook = PytestHook(hook_input)
+            hook.deadline = time.monotonic() + 0.5
+            assert 0 < (hook.tool_timeout() or 0) <= 0.5
+            hook.deadline = time.monotonic() - 1
+            hook.output = io.StringIO()
+            with patch("subprocess.Popen") as popen:
+                assert hook.run_tool(SLEEPER) == TIMEOUT_EXIT
+            popen.assert_not_called()
@@ -4,6 +4,8 @@ import json
 from io import StringIO
 from unittest.mock import patch
 
+import pytest
+
 from python_claude.hooks.base import HookInput
 
 
@@ -30,3 +32,61 @@ class TestHookInput:
         with patch("sys.stdin", StringIO(json.dumps(data))):
             hook_input = HookInput.from_stdin()
             assert hook_input.session_id is None
+
+    def test_json_null_session_id(self) -> None:
+        with patch("sys.stdin", StringIO('{"session_id": null, "tool_input": {}}')):
+            assert HookInput.from_stdin().session_id is None
+
+
+class TestLazyPayload:
+    def _read(self, text: str) -> HookInput:
+        with patch("sys.stdin", StringIO(text)):
+            return HookInput.from_stdin()
+
+    def test_file_path_read_without_parsing_content(self) -> None:
+        # The content is cut off: parsing the whole payload would fail
+        text = (
+            '{"session_id": "s1", "tool_input": {"file_path": "/a.py",'
+            ' "content": "' + "x = 1\\n" * 100_000
+        )
+        hook_input = self._read(text)
+        assert hook_input.session_id == "s1"
+        assert hook_input.file_path == "/a.py"
+        with pytest.raises(json.JSONDecodeError):
+            hook_input.tool_input["content"]
+
+    def test_rest_of_payload_parsed_on_access(self) -> None:
+        data = {
+            "session_id": "s1",
+            "tool_name": "Write",
+            "tool_input": {"file_path": "/a.py", "content": "x = 1\n"},
+        }
+        hook_input = self._read(json.dumps(data))
+        assert hook_input.tool_input == data["tool_input"]
+        assert hook_input.raw["tool_name"] == "Write"
+        assert dict(hook_input.raw) == data
+
+    def test_keys_in_any_order(self) -> None:
+        text = (
+            '{"tool_response": {"file_path": "/other.py"},'
+            ' "tool_input": {"content": "{\\"file_path\\": \\"/fake.py\\"}",'
+            ' "edits": [{"file_path": "/nested.py"}], "file_path": "/a.py"},'
+            ' "cwd": "/", "session_id": "s1"}'
+        )
+        hook_input = self._read(text)
+        assert hook_input.file_path == "/a.py"
+        assert hook_input.session_id == "s1"
+
+    def test_escaped_strings(self) -> None:
+        data = {"session_id": "s1", "tool_input": {"file_path": 'C:\\dir\\"é".py'}}
+        assert self._read(json.dumps(data)).file_path == 'C:\\dir\\"é".py'
+
+    def test_missing_tool_input(self) -> None:
+        hook_input = self._read('{"session_id": "s1", "stop_hook_active": true}')
+        assert hook_input.file_path is None
+        assert hook_input.tool_input == {}
+        assert hook_input.raw["stop_hook_active"] is True
+
+    def test_invalid_input_still_raises(self) -> None:
+        with pytest.raises(json.JSONDecodeError):
+            self._read("not json")
@@ -0,0 +1,203 @@
+"""Tests for ImportGraph and affected-test selection."""
+
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from python_claude.hooks.base import HookInput
+from python_claude.hooks.import_graph import ImportGraph
+from python_claude.hooks.pytest_hook import PytestHook
+
+
+def _write(root: Path, rel_path: str, source: str = "") -> Path:
+    path = root / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(source)
+    return path
+
+
+def _make_project(root: Path) -> None:
+    """Create a src-layout project with a leaf module and a shared core."""
+    _write(root, "pyproject.toml", "[project]\nname = 'pkg'\n")
+    _write(root, "src/pkg/__init__.py")
+    _write(root, "src/pkg/core.py", "VALUE = 1\n")
+    _write(root, "src/pkg/leaf.py", "X = 2\n")
+    _write(root, "src/pkg/api.py", "from .core import VALUE\n")
+    _write(root, "tests/test_api.py", "from pkg.api import VALUE\n")
+    _write(root, "tests/test_core.py", "import pkg.core\n")
+    _write(root, "tests/test_leaf.py", "from pkg import leaf\n")
+
+
+class TestImportGraph:
+    def test_leaf_edit_selects_direct_tests(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        graph = ImportGraph(tmp_path)
+        edited = [str(tmp_path / "src/pkg/leaf.py")]
+        assert graph.affected_tests(edited) == ["tests/test_leaf.py"]
+
+    def test_transitive_dependents(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        graph = ImportGraph(tmp_path)
+        edited = [str(tmp_path / "src/pkg/core.py")]
+        assert graph.affected_tests(edited) == [
+            "tests/test_api.py",
+            "tests/test_core.py",
+        ]
+
+    def test_package_init_affects_all_importers(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        graph = ImportGraph(tmp_path)
+        edited = [str(tmp_path / "src/pkg/__init__.py")]
+        assert graph.affected_tests(edited) == [
+            "tests/test_api.py",
+            "tests/test_core.py",
+            "tests/test_leaf.py",
+        ]
+
+    def test_conftest_selects_full_suite(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        conftest = _write(tmp_path, "tests/conftest.py")
+        assert ImportGraph(tmp_path).affected_tests([str(conftest)]) is None
+
+    def test_conftest_dependent_selects_full_suite(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        _write(tmp_path, "src/pkg/fixtures.py", "DATA = 1\n")
+        _write(tmp_path, "tests/conftest.py", "from pkg.fixtures import DATA\n")
+        edited = [str(tmp_path / "src/pkg/fixtures.py")]
+        assert ImportGraph(tmp_path).affected_tests(edited) is None
+
+    def test_module_without_importers_selects_full_suite(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        plugin = _write(tmp_path, "src/pkg/plugin.py")
+        assert ImportGraph(tmp_path).affected_tests([str(plugin)]) is None
+
+    def test_module_without_name_selects_full_suite(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        script = _write(tmp_path, "scripts/build-docs/run.py", "import pkg.leaf\n")
+        graph = ImportGraph(tmp_path)
+        assert graph.module_name("scripts/build-docs/run.py") is None
+        assert graph.affected_tests([str(script)]) is None
+
+    def test_nested_package_layout(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        _write(tmp_path, "packages/foo/pyproject.toml", "[project]\nname = 'foo'\n")
+        _write(tmp_path, "packages/foo/src/foo/__init__.py")
+        _write(tmp_path, "packages/foo/src/foo/core.py", "VALUE = 1\n")
+        _write(tmp_path, "packages/foo/src/foo/api.py", "from .core import VALUE\n")
+        _write(
+            tmp_path, "packages/foo/tests/test_api.py", "from foo.api import VALUE\n"
+        )
+        graph = ImportGraph(tmp_path)
+        assert graph.module_name("packages/foo/src/foo/core.py") == "foo.core"
+        edited = [str(tmp_path / "packages/foo/src/foo/core.py")]
+        assert graph.affected_tests(edited) == ["packages/foo/tests/test_api.py"]
+
+    def test_unknown_file_selects_full_suite(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        graph = ImportGraph(tmp_path)
+        assert graph.affected_tests(["/elsewhere/module.py"]) is None
+
+    def test_syntax_error_selects_full_suite(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        broken = _write(tmp_path, "src/pkg/leaf.py", "def broken(:\n")
+        assert ImportGraph(tmp_path).affected_tests([str(broken)]) is None
+
+    def test_config_change_selects_full_suite_until_accepted(
+        self, tmp_path: Path
+    ) -> None:
+        _make_project(tmp_path)
+        edited = [str(tmp_path / "src/pkg/leaf.py")]
+        ImportGraph(tmp_path).build()
+        _write(tmp_path, "pyproject.toml", "[project]\nname = 'renamed'\n")
+        graph = ImportGraph(tmp_path)
+        assert graph.affected_tests(edited) is None
+        graph.accept_config()
+        assert ImportGraph(tmp_path).affected_tests(edited) == ["tests/test_leaf.py"]
+
+    def test_cache_reparses_only_changed_files(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        ImportGraph(tmp_path).build()
+        assert (tmp_path / ".claude" / "import-graph.json").exists()
+        # Make the leaf import core; only leaf.py has to be re-parsed
+        leaf = _write(tmp_path, "src/pkg/leaf.py", "from pkg.core import VALUE\n")
+        with patch(
+            "python_claude.hooks.import_graph._parse_file",
+            return_value=(["pkg.core"], ""),
+        ) as mock_parse:
+            graph = ImportGraph(tmp_path)
+            graph.build()
+            mock_parse.assert_called_once()
+            assert mock_parse.call_args[0][0] == leaf
+        edited = [str(tmp_path / "src/pkg/core.py")]
+        affected = graph.affected_tests(edited)
+        assert affected is not None
+        assert "tests/test_leaf.py" in affected
+
+    def test_external_imports(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        _write(
+            tmp_path,
+            "src/pkg/db.py",
+            "import os\nimport numpy as np\nfrom sqlalchemy import orm\nfrom . import core\n",
+        )
+        assert ImportGraph(tmp_path).external_imports() == {
+            "os",
+            "numpy",
+            "sqlalchemy",
+            "sqlalchemy.orm",
+        }
+
+
+class TestPytestHookAffected:
+    def test_runs_only_affected_tests(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        hook_input = HookInput(session_id=None, tool_input={}, raw={})
+        env = {
+            "CLAUDE_PROJECT_DIR": str(tmp_path),
+            "PYTHON_CLAUDE_PYTEST_AFFECTED": "1",
+        }
+        with patch.dict(os.environ, env):
+            hook = PytestHook(hook_input)
+            hook.edits.record(f"{tmp_path / 'src/pkg/leaf.py'}")
+            mock_result = MagicMock(returncode=0)
+            with patch(
+                "python_claude.hooks.base.run_process", return_value=mock_result
+            ) as mock_run:
+                assert hook.run() == 0
+                args = mock_run.call_args[0][0]
+                assert args == ["uv", "run", "pytest", "tests/test_leaf.py"]
+
+    def test_skips_when_no_tests_affected(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        unused = _write(tmp_path, "src/pkg/unused.py")
+        _write(tmp_path, "src/pkg/__main__.py", "from pkg import unused\n")
+        hook_input = HookInput(session_id=None, tool_input={}, raw={})
+        env = {
+            "CLAUDE_PROJECT_DIR": str(tmp_path),
+            "PYTHON_CLAUDE_PYTEST_AFFECTED": "1",
+        }
+        with patch.dict(os.environ, env):
+            hook = PytestHook(hook_input)
+            hook.edits.record(f"{unused}")
+            with patch("python_claude.hooks.base.run_process") as mock_run:
+                assert hook.run() == 0
+                mock_run.assert_not_called()
+            assert hook.edits.pending(hook.name).files == []
+
+    def test_falls_back_to_full_suite(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        conftest = _write(tmp_path, "tests/conftest.py")
+        hook_input = HookInput(session_id=None, tool_input={}, raw={})
+        env = {
+            "CLAUDE_PROJECT_DIR": str(tmp_path),
+            "PYTHON_CLAUDE_PYTEST_AFFECTED": "1",
+        }
+        with patch.dict(os.environ, env):
+            hook = PytestHook(hook_input)
+            hook.edits.record(f"{conftest}")
+            mock_result = MagicMock(returncode=0)
+            with patch(
+                "python_claude.hooks.base.run_process", return_value=mock_result
+            ) as mock_run:
+                assert hook.run() == 0
+                assert mock_run.call_args[0][0] == ["uv", "run", "pytest"]
@@ -0,0 +1,64 @@
+"""Tests for the buffered hook logger."""
+
+import gzip
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+from python_claude.hooks.base import HookInput
+from python_claude.hooks.config import load_config
+from python_claude.hooks.edited_hook import EditedHook
+from python_claude.hooks.logger import HookLogger, rotate
+
+
+class TestHookLogger:
+    def test_buffers_until_flush(self, tmp_path: Path) -> None:
+        log_file = tmp_path / "hooks.log"
+        logger = HookLogger("mypy", lambda: log_file, lambda: load_config(tmp_path))
+        logger.log("first")
+        logger.log("second")
+        assert not log_file.exists()
+        logger.flush()
+        lines = log_file.read_text().splitlines()
+        assert len(lines) == 2
+        assert lines[0].endswith("[INFO] [mypy] first")
+
+    def test_level_filter(self, tmp_path: Path) -> None:
+        log_file = tmp_path / "hooks.log"
+        with patch.dict(os.environ, {"PYTHON_CLAUDE_LOG_LEVEL": "warning"}):
+            logger = HookLogger("mypy", lambda: log_file, lambda: load_config(tmp_path))
+            logger.log("routine")
+            logger.log("trouble", "warning")
+            logger.flush()
+        assert log_file.read_text().count("\n") == 1
+        assert "[WARNING] [mypy] trouble" in log_file.read_text()
+
+    def test_debug_messages_do_no_io(self, tmp_path: Path) -> None:
+        hook_input = HookInput(
+            session_id=None, tool_input={"file_path": "/a/b.py"}, raw={}
+        )
+        with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
+            hook = EditedHook(hook_input)
+            hook.log("/a/b.py", "debug")
+            hook.flush_log()
+        assert not (tmp_path / ".claude").exists()
+
+    def test_rotates_when_too_large(self, tmp_path: Path) -> None:
+        log_file = tmp_path / "hooks.log"
+        log_file.write_text("old\n")
+        with patch.dict(os.environ, {"PYTHON_CLAUDE_LOG_MAX_BYTES": "10"}):
+            logger = HookLogger("mypy", lambda: log_file, lambda: load_config(tmp_path))
+            logger.log("a message that does not fit")
+            logger.flush()
+        assert gzip.decompress((tmp_path / "hooks.log.1.gz").read_bytes()) == b"old\n"
+        assert "does not fit" in log_file.read_text()
+
+    def test_rotate_keeps_limited_backups(self, tmp_path: Path) -> None:
+        log_file = tmp_path / "hooks.log"
+        for i in range(5):
+            log_file.write_text(f"{i}\n")
+            rotate(log_file, backups=3)
+        backups = sorted(p.name for p in tmp_path.iterdir())
+        assert backups == ["hooks.log.1.gz", "hooks.log.2.gz", "hooks.log.3.gz"]
+        assert gzip.decompress((tmp_path / "hooks.log.1.gz").read_bytes()) == b"4\n"
+        assert gzip.decompress((tmp_path / "hooks.log.3.gz").read_bytes()) == b"2\n"
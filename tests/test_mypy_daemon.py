@@ -0,0 +1,166 @@
+"""Tests for the dmypy daemon backend."""
+
+import os
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from python_claude.hooks.base import HookInput
+from python_claude.hooks.mypy_hook import MypyHook
+from python_claude.hooks.session_end_hook import SessionEndHook
+
+
+def _stop_input() -> HookInput:
+    return HookInput(session_id="abc123", tool_input={}, raw={})
+
+
+class FakeTools:
+    """Records tool invocations and answers with configured exit codes."""
+
+    def __init__(self, **exit_codes: int) -> None:
+        self.calls: list[list[str]] = []
+        self.exit_codes = exit_codes
+
+    def __call__(self, args: list[str], **kwargs: Any) -> MagicMock:
+        self.calls.append(args)
+        if args[2] == "dmypy":
+            command = args[5]
+            if command == "start":
+                Path(args[4]).write_text("{}")
+            return MagicMock(returncode=self.exit_codes.get(command, 0))
+        return MagicMock(returncode=self.exit_codes.get(args[2], 0))
+
+    def commands(self) -> list[str]:
+        return [a[5] if a[2] == "dmypy" else a[2] for a in self.calls]
+
+
+class TestMypyDaemon:
+    def test_first_run_starts_daemon_and_checks_project(self, tmp_path: Path) -> None:
+        env = {"CLAUDE_PROJECT_DIR": str(tmp_path), "PYTHON_CLAUDE_MYPY_DAEMON": "1"}
+        with patch.dict(os.environ, env):
+            hook = MypyHook(_stop_input())
+            hook.edits.record(f"{tmp_path / 'a.py'}")
+            tools = FakeTools()
+            with patch("python_claude.hooks.base.run_process", side_effect=tools):
+                assert hook.run() == 0
+            assert tools.commands() == ["start", "check"]
+            assert tools.calls[-1][-1] == "."
+            assert hook.edits.pending(hook.name).files == []
+
+    def test_daemon_exits_when_idle(self, tmp_path: Path) -> None:
+        env = {
+            "CLAUDE_PROJECT_DIR": str(tmp_path),
+            "PYTHON_CLAUDE_MYPY_DAEMON": "1",
+            "PYTHON_CLAUDE_MYPY_DAEMON_IDLE_MINUTES": "15",
+        }
+        with patch.dict(os.environ, env):
+            hook = MypyHook(_stop_input())
+            hook.edits.record(f"{tmp_path / 'a.py'}")
+            tools = FakeTools()
+            with patch("python_claude.hooks.base.run_process", side_effect=tools):
+                hook.run()
+            assert tools.calls[0][5:] == ["start", "--timeout", "900"]
+
+    def test_edited_file_without_daemon_uses_mypy(self, tmp_path: Path) -> None:
+        edited = tmp_path / "a.py"
+        env = {"CLAUDE_PROJECT_DIR": str(tmp_path), "PYTHON_CLAUDE_MYPY_DAEMON": "1"}
+        hook_input = HookInput(
+            session_id="abc123", tool_input={"file_path": str(edited)}, raw={}
+        )
+        with patch.dict(os.environ, env):
+            tools = FakeTools()
+            with patch("python_claude.hooks.base.run_process", side_effect=tools):
+                assert MypyHook(hook_input).run() == 0
+                assert tools.commands() == ["mypy"]
+                assert tools.calls[-1][-1] == str(edited)
+                # Once Stop started the daemon, edits are rechecked with it
+                stop_hook = MypyHook(_stop_input())
+                stop_hook.edits.record(str(edited))
+                stop_hook.run()
+                assert MypyHook(hook_input).run() == 0
+            assert tools.commands() == ["mypy", "start", "check", "recheck"]
+
+    def test_warm_daemon_rechecks_edited_files(self, tmp_path: Path) -> None:
+        edited = tmp_path / "a.py"
+        edited.write_text("x = 1\n")
+        deleted = tmp_path / "b.py"
+        env = {"CLAUDE_PROJECT_DIR": str(tmp_path), "PYTHON_CLAUDE_MYPY_DAEMON": "1"}
+        with patch.dict(os.environ, env):
+            hook = MypyHook(_stop_input())
+            tools = FakeTools()
+            with patch("python_claude.hooks.base.run_process", side_effect=tools):
+                hook.edits.record(f"{edited}")
+                hook.run()
+                hook.edits.record(f"{edited}")
+                hook.edits.record(f"{deleted}")
+                assert hook.run() == 0
+            assert tools.commands() == ["start", "check", "recheck"]
+            assert tools.calls[-1][5:] == [
+                "recheck",
+                "--update",
+                str(edited),
+                "--remove",
+                str(deleted),
+            ]
+
+    def test_type_errors_map_to_2(self, tmp_path: Path) -> None:
+        env = {"CLAUDE_PROJECT_DIR": str(tmp_path), "PYTHON_CLAUDE_MYPY_DAEMON": "1"}
+        with patch.dict(os.environ, env):
+            hook = MypyHook(_stop_input())
+            hook.edits.record(f"{tmp_path / 'a.py'}")
+            with patch(
+                "python_claude.hooks.base.run_process", side_effect=FakeTools(check=1)
+            ):
+                assert hook.run() == 2
+            assert hook.edits.pending(hook.name).files != []
+
+    def test_config_change_restarts_daemon(self, tmp_path: Path) -> None:
+        env = {"CLAUDE_PROJECT_DIR": str(tmp_path), "PYTHON_CLAUDE_MYPY_DAEMON": "1"}
+        with patch.dict(os.environ, env):
+            hook = MypyHook(_stop_input())
+            tools = FakeTools()
+            with patch("python_claude.hooks.base.run_process", side_effect=tools):
+                hook.edits.record(f"{tmp_path / 'a.py'}")
+                hook.run()
+                (tmp_path / "uv.lock").write_text("changed")
+                hook.edits.record(f"{tmp_path / 'a.py'}")
+                hook.run()
+            assert tools.commands() == ["start", "check", "stop", "start", "check"]
+
+    def test_dead_daemon_is_restarted(self, tmp_path: Path) -> None:
+        env = {"CLAUDE_PROJECT_DIR": str(tmp_path), "PYTHON_CLAUDE_MYPY_DAEMON": "1"}
+        with patch.dict(os.environ, env):
+            hook = MypyHook(_stop_input())
+            with patch("python_claude.hooks.base.run_process", side_effect=FakeTools()):
+                hook.edits.record(f"{tmp_path / 'a.py'}")
+                hook.run()
+            tools = FakeTools(recheck=2, status=2)
+            with patch("python_claude.hooks.base.run_process", side_effect=tools):
+                hook.edits.record(f"{tmp_path / 'a.py'}")
+                assert hook.run() == 0
+            assert tools.commands() == ["recheck", "status", "stop", "start", "check"]
+
+    def test_falls_back_to_mypy_when_daemon_fails_to_start(
+        self, tmp_path: Path
+    ) -> None:
+        env = {"CLAUDE_PROJECT_DIR": str(tmp_path), "PYTHON_CLAUDE_MYPY_DAEMON": "1"}
+        with patch.dict(os.environ, env):
+            hook = MypyHook(_stop_input())
+            hook.edits.record(f"{tmp_path / 'a.py'}")
+            tools = FakeTools(start=1)
+            with patch("python_claude.hooks.base.run_process", side_effect=tools):
+                assert hook.run() == 0
+            assert tools.commands() == ["start", "mypy"]
+
+    def test_session_end_stops_daemon(self, tmp_path: Path) -> None:
+        env = {"CLAUDE_PROJECT_DIR": str(tmp_path), "PYTHON_CLAUDE_MYPY_DAEMON": "1"}
+        with patch.dict(os.environ, env):
+            hook = MypyHook(_stop_input())
+            hook.edits.record(f"{tmp_path / 'a.py'}")
+            with patch("python_claude.hooks.base.run_process", side_effect=FakeTools()):
+                hook.run()
+            tools = FakeTools()
+            with patch("python_claude.hooks.base.run_process", side_effect=tools):
+                assert SessionEndHook(_stop_input()).run() == 0
+            assert tools.commands() == ["stop"]
+            assert not (hook.log_dir / "dmypy.json").exists()
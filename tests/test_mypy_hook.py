@@ -21,7 +21,9 @@ class TestMypyHook:
             hook = MypyHook(hook_input)
             mock_result = MagicMock()
             mock_result.returncode = 0
-            with patch("subprocess.run", return_value=mock_result) as mock_run:
+            with patch(
+                "python_claude.hooks.base.run_process", return_value=mock_result
+            ) as mock_run:
                 exit_code = hook.run()
                 assert exit_code == 0
                 mock_run.assert_called_once()
@@ -40,7 +42,9 @@ class TestMypyHook:
             hook = MypyHook(hook_input)
             mock_result = MagicMock()
             mock_result.returncode = 1
-            with patch("subprocess.run", return_value=mock_result):
+            with patch(
+                "python_claude.hooks.base.run_process", return_value=mock_result
+            ):
                 exit_code = hook.run()
                 assert exit_code == 2
 
@@ -55,7 +59,9 @@ class TestMypyHook:
             hook = MypyHook(hook_input)
             mock_result = MagicMock()
             mock_result.returncode = 3
-            with patch("subprocess.run", return_value=mock_result):
+            with patch(
+                "python_claude.hooks.base.run_process", return_value=mock_result
+            ):
                 exit_code = hook.run()
                 assert exit_code == 3
 
@@ -68,7 +74,7 @@ class TestMypyHook:
         )
         with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
             hook = MypyHook(hook_input)
-            with patch("subprocess.run") as mock_run:
+            with patch("python_claude.hooks.base.run_process") as mock_run:
                 exit_code = hook.run()
                 assert exit_code == 0
                 # Verify subprocess was not called
@@ -87,21 +93,22 @@ class TestMypyHook:
         )
         with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
             hook = MypyHook(hook_input)
-            # Create tracking file with edited files
-            hook.track_file.parent.mkdir(parents=True, exist_ok=True)
-            hook.track_file.write_text("/path/to/file.py\n")
+            # Record an edited file
+            hook.edits.record("/path/to/file.py")
 
             mock_result = MagicMock()
             mock_result.returncode = 0
-            with patch("subprocess.run", return_value=mock_result) as mock_run:
+            with patch(
+                "python_claude.hooks.base.run_process", return_value=mock_result
+            ) as mock_run:
                 exit_code = hook.run()
                 assert exit_code == 0
                 mock_run.assert_called_once()
                 # Verify it ran mypy on current directory
                 call_args = mock_run.call_args
                 assert call_args[0][0] == ["uv", "run", "mypy", "."]
-                # Verify tracking file was cleaned up on success
-                assert not hook.track_file.exists()
+                # Verify the edit was marked as done on success
+                assert hook.edits.pending(hook.name).files == []
 
     def test_stop_hook_type_errors(self, tmp_path: Path) -> None:
         """Test Stop hook with type errors (exit 1) transforms to exit code 2."""
@@ -116,13 +123,14 @@ class TestMypyHook:
         )
         with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
             hook = MypyHook(hook_input)
-            # Create tracking file with edited files
-            hook.track_file.parent.mkdir(parents=True, exist_ok=True)
-            hook.track_file.write_text("/path/to/file.py\n")
+            # Record an edited file
+            hook.edits.record("/path/to/file.py")
 
             mock_result = MagicMock()
             mock_result.returncode = 1
-            with patch("subprocess.run", return_value=mock_result):
+            with patch(
+                "python_claude.hooks.base.run_process", return_value=mock_result
+            ):
                 exit_code = hook.run()
                 assert exit_code == 2
 
@@ -139,8 +147,8 @@ class TestMypyHook:
         )
         with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
             hook = MypyHook(hook_input)
-            # Don't create tracking file
-            with patch("subprocess.run") as mock_run:
+            # Don't record any edits
+            with patch("python_claude.hooks.base.run_process") as mock_run:
                 exit_code = hook.run()
                 assert exit_code == 0
                 # Verify subprocess was not called
@@ -155,13 +163,14 @@ class TestMypyHook:
         )
         with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
             hook = MypyHook(hook_input)
-            # Create tracking file with edited files
-            hook.track_file.parent.mkdir(parents=True, exist_ok=True)
-            hook.track_file.write_text("/path/to/file.py\n")
+            # Record an edited file
+            hook.edits.record("/path/to/file.py")
 
             mock_result = MagicMock()
             mock_result.returncode = 0
-            with patch("subprocess.run", return_value=mock_result) as mock_run:
+            with patch(
+                "python_claude.hooks.base.run_process", return_value=mock_result
+            ) as mock_run:
                 exit_code = hook.run()
                 assert exit_code == 0
                 # Verify it ran mypy on current directory
@@ -181,7 +190,7 @@ class TestMypyHook:
             state.disable("mypy")
 
             hook = MypyHook(hook_input)
-            with patch("subprocess.run") as mock_run:
+            with patch("python_claude.hooks.base.run_process") as mock_run:
                 exit_code = hook.run()
                 assert exit_code == 0
                 # Verify subprocess was not called
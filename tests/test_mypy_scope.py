@@ -0,0 +1,146 @@
+"""Tests for affected-module mypy targeting."""
+
+import ast
+import os
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from python_claude.hooks.base import HookInput
+from python_claude.hooks.import_graph import interface_hash
+from python_claude.hooks.mypy_hook import MypyHook
+from python_claude.hooks.mypy_scope import MypyScope
+
+
+def _write(root: Path, rel_path: str, source: str = "") -> Path:
+    path = root / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(source)
+    return path
+
+
+def _make_project(root: Path) -> None:
+    """Create a chain of modules: app imports api, which imports core."""
+    _write(root, "pyproject.toml", "[tool.mypy]\nstrict = true\n")
+    _write(root, "pkg/__init__.py")
+    _write(root, "pkg/core.py", "def value() -> int:\n    return 1\n")
+    _write(root, "pkg/api.py", "from pkg.core import value\n")
+    _write(root, "pkg/app.py", "from pkg import api\n")
+    _write(root, "pkg/other.py", "X: int = 2\n")
+
+
+def _hash(source: str) -> str:
+    return interface_hash(ast.parse(source))
+
+
+def _accepted_scope(root: Path, depth: int | None = 1, full_every: int = 0) -> None:
+    scope = MypyScope(root, depth, full_every)
+    assert scope.targets([str(root / "pkg/other.py")]) is None
+    scope.accept(full=True)
+
+
+class TestInterfaceHash:
+    def test_ignores_function_bodies(self) -> None:
+        assert _hash("def f() -> int:\n    return 1\n") == _hash(
+            "def f() -> int:\n    return 2\n"
+        )
+
+    def test_signature_changes(self) -> None:
+        assert _hash("def f() -> int: ...\n") != _hash("def f() -> str: ...\n")
+
+    def test_ignores_private_names(self) -> None:
+        assert _hash("X = 1\n") == _hash("X = 1\ndef _helper(a): ...\n")
+
+    def test_unannotated_values_change_inferred_types(self) -> None:
+        assert _hash("X = 1\n") != _hash("X = 'one'\n")
+
+
+class TestMypyScope:
+    def test_first_run_checks_everything(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        scope = MypyScope(tmp_path, 1, 0)
+        assert scope.targets([str(tmp_path / "pkg/core.py")]) is None
+
+    def test_body_change_checks_only_edited_file(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        _accepted_scope(tmp_path)
+        core = _write(tmp_path, "pkg/core.py", "def value() -> int:\n    return 2\n")
+        assert MypyScope(tmp_path, 1, 0).targets([str(core)]) == ["pkg/core.py"]
+
+    def test_interface_change_checks_importers(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        _accepted_scope(tmp_path)
+        core = _write(tmp_path, "pkg/core.py", "def value() -> str:\n    return ''\n")
+        assert MypyScope(tmp_path, 1, 0).targets([str(core)]) == [
+            "pkg/api.py",
+            "pkg/core.py",
+        ]
+        assert MypyScope(tmp_path, None, 0).targets([str(core)]) == [
+            "pkg/api.py",
+            "pkg/app.py",
+            "pkg/core.py",
+        ]
+
+    def test_accepted_interface_becomes_baseline(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        _accepted_scope(tmp_path)
+        core = _write(tmp_path, "pkg/core.py", "def value() -> str:\n    return ''\n")
+        scope = MypyScope(tmp_path, 1, 0)
+        scope.targets([str(core)])
+        scope.accept(full=False)
+        _write(tmp_path, "pkg/core.py", "def value() -> str:\n    return 'x'\n")
+        assert MypyScope(tmp_path, 1, 0).targets([str(core)]) == ["pkg/core.py"]
+
+    def test_interface_change_checks_nested_package_importers(
+        self, tmp_path: Path
+    ) -> None:
+        _make_project(tmp_path)
+        _write(tmp_path, "packages/foo/pyproject.toml", "[project]\nname = 'foo'\n")
+        _write(tmp_path, "packages/foo/src/foo/__init__.py")
+        _write(tmp_path, "packages/foo/src/foo/core.py", "X: int = 1\n")
+        _write(tmp_path, "packages/foo/src/foo/api.py", "from foo.core import X\n")
+        _accepted_scope(tmp_path)
+        core = _write(tmp_path, "packages/foo/src/foo/core.py", "X: str = ''\n")
+        assert MypyScope(tmp_path, 1, 0).targets([str(core)]) == [
+            "packages/foo/src/foo/api.py",
+            "packages/foo/src/foo/core.py",
+        ]
+
+    def test_file_without_module_name_checks_everything(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        _accepted_scope(tmp_path)
+        script = _write(tmp_path, "scripts/build-docs/run.py", "X: int = 1\n")
+        assert MypyScope(tmp_path, 1, 0).targets([str(script)]) is None
+
+    def test_config_change_checks_everything(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        _accepted_scope(tmp_path)
+        _write(tmp_path, "pyproject.toml", "[tool.mypy]\nstrict = false\n")
+        other = str(tmp_path / "pkg/other.py")
+        assert MypyScope(tmp_path, 1, 0).targets([other]) is None
+
+    def test_periodic_full_run(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        _accepted_scope(tmp_path)
+        other = str(tmp_path / "pkg/other.py")
+        for _ in range(2):
+            scope = MypyScope(tmp_path, 1, 2)
+            assert scope.targets([other]) == ["pkg/other.py"]
+            scope.accept(full=False)
+        assert MypyScope(tmp_path, 1, 2).targets([other]) is None
+
+
+class TestMypyHookAffected:
+    def test_stop_checks_affected_files(self, tmp_path: Path) -> None:
+        _make_project(tmp_path)
+        _accepted_scope(tmp_path)
+        env = {"CLAUDE_PROJECT_DIR": str(tmp_path), "PYTHON_CLAUDE_MYPY_AFFECTED": "1"}
+        with patch.dict(os.environ, env):
+            hook = MypyHook(HookInput(session_id="abc123", tool_input={}, raw={}))
+            hook.edits.record(str(tmp_path / "pkg/other.py"))
+            with patch(
+                "python_claude.hooks.base.run_process",
+                return_value=MagicMock(returncode=0),
+            ) as run:
+                assert hook.run() == 0
+            assert run.call_args[0][0] == ["uv", "run", "mypy", "pkg/other.py"]
+            assert hook.edits.pending(hook.name).files == []
@@ -0,0 +1,135 @@
+"""Tests for failure-first pytest runs."""
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from python_claude.hooks.base import HookInput
+from python_claude.hooks.pytest_failures import FailureStore
+from python_claude.hooks.pytest_hook import PytestHook
+
+FAILED_FIRST = {"PYTHON_CLAUDE_PYTEST_FAILED_FIRST": "1"}
+COLLECTED = ["tests/test_a.py::t1", "tests/test_a.py::t2", "tests/test_b.py::t"]
+
+
+class FakePytest:
+    """Runs a fake suite, honoring -x, --deselect and node ID selection."""
+
+    def __init__(self, failing: set[str]) -> None:
+        self.failing = failing
+        self.runs: list[list[str]] = []
+
+    def __call__(self, args: list[str], **kwargs: Any) -> MagicMock:
+        options = args[5:]
+        self.runs.append(options)
+        deselected = {
+            options[i + 1] for i, arg in enumerate(options) if arg == "--deselect"
+        }
+        selectors = [
+            arg
+            for i, arg in enumerate(options)
+            if not arg.startswith("-") and options[i - 1] != "--deselect"
+        ]
+        unknown = [s for s in selectors if not any(n.startswith(s) for n in COLLECTED)]
+        selected = [
+            n
+            for n in COLLECTED
+            if n not in deselected
+            and (not selectors or any(n.startswith(s) for s in selectors))
+        ]
+        tests: dict[str, dict[str, Any]] = {}
+        for nodeid in [] if unknown else selected:
+            failed = nodeid in self.failing
+            tests[nodeid] = {
+                "duration": 0.1,
+                "outcome": "failed" if failed else "passed",
+            }
+            if failed and "-x" in options:
+                break
+        report_path = Path(kwargs["env"]["PYTHON_CLAUDE_PYTEST_REPORT"])
+        report_path.write_text(json.dumps({"tests": tests}))
+        if unknown:
+            return MagicMock(returncode=4)
+        if not selected:
+            return MagicMock(returncode=5)
+        failed = any(t["outcome"] == "failed" for t in tests.values())
+        return MagicMock(returncode=1 if failed else 0)
+
+
+def _run(tmp_path: Path, fake: Any) -> int:
+    hook = PytestHook(HookInput(session_id="abc123", tool_input={}, raw={}))
+    hook.edits.record("/path/to/file.py")
+    with patch("python_claude.hooks.base.run_process", side_effect=fake):
+        return hook.run()
+
+
+def _store(tmp_path: Path) -> FailureStore:
+    return FailureStore(tmp_path / ".claude" / "debug" / "sessions" / "abc123")
+
+
+class TestFailedFirst:
+    def test_records_failures_of_full_run(self, tmp_path: Path) -> None:
+        with patch.dict(
+            os.environ, {**FAILED_FIRST, "CLAUDE_PROJECT_DIR": str(tmp_path)}
+        ):
+            fake = FakePytest(failing={"tests/test_a.py::t2"})
+            assert _run(tmp_path, fake) == 2
+        assert fake.runs == [[]]
+        assert _store(tmp_path).load() == ["tests/test_a.py::t2"]
+
+    def test_reruns_only_failed_tests_while_they_fail(self, tmp_path: Path) -> None:
+        failed = ["tests/test_a.py::t2", "tests/test_b.py::t"]
+        _store(tmp_path).save(failed)
+        with patch.dict(
+            os.environ, {**FAILED_FIRST, "CLAUDE_PROJECT_DIR": str(tmp_path)}
+        ):
+            fake = FakePytest(failing={"tests/test_a.py::t2"})
+            assert _run(tmp_path, fake) == 2
+        assert fake.runs == [["-x", *failed]]
+        # The test stopped by -x hasn't passed yet, so it stays recorded
+        assert _store(tmp_path).load() == failed
+
+    def test_runs_remaining_tests_once_failed_pass(self, tmp_path: Path) -> None:
+        _store(tmp_path).save(["tests/test_a.py::t2"])
+        with patch.dict(
+            os.environ, {**FAILED_FIRST, "CLAUDE_PROJECT_DIR": str(tmp_path)}
+        ):
+            fake = FakePytest(failing={"tests/test_b.py::t"})
+            assert _run(tmp_path, fake) == 2
+        assert fake.runs == [
+            ["-x", "tests/test_a.py::t2"],
+            ["--deselect", "tests/test_a.py::t2"],
+        ]
+        assert _store(tmp_path).load() == ["tests/test_b.py::t"]
+
+    def test_passes_when_failed_tests_were_all_selected(self, tmp_path: Path) -> None:
+        _store(tmp_path).save(COLLECTED)
+        with patch.dict(
+            os.environ, {**FAILED_FIRST, "CLAUDE_PROJECT_DIR": str(tmp_path)}
+        ):
+            assert _run(tmp_path, FakePytest(failing=set())) == 0
+        assert _store(tmp_path).load() == []
+
+    def test_forgets_failed_tests_that_no_longer_exist(self, tmp_path: Path) -> None:
+        _store(tmp_path).save(["tests/test_gone.py::t"])
+        with patch.dict(
+            os.environ, {**FAILED_FIRST, "CLAUDE_PROJECT_DIR": str(tmp_path)}
+        ):
+            fake = FakePytest(failing=set())
+            assert _run(tmp_path, fake) == 0
+        assert fake.runs == [["-x", "tests/test_gone.py::t"], []]
+
+    def test_falls_back_without_plugin(self, tmp_path: Path) -> None:
+        with patch.dict(
+            os.environ, {**FAILED_FIRST, "CLAUDE_PROJECT_DIR": str(tmp_path)}
+        ):
+            hook = PytestHook(HookInput(session_id="abc123", tool_input={}, raw={}))
+            hook.edits.record("/path/to/file.py")
+            with patch(
+                "python_claude.hooks.base.run_process",
+                return_value=MagicMock(returncode=1),
+            ) as run:
+                assert hook.run() == 2
+            assert run.call_args[0][0] == ["uv", "run", "pytest"]
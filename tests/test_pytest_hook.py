@@ -15,30 +15,32 @@ class TestPytestHook:
         hook_input = HookInput(session_id=None, tool_input={}, raw={})
         with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
             hook = PytestHook(hook_input)
-            # Create tracking file with edited files
-            hook.track_file.parent.mkdir(parents=True, exist_ok=True)
-            hook.track_file.write_text("/path/to/file.py\n")
+            # Record an edited file
+            hook.edits.record("/path/to/file.py")
 
             mock_result = MagicMock()
             mock_result.returncode = 0
-            with patch("subprocess.run", return_value=mock_result):
+            with patch(
+                "python_claude.hooks.base.run_process", return_value=mock_result
+            ):
                 exit_code = hook.run()
                 assert exit_code == 0
-                # Verify tracking file was cleaned up on success
-                assert not hook.track_file.exists()
+                # Verify the edit was marked as done on success
+                assert hook.edits.pending(hook.name).files == []
 
     def test_pytest_test_failures(self, tmp_path: Path) -> None:
         """Test that exit code 1 (test failures) is transformed to exit code 2."""
         hook_input = HookInput(session_id=None, tool_input={}, raw={})
         with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
             hook = PytestHook(hook_input)
-            # Create tracking file with edited files
-            hook.track_file.parent.mkdir(parents=True, exist_ok=True)
-            hook.track_file.write_text("/path/to/file.py\n")
+            # Record an edited file
+            hook.edits.record("/path/to/file.py")
 
             mock_result = MagicMock()
             mock_result.returncode = 1
-            with patch("subprocess.run", return_value=mock_result):
+            with patch(
+                "python_claude.hooks.base.run_process", return_value=mock_result
+            ):
                 exit_code = hook.run()
                 assert exit_code == 2
 
@@ -47,13 +49,14 @@ class TestPytestHook:
         hook_input = HookInput(session_id=None, tool_input={}, raw={})
         with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
             hook = PytestHook(hook_input)
-            # Create tracking file with edited files
-            hook.track_file.parent.mkdir(parents=True, exist_ok=True)
-            hook.track_file.write_text("/path/to/file.py\n")
+            # Record an edited file
+            hook.edits.record("/path/to/file.py")
 
             mock_result = MagicMock()
             mock_result.returncode = 3
-            with patch("subprocess.run", return_value=mock_result):
+            with patch(
+                "python_claude.hooks.base.run_process", return_value=mock_result
+            ):
                 exit_code = hook.run()
                 assert exit_code == 3
 
@@ -62,13 +65,14 @@ class TestPytestHook:
         hook_input = HookInput(session_id=None, tool_input={}, raw={})
         with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
             hook = PytestHook(hook_input)
-            # Create tracking file with edited files
-            hook.track_file.parent.mkdir(parents=True, exist_ok=True)
-            hook.track_file.write_text("/path/to/file.py\n")
+            # Record an edited file
+            hook.edits.record("/path/to/file.py")
 
             mock_result = MagicMock()
             mock_result.returncode = 5
-            with patch("subprocess.run", return_value=mock_result):
+            with patch(
+                "python_claude.hooks.base.run_process", return_value=mock_result
+            ):
                 exit_code = hook.run()
                 assert exit_code == 5
 
@@ -77,8 +81,8 @@ class TestPytestHook:
         hook_input = HookInput(session_id=None, tool_input={}, raw={})
         with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
             hook = PytestHook(hook_input)
-            # Don't create tracking file
-            with patch("subprocess.run") as mock_run:
+            # Don't record any edits
+            with patch("python_claude.hooks.base.run_process") as mock_run:
                 exit_code = hook.run()
                 assert exit_code == 0
                 # Verify subprocess was not called
@@ -93,7 +97,7 @@ class TestPytestHook:
             state.disable("pytest")
 
             hook = PytestHook(hook_input)
-            with patch("subprocess.run") as mock_run:
+            with patch("python_claude.hooks.base.run_process") as mock_run:
                 exit_code = hook.run()
                 assert exit_code == 0
                 # Verify subprocess was not called
@@ -0,0 +1,31 @@
+"""Tests for the reporting pytest plugin."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+
+class TestPytestPlugin:
+    def test_reports_collection_and_outcomes(self, tmp_path: Path) -> None:
+        (tmp_path / "test_sample.py").write_text(
+            "def test_pass():\n    pass\n\ndef test_fail():\n    assert False\n"
+        )
+        report = tmp_path / "report.json"
+        env = {**os.environ, "PYTHON_CLAUDE_PYTEST_REPORT": str(report)}
+        result = subprocess.run(
+            [sys.executable, "-m", "pytest", "-p", "python_claude.pytest_plugin"],
+            check=False,
+            cwd=tmp_path,
+            env=env,
+            capture_output=True,
+        )
+        assert result.returncode == 1
+        data = json.loads(report.read_text())
+        assert data["collected"] == [
+            "test_sample.py::test_pass",
+            "test_sample.py::test_fail",
+        ]
+        assert data["tests"]["test_sample.py::test_pass"]["outcome"] == "passed"
+        assert data["tests"]["test_sample.py::test_fail"]["outcome"] == "failed"
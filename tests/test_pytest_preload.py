@@ -0,0 +1,215 @@
+"""Tests for running pytest in the warm worker."""
+
+import os
+import signal
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from python_claude.hooks.background import lock_holder
+from python_claude.hooks.base import Cancelled, HookInput
+from python_claude.hooks.pytest_hook import PytestHook
+from python_claude.hooks.pytest_preload import (
+    dependency_key,
+    lock_file,
+    preload_modules,
+    socket_file,
+)
+from python_claude.pytest_worker import preload
+
+SESSION = HookInput(session_id="s1", tool_input={}, raw={})
+posix_only = pytest.mark.skipif(os.name == "nt", reason="Unix sockets and fork")
+
+
+def _local_tool(args: list[str]) -> tuple[list[str], dict[str, str]]:
+    """Run `uv run` commands with this interpreter, which has pytest installed."""
+    tool, rest = args[2], args[3:]
+    if tool == "python":
+        return [sys.executable, *rest], {}
+    return [sys.executable, "-m", tool, *rest], {}
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Iterator[Path]:
+    """A project whose tests import a dependency that records its imports."""
+    deps = tmp_path / "deps"
+    deps.mkdir()
+    (deps / "slowdep.py").write_text(
+        "import os\n"
+        "with open(os.path.join(os.path.dirname(__file__), 'imports'), 'a') as f:\n"
+        "    f.write(f'{os.getpid()}\\n')\n"
+    )
+    root = tmp_path / "project"
+    (root / "tests").mkdir(parents=True)
+    (root / "tests" / "test_app.py").write_text(
+        "import slowdep\n\ndef test_app():\n    assert slowdep\n"
+    )
+    env = {
+        "CLAUDE_PROJECT_DIR": str(root),
+        "PYTHONPATH": str(deps),
+        "PYTHON_CLAUDE_PYTEST_PRELOAD": "1",
+        "PYTHON_CLAUDE_SNAPSHOT_ENABLED": "0",
+    }
+    with (
+        patch.dict(os.environ, env),
+        patch.object(PytestHook, "tool_command", side_effect=_local_tool),
+    ):
+        yield root
+    pid = lock_holder(lock_file(root))
+    if pid is not None:
+        os.kill(pid, signal.SIGTERM)
+
+
+def _run(root: Path) -> tuple[int, str]:
+    hook = PytestHook(SESSION)
+    hook.edits.record(str(root / "tests" / "test_app.py"))
+    exit_code = hook.run()
+    hook.flush_log()
+    return exit_code, hook.log_file.read_text()
+
+
+def _wait_for_worker(root: Path) -> None:
+    deadline = time.monotonic() + 30
+    while not socket_file(root).exists():
+        assert time.monotonic() < deadline, "worker didn't start"
+        time.sleep(0.05)
+
+
+def _imports(root: Path) -> list[str]:
+    return (root.parent / "deps" / "imports").read_text().split()
+
+
+@posix_only
+class TestPreload:
+    def test_runs_in_worker_with_dependencies_imported_once(
+        self, project: Path
+    ) -> None:
+        exit_code, log = _run(project)
+        assert exit_code == 0
+        assert "Ran pytest in the warm worker" not in log
+        _wait_for_worker(project)
+
+        exit_code, log = _run(project)
+        assert exit_code == 0
+        assert "Ran pytest in the warm worker" in log
+        exit_code, _ = _run(project)
+        assert exit_code == 0
+        # Once by the first run and once by the worker, for every later run
+        assert len(_imports(project)) == 2
+
+    def test_reports_failures_from_worker(self, project: Path) -> None:
+        _run(project)
+        _wait_for_worker(project)
+        test_file = project / "tests" / "test_app.py"
+        test_file.write_text("import slowdep\n\ndef test_app():\n    assert False\n")
+        exit_code, log = _run(project)
+        assert exit_code == 2
+        assert "Ran pytest in the warm worker" in log
+        output = (project / ".claude/debug/sessions/s1/output/pytest.log").read_text()
+        assert "1 failed" in output
+
+    def test_cancel_stops_the_run(self, project: Path) -> None:
+        _run(project)
+        _wait_for_worker(project)
+        pid_file = project / "pid"
+        test_file = project / "tests" / "test_app.py"
+        test_file.write_text(
+            "import os\nimport time\n\nimport slowdep\n\n"
+            "def test_app():\n"
+            f"    open({str(pid_file)!r}, 'w').write(str(os.getpid()))\n"
+            "    time.sleep(60)\n"
+        )
+        hook = PytestHook(SESSION)
+        hook.edits.record(str(test_file))
+        hook.cancel = threading.Event()
+
+        def cancel_once_running() -> None:
+            while not pid_file.exists() or not pid_file.read_text():
+                time.sleep(0.05)
+            assert hook.cancel is not None
+            hook.cancel.set()
+
+        threading.Thread(target=cancel_once_running, daemon=True).start()
+        start = time.monotonic()
+        with pytest.raises(Cancelled):
+            hook.run()
+        assert time.monotonic() - start < 30
+        pid = int(pid_file.read_text())
+        deadline = time.monotonic() + 5
+        with pytest.raises(ProcessLookupError):
+            while time.monotonic() < deadline:
+                os.kill(pid, 0)
+                time.sleep(0.05)
+
+    def test_restarts_when_dependencies_change(self, project: Path) -> None:
+        _run(project)
+        _wait_for_worker(project)
+        first_worker = lock_holder(lock_file(project))
+        (project.parent / "deps" / "otherdep.py").write_text("")
+        (project / "tests" / "test_other.py").write_text("import otherdep\n")
+        exit_code, log = _run(project)
+        assert exit_code == 0
+        assert "Ran pytest in the warm worker" not in log
+        assert log.count("Starting the pytest worker") == 2
+        deadline = time.monotonic() + 30
+        while lock_holder(lock_file(project)) in (None, first_worker):
+            assert time.monotonic() < deadline, "worker didn't restart"
+            time.sleep(0.05)
+
+
+class TestDependencyKey:
+    def test_third_party_imports_only(self, tmp_path: Path) -> None:
+        (tmp_path / "app.py").write_text("import os\nimport numpy\nimport app\n")
+        assert preload_modules(tmp_path) == ["numpy"]
+
+    def test_project_modules_not_preloaded(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        project = tmp_path / "project"
+        deps = tmp_path / "deps"
+        for directory, name in ((project / "src", "localpkg"), (deps, "outsidepkg")):
+            (directory / name).mkdir(parents=True)
+            (directory / name / "__init__.py").write_text("")
+        monkeypatch.syspath_prepend(str(project / "src"))
+        monkeypatch.syspath_prepend(str(deps))
+        for name in ("localpkg", "outsidepkg"):
+            monkeypatch.delitem(sys.modules, name, raising=False)
+        assert preload(["localpkg", "outsidepkg"], project) == 1
+        assert "localpkg" not in sys.modules
+        assert "outsidepkg" in sys.modules
+        del sys.modules["outsidepkg"]
+
+    def test_nested_package_modules_are_local(self, tmp_path: Path) -> None:
+        package = tmp_path / "packages" / "foo"
+        (package / "src" / "foo").mkdir(parents=True)
+        (package / "pyproject.toml").write_text("[project]\nname = 'foo'\n")
+        (package / "src" / "foo" / "core.py").write_text("import numpy\n")
+        (tmp_path / "app.py").write_text("import foo.core\n")
+        assert preload_modules(tmp_path) == ["numpy"]
+
+    def test_changes_with_lock_file(self, tmp_path: Path) -> None:
+        before = dependency_key(tmp_path, ["numpy"])
+        (tmp_path / "uv.lock").write_text("version = 1\n")
+        assert dependency_key(tmp_path, ["numpy"]) != before
+        assert dependency_key(tmp_path, ["pandas"]) != dependency_key(
+            tmp_path, ["numpy"]
+        )
+
+    def test_disabled_by_default(self, tmp_path: Path) -> None:
+        with (
+            patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}),
+            patch(
+                "python_claude.hooks.base.run_process",
+                return_value=MagicMock(returncode=0),
+            ),
+            patch("python_claude.hooks.pytest_preload.start_worker") as start,
+        ):
+            hook = PytestHook(SESSION)
+            hook.edits.record(str(tmp_path / "app.py"))
+            assert hook.run() == 0
+        start.assert_not_called()
@@ -0,0 +1,155 @@
+"""Tests for parallel pytest shards."""
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from python_claude.hooks.base import HookInput
+from python_claude.hooks.pytest_failures import FailureStore
+from python_claude.hooks.pytest_hook import PytestHook
+from python_claude.hooks.pytest_shards import (
+    DurationStore,
+    compact,
+    partition,
+    resolve_workers,
+)
+
+
+class FakePytest:
+    """Stands in for pytest runs that write the plugin's JSON report."""
+
+    def __init__(self, collected: list[str], failing: set[str] | None = None):
+        self.collected = collected
+        self.failing = failing or set()
+        self.runs: list[list[str]] = []
+
+    def __call__(self, args: list[str], **kwargs: Any) -> MagicMock:
+        report_path = Path(kwargs["env"]["PYTHON_CLAUDE_PYTEST_REPORT"])
+        if "--collect-only" in args:
+            report_path.write_text(json.dumps({"collected": self.collected}))
+            return MagicMock(returncode=0)
+        selected = args[5:]
+        self.runs.append(selected)
+        tests = {
+            nodeid: {
+                "duration": 1.0,
+                "outcome": "failed" if nodeid in self.failing else "passed",
+            }
+            for nodeid in self.collected
+            if nodeid in selected or nodeid.split("::")[0] in selected
+        }
+        report_path.write_text(json.dumps({"tests": tests}))
+        failed = any(t["outcome"] == "failed" for t in tests.values())
+        return MagicMock(returncode=1 if failed else 0)
+
+
+class TestPartition:
+    def test_balances_by_duration(self) -> None:
+        nodeids = ["t::slow", "t::a", "t::b", "t::c"]
+        durations = {"t::slow": 3.0, "t::a": 1.0, "t::b": 1.0, "t::c": 1.0}
+        shards = partition(nodeids, durations, 2)
+        assert sorted(shards) == [["t::a", "t::b", "t::c"], ["t::slow"]]
+
+    def test_keeps_collection_order_within_shard(self) -> None:
+        nodeids = ["t::a", "t::b", "t::c", "t::d"]
+        durations = {"t::d": 1.0, "t::a": 0.5, "t::c": 0.5}
+        shards = partition(nodeids, durations, 1)
+        assert shards == [nodeids]
+
+    def test_never_creates_empty_shards(self) -> None:
+        assert partition(["t::a"], {}, 8) == [["t::a"]]
+
+    def test_compact_uses_whole_files(self) -> None:
+        collected = ["a.py::x", "a.py::y", "b.py::x", "b.py::y"]
+        assert compact(["a.py::x", "a.py::y", "b.py::x"], collected) == [
+            "a.py",
+            "b.py::x",
+        ]
+
+    def test_resolve_workers(self) -> None:
+        assert resolve_workers("4") == 4
+        assert resolve_workers("0") == 1
+        assert resolve_workers("bogus") == 1
+        assert resolve_workers("auto") == (os.cpu_count() or 1)
+
+
+class TestPytestHookParallel:
+    def _hook(self) -> PytestHook:
+        hook = PytestHook(HookInput(session_id=None, tool_input={}, raw={}))
+        hook.edits.record("/path/to/file.py")
+        return hook
+
+    def test_runs_shards_and_records_durations(self, tmp_path: Path) -> None:
+        collected = ["tests/test_a.py::t1", "tests/test_a.py::t2", "tests/test_b.py::t"]
+        env = {"CLAUDE_PROJECT_DIR": str(tmp_path), "PYTHON_CLAUDE_PYTEST_WORKERS": "2"}
+        with patch.dict(os.environ, env):
+            hook = self._hook()
+            fake = FakePytest(collected)
+            with patch("python_claude.hooks.base.run_process", side_effect=fake):
+                assert hook.run() == 0
+            assert len(fake.runs) == 2
+            assert DurationStore(tmp_path).load() == dict.fromkeys(collected, 1.0)
+            assert hook.edits.pending(hook.name).files == []
+
+    def test_merges_failures_and_maps_exit_code(self, tmp_path: Path) -> None:
+        collected = ["tests/test_a.py::t", "tests/test_b.py::t"]
+        env = {"CLAUDE_PROJECT_DIR": str(tmp_path), "PYTHON_CLAUDE_PYTEST_WORKERS": "2"}
+        with patch.dict(os.environ, env):
+            hook = self._hook()
+            fake = FakePytest(collected, failing={"tests/test_b.py::t"})
+            with patch("python_claude.hooks.base.run_process", side_effect=fake):
+                assert hook.run() == 2
+            assert hook.edits.pending(hook.name).files != []
+
+    def test_falls_back_to_serial_without_plugin(self, tmp_path: Path) -> None:
+        env = {"CLAUDE_PROJECT_DIR": str(tmp_path), "PYTHON_CLAUDE_PYTEST_WORKERS": "2"}
+        with patch.dict(os.environ, env):
+            hook = self._hook()
+            with patch(
+                "python_claude.hooks.base.run_process",
+                return_value=MagicMock(returncode=4),
+            ) as run:
+                assert hook.run() == 4
+            assert run.call_count == 2
+            assert run.call_args[0][0] == ["uv", "run", "pytest"]
+
+    def test_logs_serial_fallback_once(self, tmp_path: Path) -> None:
+        env = {
+            "CLAUDE_PROJECT_DIR": str(tmp_path),
+            "PYTHON_CLAUDE_PYTEST_FAILED_FIRST": "1",
+            "PYTHON_CLAUDE_PYTEST_WORKERS": "2",
+        }
+        with patch.dict(os.environ, env):
+            hook = self._hook()
+            with patch(
+                "python_claude.hooks.base.run_process",
+                return_value=MagicMock(returncode=4),
+            ) as run:
+                assert hook.run() == 4
+            assert run.call_args[0][0] == ["uv", "run", "pytest"]
+            hook.flush_log()
+        assert hook.log_file.read_text().count("plugin unavailable") == 1
+
+    def test_shards_when_failed_first_rerun_has_no_report(self, tmp_path: Path) -> None:
+        collected = ["tests/test_a.py::t", "tests/test_b.py::t"]
+        env = {
+            "CLAUDE_PROJECT_DIR": str(tmp_path),
+            "PYTHON_CLAUDE_PYTEST_FAILED_FIRST": "1",
+            "PYTHON_CLAUDE_PYTEST_WORKERS": "2",
+        }
+        with patch.dict(os.environ, env):
+            hook = self._hook()
+            FailureStore(hook.state_dir).save(["tests/test_a.py::t"])
+            fake = FakePytest(collected)
+
+            def run(args: list[str], **kwargs: Any) -> MagicMock:
+                if "-x" in args:
+                    # pytest crashed before the plugin wrote its report
+                    return MagicMock(returncode=3)
+                return fake(args, **kwargs)
+
+            with patch("python_claude.hooks.base.run_process", side_effect=run):
+                assert hook.run() == 0
+        assert len(fake.runs) == 2
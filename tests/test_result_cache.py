@@ -0,0 +1,164 @@
+"""Tests for the check result cache."""
+
+import os
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+from python_claude.hooks.base import HookInput
+from python_claude.hooks.mypy_hook import MypyHook
+from python_claude.hooks.pytest_hook import PytestHook
+from python_claude.hooks.result_cache import ResultCache
+from python_claude.hooks.ruff_check_hook import RuffCheckHook
+from python_claude.hooks.ruff_format_hook import RuffFormatHook
+
+
+def _stop_input() -> HookInput:
+    return HookInput(session_id="abc123", tool_input={}, raw={})
+
+
+class TestResultCache:
+    def test_put_and_get(self, tmp_path: Path) -> None:
+        cache = ResultCache(tmp_path)
+        assert cache.get("key") is None
+        cache.put("key", 1, "error\n")
+        hit = cache.get("key")
+        assert hit is not None
+        assert (hit.exit_code, hit.output) == (1, "error\n")
+
+    def test_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        cache = ResultCache(tmp_path, max_bytes=160)
+        cache.put("old", 0, "x" * 40)
+        cache.put("used", 0, "x" * 40)
+        os.utime(cache.cache_dir / "old.json", (0, 0))
+        os.utime(cache.cache_dir / "used.json", (1, 1))
+        cache.get("used")
+        cache.put("new", 0, "x" * 40)
+        assert cache.get("old") is None
+        assert cache.get("used") is not None
+        assert cache.get("new") is not None
+
+    def test_tree_key_tracks_contents(self, tmp_path: Path) -> None:
+        module = tmp_path / "module.py"
+        module.write_text("x = 1\n")
+        cache = ResultCache(tmp_path)
+        key = cache.tree_key("mypy", ["."], ["pyproject.toml"])
+        assert ResultCache(tmp_path).tree_key("mypy", ["."], ["pyproject.toml"]) == key
+        module.write_text("x = 2\n")
+        changed = ResultCache(tmp_path).tree_key("mypy", ["."], ["pyproject.toml"])
+        assert changed != key
+        # Reverting the edit restores the original key
+        module.write_text("x = 1\n")
+        assert ResultCache(tmp_path).tree_key("mypy", ["."], ["pyproject.toml"]) == key
+
+    def test_config_is_part_of_key(self, tmp_path: Path) -> None:
+        (tmp_path / "module.py").write_text("x = 1\n")
+        key = ResultCache(tmp_path).tree_key("mypy", ["."], ["pyproject.toml"])
+        (tmp_path / "pyproject.toml").write_text("[tool.mypy]\nstrict = true\n")
+        assert ResultCache(tmp_path).tree_key("mypy", ["."], ["pyproject.toml"]) != key
+
+
+class TestHooksUseCache:
+    def test_mypy_replays_failure(self, tmp_path: Path) -> None:
+        (tmp_path / "module.py").write_text("x: int = 'a'\n")
+        env = {"CLAUDE_PROJECT_DIR": str(tmp_path), "PYTHON_CLAUDE_CACHE_ENABLED": "1"}
+        with patch.dict(os.environ, env):
+            hook = MypyHook(_stop_input())
+            hook.edits.record(f"{tmp_path / 'module.py'}")
+            with patch(
+                "python_claude.hooks.base.run_process",
+                return_value=MagicMock(returncode=1),
+            ):
+                assert hook.run() == 2
+            with patch("python_claude.hooks.base.run_process") as mock_run:
+                assert MypyHook(_stop_input()).run() == 2
+                mock_run.assert_not_called()
+
+    def test_pytest_skips_unchanged_tree(self, tmp_path: Path) -> None:
+        module = tmp_path / "module.py"
+        module.write_text("x = 1\n")
+        env = {"CLAUDE_PROJECT_DIR": str(tmp_path), "PYTHON_CLAUDE_CACHE_ENABLED": "1"}
+        with patch.dict(os.environ, env):
+            hook = PytestHook(_stop_input())
+            hook.edits.record(f"{module}")
+            with patch(
+                "python_claude.hooks.base.run_process",
+                return_value=MagicMock(returncode=0),
+            ):
+                assert hook.run() == 0
+
+            hook.edits.record(f"{module}")
+            with patch("python_claude.hooks.base.run_process") as mock_run:
+                assert hook.run() == 0
+                mock_run.assert_not_called()
+            assert hook.edits.pending(hook.name).files == []
+
+            module.write_text("x = 2\n")
+            hook.edits.record(f"{module}")
+            with patch(
+                "python_claude.hooks.base.run_process",
+                return_value=MagicMock(returncode=0),
+            ) as run:
+                assert hook.run() == 0
+                run.assert_called_once()
+
+    def test_ruff_check_skips_clean_files(self, tmp_path: Path) -> None:
+        clean = tmp_path / "clean.py"
+        clean.write_text("x = 1\n")
+        edited = tmp_path / "edited.py"
+        edited.write_text("y = 1\n")
+        env = {"CLAUDE_PROJECT_DIR": str(tmp_path), "PYTHON_CLAUDE_CACHE_ENABLED": "1"}
+        with patch.dict(os.environ, env):
+            hook = RuffCheckHook(_stop_input())
+            hook.edits.record(f"{clean}")
+            hook.edits.record(f"{edited}")
+            with patch(
+                "python_claude.hooks.base.run_process",
+                return_value=MagicMock(returncode=0),
+            ):
+                assert hook.run() == 0
+
+            edited.write_text("y = 2\n")
+            hook.edits.record(f"{clean}")
+            hook.edits.record(f"{edited}")
+            with patch(
+                "python_claude.hooks.base.run_process",
+                return_value=MagicMock(returncode=0),
+            ) as run:
+                assert hook.run() == 0
+                assert run.call_args[0][0][-1:] == [str(edited)]
+                assert str(clean) not in run.call_args[0][0]
+
+    def test_ruff_fixes_are_not_cached_for_the_original_contents(
+        self, tmp_path: Path
+    ) -> None:
+        module = tmp_path / "module.py"
+        module.write_text("import os\nx = 1\n")
+
+        def fix(args: list[str], **kwargs: Any) -> MagicMock:
+            module.write_text("x = 1\n")
+            return MagicMock(returncode=0)
+
+        env = {"CLAUDE_PROJECT_DIR": str(tmp_path), "PYTHON_CLAUDE_CACHE_ENABLED": "1"}
+        with patch.dict(os.environ, env):
+            for hook_class in (RuffCheckHook, RuffFormatHook):
+                module.write_text("import os\nx = 1\n")
+                hook = hook_class(_stop_input())
+                hook.edits.record(f"{module}")
+                with patch("python_claude.hooks.base.run_process", side_effect=fix):
+                    assert hook.run() == 0
+
+                # Reverted to the contents ruff changed, so ruff must run again
+                module.write_text("import os\nx = 1\n")
+                hook.edits.record(f"{module}")
+                with patch(
+                    "python_claude.hooks.base.run_process", side_effect=fix
+                ) as run:
+                    assert hook.run() == 0
+                    run.assert_called_once()
+
+                # The fixed contents were recorded as clean
+                hook.edits.record(f"{module}")
+                with patch("python_claude.hooks.base.run_process") as run:
+                    assert hook.run() == 0
+                    run.assert_not_called()
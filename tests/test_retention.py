@@ -0,0 +1,120 @@
+"""Tests for session directory retention and the gc command."""
+
+import os
+import sys
+import tarfile
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from python_claude.hooks.base import HookInput
+from python_claude.hooks.gc_hook import GcHook
+from python_claude.hooks.retention import (
+    RetentionPolicy,
+    collect,
+    scan_sessions,
+    sessions_dir,
+)
+from python_claude.hooks.session_end_hook import SessionEndHook
+from python_claude.hooks.session_start_hook import SessionStartHook
+
+DAY = 86400
+LENIENT = RetentionPolicy(max_age_days=14, max_sessions=100, max_bytes=10**9)
+
+
+def _make_session(
+    root: Path, session_id: str, age_days: float, size: int = 10, ended: bool = True
+) -> Path:
+    path = sessions_dir(root) / session_id
+    path.mkdir(parents=True)
+    (path / "tracking.db").write_bytes(b"x" * size)
+    if ended:
+        (path / "ended").touch()
+    mtime = time.time() - age_days * DAY
+    for item in (*path.iterdir(), path):
+        os.utime(item, (mtime, mtime))
+    return path
+
+
+def _remaining(root: Path) -> list[str]:
+    return sorted(s.path.name for s in scan_sessions(root))
+
+
+class TestRetention:
+    def test_prunes_by_age(self, tmp_path: Path) -> None:
+        _make_session(tmp_path, "old", 30)
+        _make_session(tmp_path, "recent", 3)
+        pruned, _ = collect(tmp_path, LENIENT, set())
+        assert [s.path.name for s in pruned] == ["old"]
+        assert _remaining(tmp_path) == ["recent"]
+
+    def test_prunes_oldest_beyond_count(self, tmp_path: Path) -> None:
+        for i in range(5):
+            _make_session(tmp_path, f"s{i}", 2 + i)
+        policy = LENIENT._replace(max_sessions=3)
+        collect(tmp_path, policy, set())
+        assert _remaining(tmp_path) == ["s0", "s1", "s2"]
+
+    def test_prunes_oldest_beyond_size(self, tmp_path: Path) -> None:
+        for i in range(3):
+            _make_session(tmp_path, f"s{i}", 2 + i, size=100)
+        policy = LENIENT._replace(max_bytes=250)
+        collect(tmp_path, policy, set())
+        assert _remaining(tmp_path) == ["s0", "s1"]
+
+    def test_active_and_kept_sessions_are_never_pruned(self, tmp_path: Path) -> None:
+        _make_session(tmp_path, "active", 0.1)
+        _make_session(tmp_path, "current", 30)
+        policy = RetentionPolicy(max_age_days=1, max_sessions=0, max_bytes=0)
+        pruned, _ = collect(tmp_path, policy, {"current"})
+        assert pruned == []
+        assert _remaining(tmp_path) == ["active", "current"]
+
+    def test_archives_track_files_of_crashed_sessions(self, tmp_path: Path) -> None:
+        _make_session(tmp_path, "crashed", 30, ended=False)
+        _make_session(tmp_path, "finished", 30)
+        _, archive = collect(tmp_path, LENIENT, set())
+        assert archive is not None
+        with tarfile.open(archive) as tar:
+            assert tar.getnames() == ["crashed/tracking.db"]
+
+    def test_dry_run_keeps_everything(self, tmp_path: Path) -> None:
+        _make_session(tmp_path, "old", 30)
+        pruned, archive = collect(tmp_path, LENIENT, set(), dry_run=True)
+        assert len(pruned) == 1
+        assert archive is None
+        assert _remaining(tmp_path) == ["old"]
+
+
+class TestSessionHooks:
+    def test_session_end_marks_session_ended(self, tmp_path: Path) -> None:
+        hook_input = HookInput(session_id="abc", tool_input={}, raw={})
+        with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
+            SessionEndHook(hook_input).run()
+        (session,) = scan_sessions(tmp_path)
+        assert session.ended
+
+    def test_session_start_collects_once_per_interval(
+        self, tmp_path: Path, capsys: Any
+    ) -> None:
+        _make_session(tmp_path, "old", 30)
+        hook_input = HookInput(session_id="new", tool_input={}, raw={})
+        with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
+            SessionStartHook(hook_input).run()
+            # The new session's directory holds its tree snapshot
+            assert _remaining(tmp_path) == ["new"]
+            _make_session(tmp_path, "old", 30)
+            SessionStartHook(hook_input).run()
+            assert sorted(_remaining(tmp_path)) == ["new", "old"]
+
+    def test_gc_command_reports(self, tmp_path: Path, capsys: Any) -> None:
+        _make_session(tmp_path, "old", 30)
+        hook_input = HookInput(session_id=None, tool_input={}, raw={})
+        with (
+            patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}),
+            patch.object(sys, "argv", ["python-claude", "gc", "--dry-run"]),
+        ):
+            assert GcHook(hook_input).run() == 0
+        assert "Would remove 1 session directories" in capsys.readouterr().out
+        assert _remaining(tmp_path) == ["old"]
@@ -1,6 +1,7 @@
 """Tests for RuffCheckHook."""
 
 import os
+import subprocess
 from pathlib import Path
 from unittest.mock import patch
 
@@ -26,12 +27,23 @@ class TestRuffCheckHook:
             state.disable("ruff")
 
             hook = RuffCheckHook(hook_input)
-            # Create tracking file with edited files
-            hook.track_file.parent.mkdir(parents=True, exist_ok=True)
-            hook.track_file.write_text("/path/to/file.py\n")
+            # Record an edited file
+            hook.edits.record("/path/to/file.py")
 
-            with patch("subprocess.run") as mock_run:
+            with patch("python_claude.hooks.base.run_process") as mock_run:
                 exit_code = hook.run()
                 assert exit_code == 0
                 # Verify subprocess was not called
                 mock_run.assert_not_called()
+
+    def test_timeout_blocks(self, tmp_path: Path) -> None:
+        edited = tmp_path / "module.py"
+        edited.write_text("x = 1\n")
+        hook_input = HookInput(session_id=None, tool_input={}, raw={})
+        with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
+            hook = RuffCheckHook(hook_input)
+            hook.edits.record(str(edited))
+            expired = subprocess.TimeoutExpired(["ruff"], 60)
+            with patch("python_claude.hooks.base.run_process", side_effect=expired):
+                assert hook.run() == 2
+            assert hook.edits.pending("ruff-check").files == [str(edited)]
@@ -1,6 +1,7 @@
 """Tests for RuffFormatHook."""
 
 import os
+import subprocess
 from pathlib import Path
 from unittest.mock import patch
 
@@ -15,3 +16,15 @@ class TestRuffFormatHook:
             hook = RuffFormatHook(hook_input)
             exit_code = hook.run()
             assert exit_code == 0
+
+    def test_timeout_blocks(self, tmp_path: Path) -> None:
+        edited = tmp_path / "module.py"
+        edited.write_text("x = 1\n")
+        hook_input = HookInput(session_id=None, tool_input={}, raw={})
+        with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
+            hook = RuffFormatHook(hook_input)
+            hook.edits.record(str(edited))
+            expired = subprocess.TimeoutExpired(["ruff"], 60)
+            with patch("python_claude.hooks.base.run_process", side_effect=expired):
+                assert hook.run() == 2
+            assert hook.edits.pending("ruff-format").files == [str(edited)]
@@ -0,0 +1,88 @@
+"""Tests for the hook stage scheduler."""
+
+import threading
+
+import pytest
+
+from python_claude.hooks.scheduler import Task, run_tasks
+
+
+class TestRunTasks:
+    def test_runs_dependencies_first(self) -> None:
+        order: list[str] = []
+
+        def record(name: str, exit_code: int = 0) -> Task:
+            def run() -> int:
+                order.append(name)
+                return exit_code
+
+            return Task(name=name, run=run)
+
+        first = record("first")
+        second = record("second")
+        second.after = ("first",)
+        results = run_tasks([second, first])
+        assert order == ["first", "second"]
+        assert results == {"first": 0, "second": 0}
+
+    def test_independent_tasks_run_concurrently(self) -> None:
+        barrier = threading.Barrier(2, timeout=5)
+
+        def run() -> int:
+            # Deadlocks (and times out) unless both tasks run at the same time
+            barrier.wait()
+            return 0
+
+        results = run_tasks([Task(name="a", run=run), Task(name="b", run=run)])
+        assert results == {"a": 0, "b": 0}
+
+    def test_failure_does_not_stop_dependents_by_default(self) -> None:
+        tasks = [
+            Task(name="lint", run=lambda: 2),
+            Task(name="test", run=lambda: 0, after=("lint",)),
+        ]
+        assert run_tasks(tasks) == {"lint": 2, "test": 0}
+
+    def test_fail_fast_skips_remaining_tasks(self) -> None:
+        tasks = [
+            Task(name="lint", run=lambda: 2),
+            Task(name="test", run=lambda: 0, after=("lint",)),
+        ]
+        assert run_tasks(tasks, fail_fast=True) == {"lint": 2, "test": None}
+
+    def test_fail_fast_cancels_running_tasks(self) -> None:
+        cancel = threading.Event()
+        started = threading.Event()
+
+        def slow() -> int:
+            started.set()
+            cancel.wait(timeout=5)
+            return 0
+
+        def lint() -> int:
+            started.wait(timeout=5)
+            return 2
+
+        tasks = [Task(name="test", run=slow), Task(name="lint", run=lint)]
+        results = run_tasks(tasks, fail_fast=True, cancel=cancel)
+        assert cancel.is_set()
+        assert results == {"test": None, "lint": 2}
+
+    def test_fail_fast_ignores_non_blocking_exit_codes(self) -> None:
+        tasks = [
+            Task(name="lint", run=lambda: 5),
+            Task(name="test", run=lambda: 0, after=("lint",)),
+        ]
+        assert run_tasks(tasks, fail_fast=True) == {"lint": 5, "test": 0}
+
+    def test_unknown_dependency(self) -> None:
+        with pytest.raises(ValueError, match="unknown"):
+            run_tasks([Task(name="a", run=lambda: 0, after=("missing",))])
+
+    def test_dependency_cycle(self) -> None:
+        tasks = [
+            Task(name="a", run=lambda: 0, after=("b",)),
+            Task(name="b", run=lambda: 0, after=("a",)),
+        ]
+        with pytest.raises(ValueError, match="cycle"):
+            run_tasks(tasks)
@@ -0,0 +1,164 @@
+"""Tests for the resident hook server and its client."""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from python_claude.hooks.base import HookInput
+from python_claude.hooks.serve_hook import lock_file
+from python_claude.hooks.server import forward, socket_file
+from python_claude.hooks.session_start_hook import SessionStartHook
+from python_claude.hooks.tracking import EditStore
+
+SESSION = HookInput(session_id="s1", tool_input={}, raw={})
+posix_only = pytest.mark.skipif(os.name == "nt", reason="Unix sockets and fork")
+
+
+def _env(root: Path, **settings: str) -> dict[str, str]:
+    return {
+        "CLAUDE_PROJECT_DIR": str(root),
+        "PYTHON_CLAUDE_SNAPSHOT_ENABLED": "0",
+        "PYTHON_CLAUDE_TOOLS_UV_RUN": "1",
+        **settings,
+    }
+
+
+# Runs the command line with the hooks unavailable, so only a server can run them
+SERVED_ONLY = (
+    "import sys; from python_claude import cli;"
+    " cli.resolve_command = None; sys.argv[0] = 'python-claude'; cli.main()"
+)
+
+
+def _cli(
+    root: Path, *args: str, stdin: str = "", served_only: bool = False
+) -> "subprocess.CompletedProcess[str]":
+    command = ["-c", SERVED_ONLY] if served_only else ["-m", "python_claude.cli"]
+    return subprocess.run(
+        [sys.executable, *command, *args],
+        input=stdin,
+        capture_output=True,
+        text=True,
+        cwd=root,
+        env={**os.environ, **_env(root)},
+        check=False,
+    )
+
+
+@pytest.fixture
+def server(tmp_path: Path) -> Iterator[subprocess.Popen[bytes]]:
+    process = subprocess.Popen(
+        [sys.executable, "-m", "python_claude.cli", "serve"],
+        stdin=subprocess.DEVNULL,
+        cwd=tmp_path,
+        env={**os.environ, **_env(tmp_path)},
+    )
+    path = Path(socket_file(str(tmp_path)))
+    deadline = time.monotonic() + 10
+    while not path.exists() and time.monotonic() < deadline:
+        time.sleep(0.02)
+    try:
+        yield process
+    finally:
+        process.terminate()
+        process.wait()
+
+
+@posix_only
+class TestServer:
+    def test_runs_hooks_in_the_server(
+        self, tmp_path: Path, server: subprocess.Popen[bytes]
+    ) -> None:
+        edited = tmp_path / "module.py"
+        edited.write_text("x = 1\n")
+        payload = {"session_id": "s1", "tool_input": {"file_path": str(edited)}}
+        result = _cli(tmp_path, "edited", stdin=json.dumps(payload), served_only=True)
+        assert result.returncode == 0, result.stderr
+        store = EditStore(tmp_path / ".claude" / "debug" / "sessions" / "s1")
+        assert store.pending("mypy").files == [str(edited)]
+
+    def test_relays_output_and_exit_code(
+        self, tmp_path: Path, server: subprocess.Popen[bytes]
+    ) -> None:
+        result = _cli(tmp_path, "bogus", served_only=True)
+        assert result.returncode == 1
+        assert "Unknown command: bogus" in result.stderr
+
+    def test_one_server_per_project(
+        self, tmp_path: Path, server: subprocess.Popen[bytes]
+    ) -> None:
+        second = _cli(tmp_path, "serve")
+        assert second.returncode == 0
+        assert server.poll() is None
+        assert Path(socket_file(str(tmp_path))).exists()
+
+
+@posix_only
+class TestClient:
+    def test_runs_in_process_without_server(self, tmp_path: Path) -> None:
+        with patch.dict(os.environ, _env(tmp_path)):
+            assert forward(["python-claude", "edited"]) is None
+
+    def test_runs_in_process_with_stale_socket(self, tmp_path: Path) -> None:
+        path = socket_file(str(tmp_path))
+        os.makedirs(os.path.dirname(path))
+        # Bound but never listening, as left behind by a killed server
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+        with patch.dict(os.environ, _env(tmp_path)):
+            assert forward(["python-claude", "edited"]) is None
+
+    def test_runs_in_process_when_server_never_replies(self, tmp_path: Path) -> None:
+        path = socket_file(str(tmp_path))
+        os.makedirs(os.path.dirname(path))
+        # Accepts connections but never acknowledges, like a stopped server
+        wedged = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        wedged.bind(path)
+        wedged.listen()
+        start = time.monotonic()
+        try:
+            with (
+                patch.dict(os.environ, _env(tmp_path)),
+                patch("python_claude.hooks.server.ACK_TIMEOUT_SECONDS", 0.2),
+            ):
+                assert forward(["python-claude", "edited"]) is None
+        finally:
+            wedged.close()
+        assert time.monotonic() - start < 5
+
+    def test_background_jobs_run_in_process(self, tmp_path: Path) -> None:
+        with (
+            patch.dict(os.environ, _env(tmp_path)),
+            patch("os.path.exists", return_value=True) as exists,
+        ):
+            assert forward(["python-claude", "watch"]) is None
+        exists.assert_not_called()
+
+
+class TestStartServer:
+    def test_session_start_starts_server(self, tmp_path: Path) -> None:
+        env = _env(tmp_path, PYTHON_CLAUDE_SERVE_ENABLED="1")
+        with (
+            patch.dict(os.environ, env),
+            patch("python_claude.hooks.serve_hook.spawn") as spawn,
+        ):
+            SessionStartHook(SESSION).run()
+        spawn.assert_called_once_with(tmp_path, "serve", "s1")
+
+    def test_disabled_by_default(self, tmp_path: Path) -> None:
+        with (
+            patch.dict(os.environ, _env(tmp_path)),
+            patch("python_claude.hooks.serve_hook.spawn") as spawn,
+        ):
+            SessionStartHook(SESSION).run()
+        spawn.assert_not_called()
+        assert not lock_file(tmp_path).exists()
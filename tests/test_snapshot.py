@@ -0,0 +1,136 @@
+"""Tests for change detection from tree snapshots."""
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from python_claude.hooks.base import HookInput
+from python_claude.hooks.edited_hook import EditedHook
+from python_claude.hooks.pytest_hook import PytestHook
+from python_claude.hooks.ruff_format_hook import RuffFormatHook
+from python_claude.hooks.session_start_hook import SessionStartHook
+from python_claude.hooks.snapshot import TreeSnapshot, scan_python_files
+
+SESSION = HookInput(session_id="s1", tool_input={}, raw={})
+
+
+@pytest.fixture(autouse=True)
+def fresh_process() -> Iterator[None]:
+    # Each pending_edits call below stands for a separate hook process
+    with patch("python_claude.hooks.snapshot._compared", set()):
+        yield
+
+
+def _pending(root: Path) -> list[str]:
+    from python_claude.hooks import snapshot
+
+    snapshot._compared.clear()
+    with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(root)}):
+        return PytestHook(SESSION).pending_edits().files
+
+
+def _start(root: Path) -> None:
+    with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(root)}):
+        SessionStartHook(SESSION).run()
+
+
+class TestScan:
+    def test_skips_hidden_and_build_directories(self, tmp_path: Path) -> None:
+        for rel in ("a.py", "pkg/b.py", ".venv/c.py", "build/d.py", "pkg/e.txt"):
+            (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / rel).write_text("")
+        assert sorted(scan_python_files(tmp_path)) == ["a.py", "pkg/b.py"]
+
+
+class TestTreeChanges:
+    def test_session_start_records_baseline(self, tmp_path: Path) -> None:
+        (tmp_path / "a.py").write_text("x = 1\n")
+        _start(tmp_path)
+        snapshot = TreeSnapshot(tmp_path, tmp_path / ".claude/debug/sessions/s1")
+        assert list(snapshot.load() or {}) == ["a.py"]
+
+    def test_detects_changes_made_outside_edit_tools(self, tmp_path: Path) -> None:
+        (tmp_path / "changed.py").write_text("x = 1\n")
+        (tmp_path / "deleted.py").write_text("y = 1\n")
+        (tmp_path / "same.py").write_text("z = 1\n")
+        _start(tmp_path)
+
+        # As a Bash command would
+        (tmp_path / "changed.py").write_text("x = 22\n")
+        (tmp_path / "deleted.py").unlink()
+        (tmp_path / "new.py").write_text("w = 1\n")
+
+        assert sorted(_pending(tmp_path)) == [
+            str(tmp_path / name) for name in ("changed.py", "deleted.py", "new.py")
+        ]
+
+    def test_touched_files_are_reported_once(self, tmp_path: Path) -> None:
+        touched = tmp_path / "touched.py"
+        touched.write_text("x = 1\n")
+        _start(tmp_path)
+
+        os.utime(touched, ns=(1, 1))
+        # Its content was never hashed, so the first change is reported
+        assert _pending(tmp_path) == [str(touched)]
+        with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
+            hook = PytestHook(SESSION)
+            hook.edits.mark_done(hook.name, hook.edits.pending(hook.name).seq)
+
+        os.utime(touched, ns=(2, 2))
+        assert _pending(tmp_path) == []
+
+    def test_skips_edits_already_recorded(self, tmp_path: Path) -> None:
+        edited = tmp_path / "edited.py"
+        edited.write_text("x = 1\n")
+        _start(tmp_path)
+
+        edited.write_text("x = 2\n")
+        edit = HookInput(SESSION.session_id, {"file_path": str(edited)}, {})
+        with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
+            EditedHook(edit).run()
+            seq = PytestHook(SESSION).edits.pending("pytest").seq
+        _pending(tmp_path)
+        with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
+            assert PytestHook(SESSION).edits.pending("pytest").seq == seq
+
+    def test_files_rewritten_by_checks_are_not_changes(self, tmp_path: Path) -> None:
+        module = tmp_path / "module.py"
+        module.write_text("x = 1\n")
+        _start(tmp_path)
+
+        module.write_text("x=2\n")
+        edit = HookInput(SESSION.session_id, {"file_path": str(module)}, {})
+
+        def format_file(args: list[str], **kwargs: Any) -> MagicMock:
+            module.write_text("x = 2\n")
+            return MagicMock(returncode=0)
+
+        with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
+            EditedHook(edit).run()
+            with patch("python_claude.hooks.base.run_process", side_effect=format_file):
+                assert RuffFormatHook(SESSION).run() == 0
+            hook = PytestHook(SESSION)
+            hook.edits.mark_done(hook.name, hook.edits.pending(hook.name).seq)
+        assert _pending(tmp_path) == []
+
+    def test_compares_once_per_process(self, tmp_path: Path) -> None:
+        _start(tmp_path)
+        with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
+            hook = PytestHook(SESSION)
+            hook.pending_edits()
+            (tmp_path / "late.py").write_text("")
+            assert hook.pending_edits().files == []
+
+    def test_no_baseline_detects_nothing(self, tmp_path: Path) -> None:
+        (tmp_path / "a.py").write_text("x = 1\n")
+        assert _pending(tmp_path) == []
+
+    def test_disabled(self, tmp_path: Path) -> None:
+        _start(tmp_path)
+        (tmp_path / "a.py").write_text("x = 1\n")
+        with patch.dict(os.environ, {"PYTHON_CLAUDE_SNAPSHOT_ENABLED": "0"}):
+            assert _pending(tmp_path) == []
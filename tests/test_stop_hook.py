@@ -0,0 +1,142 @@
+"""Tests for StopHook."""
+
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from python_claude.hooks.base import HookInput, run_process
+from python_claude.hooks.stop_hook import StopHook
+
+
+def _tool(args: list[str]) -> str:
+    """Name the tool invoked by a `uv run` command."""
+    return " ".join(args[2:4]) if args[2] == "ruff" else args[2]
+
+
+class TestStopHook:
+    def test_runs_all_stages(self, tmp_path: Path) -> None:
+        edited = tmp_path / "module.py"
+        edited.write_text("x = 1\n")
+        hook_input = HookInput(session_id="abc123", tool_input={}, raw={})
+        with (
+            patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}),
+            patch.object(sys, "argv", ["python-claude", "stop"]),
+        ):
+            hook = StopHook(hook_input)
+            hook.edits.record(str(edited))
+
+            calls: list[str] = []
+
+            def run(args: list[str], **kwargs: Any) -> MagicMock:
+                calls.append(_tool(args))
+                return MagicMock(returncode=0)
+
+            with patch("python_claude.hooks.base.run_process", side_effect=run):
+                exit_code = hook.run()
+
+            assert exit_code == 0
+            assert calls[:2] == ["ruff format", "ruff check"]
+            assert sorted(calls[2:]) == ["mypy", "pytest"]
+            # Every stage marks the edit as done on success
+            for stage in ["ruff-format", "ruff-check", "mypy", "pytest"]:
+                assert hook.edits.pending(stage).files == []
+
+    def test_blocking_failure_maps_to_2(self, tmp_path: Path) -> None:
+        edited = tmp_path / "module.py"
+        edited.write_text("x = 1\n")
+        hook_input = HookInput(session_id="abc123", tool_input={}, raw={})
+        with (
+            patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}),
+            patch.object(sys, "argv", ["python-claude", "stop"]),
+        ):
+            hook = StopHook(hook_input)
+            hook.edits.record(str(edited))
+
+            def run(args: list[str], **kwargs: Any) -> MagicMock:
+                # mypy reports type errors; everything else passes
+                return MagicMock(returncode=1 if _tool(args) == "mypy" else 0)
+
+            with patch("python_claude.hooks.base.run_process", side_effect=run):
+                exit_code = hook.run()
+
+            assert exit_code == 2
+            assert hook.edits.pending("mypy").files == [str(edited)]
+            assert hook.edits.pending("pytest").files == []
+
+    def test_fail_fast_skips_later_stages(self, tmp_path: Path) -> None:
+        edited = tmp_path / "module.py"
+        edited.write_text("x = 1\n")
+        hook_input = HookInput(session_id="abc123", tool_input={}, raw={})
+        with (
+            patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}),
+            patch.object(sys, "argv", ["python-claude", "stop", "--fail-fast"]),
+        ):
+            hook = StopHook(hook_input)
+            hook.edits.record(str(edited))
+
+            calls: list[str] = []
+
+            def run(args: list[str], **kwargs: Any) -> MagicMock:
+                calls.append(_tool(args))
+                # ruff check finds an unfixable lint error
+                return MagicMock(returncode=1 if _tool(args) == "ruff check" else 0)
+
+            with patch("python_claude.hooks.base.run_process", side_effect=run):
+                exit_code = hook.run()
+
+            assert exit_code == 2
+            assert calls == ["ruff format", "ruff check"]
+
+    @pytest.mark.skipif(os.name == "nt", reason="process groups are POSIX only")
+    def test_fail_fast_stops_running_stages(self, tmp_path: Path) -> None:
+        edited = tmp_path / "module.py"
+        edited.write_text("x = 1\n")
+        pid_file = tmp_path / "pytest.pid"
+        hook_input = HookInput(session_id="abc123", tool_input={}, raw={})
+        with (
+            patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}),
+            patch.object(sys, "argv", ["python-claude", "stop", "--fail-fast"]),
+            patch("python_claude.hooks.base._handling_termination", True),
+        ):
+            hook = StopHook(hook_input)
+            hook.edits.record(str(edited))
+
+            def run(args: list[str], **kwargs: Any) -> Any:
+                if _tool(args) == "pytest":
+                    # A slow test suite, still running when mypy fails
+                    script = f"echo $$ > {pid_file}; exec sleep 30"
+                    return run_process(["sh", "-c", script], **kwargs)
+                if _tool(args) == "mypy":
+                    deadline = time.monotonic() + 5
+                    while not pid_file.exists() and time.monotonic() < deadline:
+                        time.sleep(0.05)
+                    return MagicMock(returncode=1)
+                return MagicMock(returncode=0)
+
+            start = time.monotonic()
+            with patch("python_claude.hooks.base.run_process", side_effect=run):
+                exit_code = hook.run()
+
+            assert exit_code == 2
+            assert time.monotonic() - start < 10
+            assert hook.edits.pending("pytest").files == [str(edited)]
+        pid = int(pid_file.read_text())
+        with pytest.raises(ProcessLookupError):
+            os.kill(pid, 0)
+
+    def test_no_edits_runs_nothing(self, tmp_path: Path) -> None:
+        hook_input = HookInput(session_id="abc123", tool_input={}, raw={})
+        with (
+            patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}),
+            patch.object(sys, "argv", ["python-claude", "stop"]),
+        ):
+            hook = StopHook(hook_input)
+            with patch("python_claude.hooks.base.run_process") as mock_run:
+                exit_code = hook.run()
+                assert exit_code == 0
+                mock_run.assert_not_called()
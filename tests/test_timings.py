@@ -0,0 +1,160 @@
+"""Tests for hook timing records and the stats command."""
+
+import json
+import os
+import sys
+import time
+from io import StringIO
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from python_claude import cli
+from python_claude.hooks.base import HookInput
+from python_claude.hooks.stats_hook import StatsHook
+from python_claude.hooks.stop_hook import StopHook
+from python_claude.hooks.timings import (
+    load_records,
+    parse_duration,
+    percentile,
+    record_run,
+    summarize,
+    timings_file,
+)
+
+
+def _record(root: Path, name: str, wall_ms: float, **kwargs: Any) -> None:
+    record_run(
+        root,
+        name,
+        kwargs.get("session", "s1"),
+        kwargs.get("exit_code", 0),
+        wall_ms / 1000,
+        kwargs.get("tool_ms", 0) / 1000,
+        None,
+        1,
+        kwargs.get("cache_hit", False),
+        kwargs.get("parent"),
+    )
+
+
+class TestTimings:
+    def test_percentile(self) -> None:
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50
+        assert percentile(values, 95) == 95
+        assert percentile([7.0], 95) == 7
+
+    def test_parse_duration(self) -> None:
+        assert parse_duration("90s") == 90
+        assert parse_duration("24h") == 86400
+        with pytest.raises(ValueError):
+            parse_duration("soon")
+
+    def test_summarize_per_hook(self, tmp_path: Path) -> None:
+        for wall in (10, 20, 30):
+            _record(tmp_path, "mypy", wall, parent="stop")
+        _record(tmp_path, "edited", 2, cache_hit=True, exit_code=1)
+        summary = summarize(load_records(timings_file(tmp_path)))
+        assert list(summary) == ["edited", "stop/mypy"]
+        assert summary["stop/mypy"]["runs"] == 3
+        assert summary["stop/mypy"]["p50_ms"] == 20
+        assert summary["stop/mypy"]["max_ms"] == 30
+        assert summary["edited"]["cache_hits"] == 1
+        assert summary["edited"]["failures"] == 1
+
+    def test_load_filters_and_skips_partial_lines(self, tmp_path: Path) -> None:
+        _record(tmp_path, "mypy", 10, session="old")
+        _record(tmp_path, "mypy", 10, session="new")
+        with open(timings_file(tmp_path), "a") as f:
+            f.write('{"hook": "trunc')
+        path = timings_file(tmp_path)
+        assert len(load_records(path)) == 2
+        assert len(load_records(path, session_id="new")) == 1
+        assert load_records(path, since=time.time() + 60) == []
+
+    def test_rotates_past_max_bytes(self, tmp_path: Path) -> None:
+        path = timings_file(tmp_path)
+        for i in range(5):
+            record_run(tmp_path, f"h{i}", "s1", 0, 0.01, 0, None, 1, False, None, 300)
+        assert path.stat().st_size <= 300
+        assert path.with_name("timings.jsonl.1.gz").exists()
+        # Rotated records are still read, oldest first
+        assert [r["hook"] for r in load_records(path)] == [f"h{i}" for i in range(5)]
+
+    def test_cli_records_hook_run(self, tmp_path: Path) -> None:
+        edited = tmp_path / "a.py"
+        edited.write_text("x = 1\n")
+        payload = json.dumps(
+            {"session_id": "s1", "tool_input": {"file_path": str(edited)}}
+        )
+        with (
+            patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}),
+            patch.object(sys, "argv", ["python-claude", "edited"]),
+            patch("sys.stdin", StringIO(payload)),
+            pytest.raises(SystemExit),
+        ):
+            cli.main()
+        (record,) = load_records(timings_file(tmp_path))
+        assert record["hook"] == "edited"
+        assert record["session"] == "s1"
+        assert record["files"] == 1
+        assert record["exit"] == 0
+
+    def test_stop_records_each_stage(self, tmp_path: Path) -> None:
+        hook_input = HookInput(session_id="s1", tool_input={}, raw={})
+        with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
+            hook = StopHook(hook_input)
+            hook.output = StringIO()
+            hook.edits.record(str(tmp_path / "a.py"))
+            with patch(
+                "python_claude.hooks.base.run_process",
+                return_value=MagicMock(returncode=0),
+            ):
+                hook.run()
+        records = load_records(timings_file(tmp_path))
+        assert {r["hook"] for r in records} == {
+            "ruff-format",
+            "ruff-check",
+            "mypy",
+            "pytest",
+        }
+        assert all(r["parent"] == "stop" for r in records)
+
+
+class TestStatsHook:
+    def test_prints_table(self, tmp_path: Path, capsys: Any) -> None:
+        _record(tmp_path, "mypy", 10)
+        _record(tmp_path, "pytest", 20)
+        hook_input = HookInput(session_id=None, tool_input={}, raw={})
+        with (
+            patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}),
+            patch.object(sys, "argv", ["python-claude", "stats", "--since", "1h"]),
+        ):
+            assert StatsHook(hook_input).run() == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0].startswith("hook")
+        assert [line.split()[0] for line in lines[1:]] == ["mypy", "pytest"]
+
+    def test_json_by_day(self, tmp_path: Path, capsys: Any) -> None:
+        _record(tmp_path, "mypy", 10)
+        hook_input = HookInput(session_id=None, tool_input={}, raw={})
+        argv = ["python-claude", "stats", "--by", "day", "--json"]
+        with (
+            patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}),
+            patch.object(sys, "argv", argv),
+        ):
+            assert StatsHook(hook_input).run() == 0
+        report = json.loads(capsys.readouterr().out)
+        (day,) = report.values()
+        assert day["mypy"]["runs"] == 1
+
+    def test_invalid_since(self, tmp_path: Path) -> None:
+        hook_input = HookInput(session_id=None, tool_input={}, raw={})
+        with (
+            patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}),
+            patch.object(sys, "argv", ["python-claude", "stats", "--since", "x"]),
+        ):
+            assert StatsHook(hook_input).run() == 1
@@ -0,0 +1,108 @@
+"""Tests for resolving tools to venv executables."""
+
+import os
+import subprocess
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from python_claude.hooks.base import HookInput
+from python_claude.hooks.mypy_hook import MypyHook
+from python_claude.hooks.tool_resolver import ToolResolver
+
+
+def _make_venv(project_dir: Path, *tools: str) -> Path:
+    bin_dir = project_dir / ".venv" / "bin"
+    bin_dir.mkdir(parents=True)
+    for tool in tools:
+        executable = bin_dir / tool
+        executable.write_text("#!/bin/sh\n")
+        executable.chmod(0o755)
+    return bin_dir
+
+
+class TestToolResolver:
+    def test_resolves_tool_in_venv(self, tmp_path: Path) -> None:
+        bin_dir = _make_venv(tmp_path, "ruff")
+        with patch("python_claude.hooks.base.run_process") as mock_run:
+            args, env = ToolResolver(tmp_path).command(["uv", "run", "ruff", "."])
+        mock_run.assert_not_called()
+        assert args == [str(bin_dir / "ruff"), "."]
+        assert env["VIRTUAL_ENV"] == str(tmp_path / ".venv")
+        assert env["PATH"].startswith(str(bin_dir))
+
+    def test_falls_back_without_venv(self, tmp_path: Path) -> None:
+        args, env = ToolResolver(tmp_path).command(["uv", "run", "ruff", "."])
+        assert args == ["uv", "run", "ruff", "."]
+        assert env == {}
+
+    def test_falls_back_for_missing_tool(self, tmp_path: Path) -> None:
+        _make_venv(tmp_path, "ruff")
+        args, _ = ToolResolver(tmp_path).command(["uv", "run", "mypy", "."])
+        assert args == ["uv", "run", "mypy", "."]
+
+    def test_syncs_only_when_lock_contents_change(self, tmp_path: Path) -> None:
+        _make_venv(tmp_path, "ruff")
+        lock = tmp_path / "uv.lock"
+        lock.write_text("version = 1\n")
+        resolver = ToolResolver(tmp_path)
+        with patch(
+            "python_claude.hooks.base.run_process", return_value=MagicMock(returncode=0)
+        ) as run:
+            resolver.resolve("ruff")
+            resolver.resolve("ruff")
+            assert run.call_count == 1
+            assert run.call_args[0][0][:2] == ["uv", "sync"]
+
+            # Touching the lockfile without changing it needs no sync
+            os.utime(lock, ns=(0, 0))
+            resolver.resolve("ruff")
+            assert run.call_count == 1
+
+            lock.write_text("version = 2\n")
+            resolver.resolve("ruff")
+            assert run.call_count == 2
+
+    def test_failed_sync_falls_back_to_uv_run(self, tmp_path: Path) -> None:
+        _make_venv(tmp_path, "ruff")
+        (tmp_path / "uv.lock").write_text("version = 1\n")
+        resolver = ToolResolver(tmp_path)
+        with patch(
+            "python_claude.hooks.base.run_process", return_value=MagicMock(returncode=1)
+        ) as run:
+            assert resolver.resolve("ruff") is None
+            # Not recorded as synced, so the next run tries again
+            assert resolver.resolve("ruff") is None
+            assert run.call_count == 2
+
+    def test_slow_sync_falls_back_to_uv_run(self, tmp_path: Path) -> None:
+        _make_venv(tmp_path, "ruff")
+        (tmp_path / "uv.lock").write_text("version = 1\n")
+        resolver = ToolResolver(tmp_path, timeout=30)
+        expired = subprocess.TimeoutExpired(["uv", "sync"], 30)
+        with patch("python_claude.hooks.base.run_process", side_effect=expired) as run:
+            assert resolver.resolve("ruff") is None
+        assert run.call_args.kwargs["timeout"] == 30
+
+
+class TestHookToolExecution:
+    def test_run_tool_uses_venv_executable(self, tmp_path: Path) -> None:
+        bin_dir = _make_venv(tmp_path, "mypy")
+        hook_input = HookInput(session_id=None, tool_input={}, raw={})
+        with patch.dict(os.environ, {"CLAUDE_PROJECT_DIR": str(tmp_path)}):
+            hook = MypyHook(hook_input)
+            with patch("python_claude.hooks.base.run_process") as mock_run:
+                mock_run.return_value = MagicMock(returncode=0)
+                hook.run_tool(["uv", "run", "mypy", "."])
+        assert mock_run.call_args[0][0] == [str(bin_dir / "mypy"), "."]
+        assert mock_run.call_args[1]["env"]["VIRTUAL_ENV"] == str(tmp_path / ".venv")
+
+    def test_uv_run_can_be_forced(self, tmp_path: Path) -> None:
+        _make_venv(tmp_path, "mypy")
+        hook_input = HookInput(session_id=None, tool_input={}, raw={})
+        env = {"CLAUDE_PROJECT_DIR": str(tmp_path), "PYTHON_CLAUDE_TOOLS_UV_RUN": "1"}
+        with patch.dict(os.environ, env):
+            hook = MypyHook(hook_input)
+            with patch("python_claude.hooks.base.run_process") as mock_run:
+                mock_run.return_value = MagicMock(returncode=0)
+                hook.run_tool(["uv", "run", "mypy", "."])
+        assert mock_run.call_args[0][0] == ["uv", "run", "mypy", "."]
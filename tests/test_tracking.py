@@ -0,0 +1,60 @@
+"""Tests for EditStore."""
+
+import threading
+from pathlib import Path
+
+from python_claude.hooks.tracking import EditStore
+
+
+class TestEditStore:
+    def test_pending_is_per_check(self, tmp_path: Path) -> None:
+        store = EditStore(tmp_path)
+        store.record("/a.py")
+        store.record("/b.py")
+        pending = store.pending("mypy")
+        assert pending.files == ["/a.py", "/b.py"]
+        store.mark_done("mypy", pending.seq)
+        assert store.pending("mypy").files == []
+        assert store.pending("pytest").files == ["/a.py", "/b.py"]
+
+    def test_edits_during_a_run_stay_pending(self, tmp_path: Path) -> None:
+        store = EditStore(tmp_path)
+        store.record("/a.py")
+        pending = store.pending("mypy")
+        # Edited again while the check was running
+        store.record("/a.py")
+        store.mark_done("mypy", pending.seq)
+        assert store.pending("mypy").files == ["/a.py"]
+
+    def test_cursor_never_moves_back(self, tmp_path: Path) -> None:
+        store = EditStore(tmp_path)
+        store.record("/a.py")
+        first = store.pending("mypy")
+        store.record("/b.py")
+        second = store.pending("mypy")
+        store.mark_done("mypy", second.seq)
+        store.mark_done("mypy", first.seq)
+        assert store.pending("mypy").files == []
+
+    def test_imports_legacy_track_files(self, tmp_path: Path) -> None:
+        (tmp_path / "mypy-files.txt").write_text("/a.py\n")
+        (tmp_path / "pytest-files.txt").write_text("/a.py\n/b.py\n")
+        store = EditStore(tmp_path)
+        store.record("/c.py")
+        assert store.pending("mypy").files == ["/a.py", "/b.py", "/c.py"]
+        assert not (tmp_path / "mypy-files.txt").exists()
+
+    def test_concurrent_records(self, tmp_path: Path) -> None:
+        store = EditStore(tmp_path)
+        store.record("/first.py")
+
+        def record(i: int) -> None:
+            for j in range(20):
+                EditStore(tmp_path).record(f"/file_{i}_{j}.py")
+
+        threads = [threading.Thread(target=record, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(store.pending("mypy").files) == 81
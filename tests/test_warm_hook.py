@@ -0,0 +1,101 @@
+"""Tests for the background warm-up job."""
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from python_claude.hooks.background import try_lock
+from python_claude.hooks.base import HookInput
+from python_claude.hooks.session_start_hook import SessionStartHook
+from python_claude.hooks.warm_hook import WarmHook, lock_file, start_warmup
+
+SESSION = HookInput(session_id="s1", tool_input={}, raw={})
+
+
+@pytest.fixture(autouse=True)
+def keep_priority() -> Iterator[None]:
+    # The job lowers its own priority, which would slow down the other tests
+    with patch("os.nice"):
+        yield
+
+
+def _env(root: Path, **settings: str) -> dict[str, str]:
+    return {
+        "CLAUDE_PROJECT_DIR": str(root),
+        "PYTHON_CLAUDE_TOOLS_UV_RUN": "1",
+        "PYTHON_CLAUDE_SNAPSHOT_ENABLED": "0",
+        **settings,
+    }
+
+
+def _commands(mock_run: MagicMock) -> list[list[str]]:
+    return [c.args[0] for c in mock_run.call_args_list]
+
+
+class TestWarmHook:
+    def test_syncs_then_warms_mypy_and_collection(self, tmp_path: Path) -> None:
+        env = _env(tmp_path, PYTHON_CLAUDE_MYPY_ARGS="--strict")
+        with (
+            patch.dict(os.environ, env),
+            patch(
+                "python_claude.hooks.base.run_process",
+                return_value=MagicMock(returncode=0),
+            ) as mock_run,
+        ):
+            assert WarmHook(SESSION).run() == 0
+        assert _commands(mock_run) == [
+            ["uv", "sync", "--inexact", "--quiet"],
+            ["uv", "run", "mypy", "--strict", "."],
+            ["uv", "run", "pytest", "--collect-only", "-q"],
+        ]
+
+    def test_skips_disabled_checks(self, tmp_path: Path) -> None:
+        env = _env(tmp_path, PYTHON_CLAUDE_MYPY_ENABLED="0")
+        with (
+            patch.dict(os.environ, env),
+            patch(
+                "python_claude.hooks.base.run_process",
+                return_value=MagicMock(returncode=0),
+            ) as mock_run,
+        ):
+            WarmHook(SESSION).run()
+        assert [args[2] for args in _commands(mock_run)] == ["--inexact", "pytest"]
+
+    def test_missing_tools_are_logged(self, tmp_path: Path) -> None:
+        with patch.dict(os.environ, _env(tmp_path)):
+            hook = WarmHook(SESSION)
+            with patch(
+                "python_claude.hooks.base.run_process",
+                side_effect=FileNotFoundError("uv"),
+            ):
+                assert hook.run() == 0
+            hook.flush_log()
+        assert "uv sync failed" in hook.log_file.read_text()
+
+    def test_one_warmup_per_project(self, tmp_path: Path) -> None:
+        with patch.dict(os.environ, _env(tmp_path)):
+            hook = WarmHook(SESSION)
+            lock_file(tmp_path).parent.mkdir(parents=True)
+            lock = try_lock(lock_file(tmp_path))
+            assert lock is not None
+            try:
+                with patch("python_claude.hooks.base.run_process") as mock_run:
+                    assert hook.run() == 0
+                    mock_run.assert_not_called()
+                with patch("python_claude.hooks.warm_hook.spawn") as spawn:
+                    assert not start_warmup(tmp_path, "s2")
+                    spawn.assert_not_called()
+            finally:
+                os.close(lock)
+
+    def test_session_start_starts_warmup(self, tmp_path: Path) -> None:
+        env = _env(tmp_path, PYTHON_CLAUDE_WARM_ENABLED="1")
+        with (
+            patch.dict(os.environ, env),
+            patch("python_claude.hooks.warm_hook.spawn") as spawn,
+        ):
+            SessionStartHook(SESSION).run()
+        spawn.assert_called_once_with(tmp_path, "warm", "s1")
@@ -0,0 +1,232 @@
+"""Tests for the background watcher and its file change notification."""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from python_claude.hooks.background import try_lock
+from python_claude.hooks.base import HookInput
+from python_claude.hooks.file_watcher import InotifyWatcher, PollingWatcher
+from python_claude.hooks.mypy_hook import MypyHook
+from python_claude.hooks.result_cache import RUFF_CONFIG, ResultCache
+from python_claude.hooks.retention import ENDED_MARKER
+from python_claude.hooks.ruff_check_hook import RuffCheckHook
+from python_claude.hooks.session_end_hook import SessionEndHook
+from python_claude.hooks.session_start_hook import SessionStartHook
+from python_claude.hooks.watch_hook import LOCK_FILE, WatchHook, watcher_pid
+
+SESSION = HookInput(session_id="s1", tool_input={}, raw={})
+linux_only = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="inotify is Linux-only"
+)
+
+
+def _env(root: Path, **settings: str) -> dict[str, str]:
+    return {
+        "CLAUDE_PROJECT_DIR": str(root),
+        "PYTHON_CLAUDE_WATCH_ENABLED": "1",
+        "PYTHON_CLAUDE_SNAPSHOT_ENABLED": "0",
+        "PYTHON_CLAUDE_TOOLS_UV_RUN": "1",
+        **settings,
+    }
+
+
+def _collect(watcher: InotifyWatcher | PollingWatcher, wanted: set[str]) -> set[str]:
+    """Gather changes until the wanted files were reported or time runs out."""
+    seen: set[str] = set()
+    deadline = time.monotonic() + 5
+    while not wanted <= seen and time.monotonic() < deadline:
+        seen |= watcher.wait(0.5)
+    return seen
+
+
+def _ruff_output(stdout: str) -> Any:
+    def run(args: list[str], **kwargs: Any) -> subprocess.CompletedProcess[bytes]:
+        kwargs["stdout"].write(stdout)
+        return subprocess.CompletedProcess(args, 1 if stdout else 0)
+
+    return run
+
+
+class TestFileWatcher:
+    @linux_only
+    def test_inotify_reports_python_files(self, tmp_path: Path) -> None:
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / ".venv").mkdir()
+        watcher = InotifyWatcher(tmp_path)
+        try:
+            (tmp_path / "pkg" / "a.py").write_text("x = 1\n")
+            (tmp_path / "pkg" / "notes.txt").write_text("")
+            (tmp_path / ".venv" / "b.py").write_text("")
+            (tmp_path / "new").mkdir()
+            (tmp_path / "new" / "c.py").write_text("")
+            wanted = {str(tmp_path / "pkg" / "a.py"), str(tmp_path / "new" / "c.py")}
+            assert _collect(watcher, wanted) == wanted
+        finally:
+            watcher.close()
+
+    def test_polling_reports_changes(self, tmp_path: Path) -> None:
+        module = tmp_path / "module.py"
+        module.write_text("x = 1\n")
+        watcher = PollingWatcher(tmp_path)
+        with patch("python_claude.hooks.file_watcher.POLL_SECONDS", 0.05):
+            assert watcher.wait(0.1) == set()
+            module.write_text("x = 22\n")
+            assert _collect(watcher, {str(module)}) == {str(module)}
+
+
+class TestPrecheck:
+    def test_clean_files_skip_stop_ruff(self, tmp_path: Path) -> None:
+        module = tmp_path / "module.py"
+        module.write_text("x = 1\n")
+        with patch.dict(os.environ, _env(tmp_path, PYTHON_CLAUDE_MYPY_ENABLED="0")):
+            with patch(
+                "python_claude.hooks.watch_hook.run_process",
+                side_effect=_ruff_output(""),
+            ):
+                WatchHook(SESSION).precheck([str(module)])
+            hook = RuffCheckHook(SESSION)
+            hook.edits.record(str(module))
+            with patch("python_claude.hooks.base.run_process") as mock_run:
+                assert hook.run() == 0
+                mock_run.assert_not_called()
+
+    def test_files_with_diagnostics_stay_unchecked(self, tmp_path: Path) -> None:
+        clean = tmp_path / "clean.py"
+        clean.write_text("x = 1\n")
+        dirty = tmp_path / "dirty.py"
+        dirty.write_text("import os\n")
+        report = json.dumps([{"filename": str(dirty), "code": "F401"}])
+        with patch.dict(os.environ, _env(tmp_path)):
+            hook = WatchHook(SESSION)
+            with patch(
+                "python_claude.hooks.watch_hook.run_process",
+                side_effect=_ruff_output(report),
+            ):
+                hook._precheck_ruff(
+                    ResultCache(tmp_path),
+                    "ruff-check",
+                    ["ruff", "check"],
+                    [str(clean), str(dirty)],
+                )
+            cache = ResultCache(tmp_path)
+            keys = cache.file_keys("ruff-check", [str(clean), str(dirty)], RUFF_CONFIG)
+            assert cache.is_clean(keys[str(clean)])
+            assert not cache.is_clean(keys[str(dirty)])
+
+    def test_files_edited_during_the_run_are_discarded(self, tmp_path: Path) -> None:
+        module = tmp_path / "module.py"
+        module.write_text("x = 1\n")
+
+        def edit(args: list[str], **kwargs: Any) -> subprocess.CompletedProcess[bytes]:
+            module.write_text("x = 22\n")
+            return subprocess.CompletedProcess(args, 0)
+
+        with patch.dict(os.environ, _env(tmp_path)):
+            hook = WatchHook(SESSION)
+            with patch("python_claude.hooks.watch_hook.run_process", side_effect=edit):
+                hook._precheck_ruff(
+                    ResultCache(tmp_path),
+                    "ruff-check",
+                    ["ruff", "check"],
+                    [str(module)],
+                )
+            cache = ResultCache(tmp_path)
+            for content in ("x = 1\n", "x = 22\n"):
+                module.write_text(content)
+                keys = cache.file_keys("ruff-check", [str(module)], RUFF_CONFIG)
+                assert not cache.is_clean(keys[str(module)])
+
+    def test_mypy_result_is_replayed_on_stop(self, tmp_path: Path) -> None:
+        module = tmp_path / "module.py"
+        module.write_text("x: int = 'a'\n")
+        env = _env(tmp_path, PYTHON_CLAUDE_RUFF_ENABLED="0")
+        with patch.dict(os.environ, env):
+            with patch(
+                "python_claude.hooks.base.run_process",
+                return_value=MagicMock(returncode=1),
+            ):
+                WatchHook(SESSION).precheck([str(module)])
+            hook = MypyHook(SESSION)
+            hook.edits.record(str(module))
+            with patch("python_claude.hooks.base.run_process") as mock_run:
+                assert hook.run() == 2
+                mock_run.assert_not_called()
+
+
+class TestWatcherProcess:
+    def test_only_one_watcher_per_session(self, tmp_path: Path) -> None:
+        with patch.dict(os.environ, _env(tmp_path)):
+            hook = WatchHook(SESSION)
+            lock = try_lock(hook.log_dir / LOCK_FILE)
+            try:
+                with patch("python_claude.hooks.watch_hook.open_watcher") as watch:
+                    assert hook.run() == 0
+                    watch.assert_not_called()
+            finally:
+                assert lock is not None
+                os.close(lock)
+
+    def test_checks_after_quiet_period_until_session_ends(self, tmp_path: Path) -> None:
+        module = str(tmp_path / "module.py")
+        with patch.dict(os.environ, _env(tmp_path)):
+            hook = WatchHook(SESSION)
+            ended = hook.log_dir / ENDED_MARKER
+            events: list[set[str]] = [{module}, set()]
+
+            def wait(timeout: float) -> set[str]:
+                if not events:
+                    ended.touch()
+                    return set()
+                return events.pop(0)
+
+            watcher = MagicMock(wait=wait)
+            with (
+                patch(
+                    "python_claude.hooks.watch_hook.open_watcher", return_value=watcher
+                ),
+                patch.object(WatchHook, "precheck") as precheck,
+            ):
+                assert hook.run() == 0
+            precheck.assert_called_once_with([module])
+            watcher.close.assert_called_once()
+            assert watcher_pid(hook.log_dir) is None
+
+    def test_exits_when_idle(self, tmp_path: Path) -> None:
+        env = _env(tmp_path, PYTHON_CLAUDE_WATCH_IDLE_MINUTES="0")
+        with patch.dict(os.environ, env):
+            with patch("python_claude.hooks.watch_hook.open_watcher") as watch:
+                assert WatchHook(SESSION).run() == 0
+            watch.return_value.wait.assert_not_called()
+
+    def test_session_start_starts_watcher(self, tmp_path: Path) -> None:
+        with patch.dict(os.environ, _env(tmp_path)):
+            with patch("python_claude.hooks.watch_hook.start_watcher") as start:
+                hook = SessionStartHook(SESSION)
+                hook.run()
+            start.assert_called_once_with(tmp_path, hook.log_dir, "s1")
+
+    def test_session_end_stops_watcher(self, tmp_path: Path) -> None:
+        with patch.dict(os.environ, _env(tmp_path)):
+            hook = SessionEndHook(SESSION)
+            sleeper = subprocess.Popen(
+                [sys.executable, "-c", "import time; time.sleep(30)"]
+            )
+            lock = try_lock(hook.log_dir / LOCK_FILE)
+            assert lock is not None
+            try:
+                os.write(lock, str(sleeper.pid).encode())
+                assert watcher_pid(hook.log_dir) == sleeper.pid
+                hook.run()
+                assert sleeper.wait(5) == -15
+            finally:
+                os.close(lock)
+                sleeper.kill()
+                sleeper.wait()
@@ -0,0 +1,223 @@
+"""Tests for per-package checks in workspaces."""
+
+import os
+import subprocess
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from python_claude.hooks.base import HookInput
+from python_claude.hooks.mypy_hook import MypyHook
+from python_claude.hooks.pytest_hook import PytestHook
+from python_claude.hooks.workspace import (
+    find_packages,
+    group_by_package,
+    paths_outside,
+)
+
+SESSION = HookInput(session_id="s1", tool_input={}, raw={})
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Path:
+    (tmp_path / "pyproject.toml").write_text("[tool.uv.workspace]\n")
+    for name in ("alpha", "beta"):
+        package = tmp_path / "packages" / name
+        (package / "src" / name).mkdir(parents=True)
+        (package / "pyproject.toml").write_text(f"[project]\nname = '{name}'\n")
+        (package / "src" / name / "core.py").write_text("x = 1\n")
+    (tmp_path / "scripts").mkdir()
+    (tmp_path / "scripts" / "tool.py").write_text("y = 1\n")
+    return tmp_path
+
+
+def _env(root: Path, **settings: str) -> dict[str, str]:
+    return {
+        "CLAUDE_PROJECT_DIR": str(root),
+        "PYTHON_CLAUDE_PACKAGES_ENABLED": "1",
+        "PYTHON_CLAUDE_TOOLS_UV_RUN": "1",
+        "PYTHON_CLAUDE_SNAPSHOT_ENABLED": "0",
+        **settings,
+    }
+
+
+def _fake_tools(
+    exit_codes: dict[str, int], calls: dict[Path, list[str]] | None = None
+) -> tuple[list[Path], Any]:
+    """Fake tool runs exiting by package directory name, recording their cwd.
+
+    The arguments of each run are recorded in ``calls`` by directory.
+    """
+    cwds: list[Path] = []
+
+    def run(args: list[str], **kwargs: Any) -> subprocess.CompletedProcess[bytes]:
+        cwd = kwargs["cwd"]
+        cwds.append(cwd)
+        if calls is not None:
+            calls[cwd] = args
+        kwargs["stdout"].write(f"ran in {cwd.name}\n")
+        return subprocess.CompletedProcess(args, exit_codes.get(cwd.name, 0))
+
+    return cwds, run
+
+
+class TestGroupByPackage:
+    def test_groups_by_nearest_pyproject(self, workspace: Path) -> None:
+        alpha = workspace / "packages" / "alpha"
+        files = [
+            str(alpha / "src" / "alpha" / "core.py"),
+            str(workspace / "scripts" / "tool.py"),
+            str(alpha / "tests" / "test_core.py"),
+            "/elsewhere/module.py",
+        ]
+        assert group_by_package(files, workspace) == {
+            alpha: [files[0], files[2]],
+            workspace: [files[1], files[3]],
+        }
+
+    def test_finds_packages(self, workspace: Path) -> None:
+        (workspace / ".venv" / "lib").mkdir(parents=True)
+        (workspace / ".venv" / "lib" / "pyproject.toml").write_text("")
+        assert find_packages(workspace) == [
+            workspace / "packages" / "alpha",
+            workspace / "packages" / "beta",
+        ]
+
+    def test_paths_outside_packages(self, workspace: Path) -> None:
+        (workspace / "packages" / "shared.py").write_text("")
+        (workspace / "docs").mkdir()
+        excluded = find_packages(workspace)
+        assert paths_outside(workspace, ["."], excluded) == [
+            "packages/shared.py",
+            "scripts",
+        ]
+        assert paths_outside(workspace, ["scripts"], excluded) == ["scripts"]
+        assert paths_outside(workspace, ["packages/alpha"], excluded) == []
+
+
+class TestPackageChecks:
+    def test_checks_only_edited_packages_in_their_directory(
+        self, workspace: Path
+    ) -> None:
+        alpha = workspace / "packages" / "alpha"
+        cwds, run = _fake_tools({})
+        with patch.dict(os.environ, _env(workspace)):
+            hook = MypyHook(SESSION)
+            hook.edits.record(str(alpha / "src" / "alpha" / "core.py"))
+            hook.edits.record(str(workspace / "scripts" / "tool.py"))
+            with patch("python_claude.hooks.base.run_process", side_effect=run):
+                assert hook.run() == 0
+            assert hook.edits.pending("mypy").files == []
+        assert sorted(cwds) == [workspace, alpha]
+
+    def test_merges_reports_and_blocks_on_any_failure(
+        self, workspace: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        alpha = workspace / "packages" / "alpha"
+        beta = workspace / "packages" / "beta"
+        _, run = _fake_tools({"beta": 1})
+        with patch.dict(os.environ, _env(workspace)):
+            hook = MypyHook(SESSION)
+            hook.edits.record(str(alpha / "src" / "alpha" / "core.py"))
+            hook.edits.record(str(beta / "src" / "beta" / "core.py"))
+            with patch("python_claude.hooks.base.run_process", side_effect=run):
+                assert hook.run() == 2
+            assert len(hook.edits.pending("mypy").files) == 2
+        assert capsys.readouterr().err == (
+            "# mypy in packages/alpha (1 edited file)\n"
+            "ran in alpha\n"
+            "# mypy in packages/beta (1 edited file)\n"
+            "ran in beta\n"
+        )
+
+    def test_packages_without_tests_pass(self, workspace: Path) -> None:
+        alpha = workspace / "packages" / "alpha"
+        beta = workspace / "packages" / "beta"
+        _, run = _fake_tools({"alpha": 5})
+        with patch.dict(os.environ, _env(workspace)):
+            hook = PytestHook(SESSION)
+            hook.edits.record(str(alpha / "src" / "alpha" / "core.py"))
+            hook.edits.record(str(beta / "src" / "beta" / "core.py"))
+            with patch("python_claude.hooks.base.run_process", side_effect=run):
+                assert hook.run() == 0
+
+    def test_root_only_edits_run_as_before(
+        self, workspace: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        cwds, run = _fake_tools({})
+        with patch.dict(os.environ, _env(workspace)):
+            hook = PytestHook(SESSION)
+            hook.edits.record(str(workspace / "scripts" / "tool.py"))
+            with patch("python_claude.hooks.base.run_process", side_effect=run):
+                assert hook.run() == 0
+        assert cwds == [workspace]
+        assert capsys.readouterr().err == f"ran in {workspace.name}\n"
+
+    def test_disabled(self, workspace: Path) -> None:
+        alpha = workspace / "packages" / "alpha"
+        cwds, run = _fake_tools({})
+        env = _env(workspace, PYTHON_CLAUDE_PACKAGES_ENABLED="0")
+        with patch.dict(os.environ, env):
+            hook = MypyHook(SESSION)
+            hook.edits.record(str(alpha / "src" / "alpha" / "core.py"))
+            with patch("python_claude.hooks.base.run_process", side_effect=run):
+                hook.run()
+        assert cwds == [workspace]
+
+    def test_root_checks_leave_out_packages(self, workspace: Path) -> None:
+        alpha = workspace / "packages" / "alpha"
+        for hook_class in (MypyHook, PytestHook):
+            calls: dict[Path, list[str]] = {}
+            _, run = _fake_tools({}, calls)
+            with patch.dict(os.environ, _env(workspace)):
+                hook = hook_class(SESSION)
+                hook.edits.record(str(alpha / "src" / "alpha" / "core.py"))
+                hook.edits.record(str(workspace / "scripts" / "tool.py"))
+                with patch("python_claude.hooks.base.run_process", side_effect=run):
+                    assert hook.run() == 0
+            assert sorted(calls) == [workspace, alpha]
+            if hook_class is MypyHook:
+                assert calls[workspace][3:] == ["scripts"]
+                assert calls[alpha][3:] == ["."]
+            else:
+                assert calls[workspace][3:] == [
+                    "--ignore=packages/alpha",
+                    "--ignore=packages/beta",
+                ]
+                assert calls[alpha][3:] == []
+
+    def test_root_only_edits_leave_out_packages(self, workspace: Path) -> None:
+        calls: dict[Path, list[str]] = {}
+        _, run = _fake_tools({}, calls)
+        with patch.dict(os.environ, _env(workspace)):
+            hook = MypyHook(SESSION)
+            hook.edits.record(str(workspace / "scripts" / "tool.py"))
+            with patch("python_claude.hooks.base.run_process", side_effect=run):
+                assert hook.run() == 0
+        assert calls == {workspace: ["uv", "run", "mypy", "scripts"]}
+
+    def test_packages_use_affected_test_selection(self, workspace: Path) -> None:
+        alpha = workspace / "packages" / "alpha"
+        (alpha / "tests").mkdir()
+        (alpha / "tests" / "test_core.py").write_text("import alpha.core\n")
+        (alpha / "tests" / "test_other.py").write_text("")
+        calls: dict[Path, list[str]] = {}
+        _, run = _fake_tools({}, calls)
+        env = _env(workspace, PYTHON_CLAUDE_PYTEST_AFFECTED="1")
+        with patch.dict(os.environ, env):
+            hook = PytestHook(SESSION)
+            hook.edits.record(str(alpha / "src" / "alpha" / "core.py"))
+            with patch("python_claude.hooks.base.run_process", side_effect=run):
+                assert hook.run() == 0
+        assert calls == {alpha: ["uv", "run", "pytest", "tests/test_core.py"]}
+
+    def test_packages_keep_their_own_state(self, workspace: Path) -> None:
+        alpha = workspace / "packages" / "alpha"
+        with patch.dict(os.environ, _env(workspace)):
+            hook = PytestHook(SESSION)
+            hook.cwd = alpha
+            assert hook.state_dir == hook.log_dir / "packages" / "packages" / "alpha"
+            hook.cwd = workspace
+            assert hook.state_dir == hook.log_dir